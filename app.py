@@ -1,368 +1,336 @@
+import os
+
+from utils import startup
+
 import streamlit as st
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from datetime import datetime, timedelta
-import plotly.graph_objects as go
-import plotly.express as px
-
-# Set page config
-st.set_page_config(
-    page_title="Ardian ESG Quest Dashboard",
-    page_icon="🎮",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
-
-# Custom CSS for retro gaming aesthetic
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=VT323&display=swap');
-    @import url('https://fonts.googleapis.com/css2?family=Space+Mono:wght@400;700&display=swap');
-    
-    /* Main container */
-    .stApp {
-        background-color: #FFFFFF;
-    }
-    
-    /* Headers with VT323 font */
-    h1, h2, h3, h4, h5, h6 {
-        font-family: 'VT323', monospace !important;
-        color: #000000 !important;
-        text-transform: uppercase;
-        letter-spacing: 3px;
-        text-shadow: 3px 3px 0px #808080;
-    }
-    
-    /* Body text */
-    p, span, label, div {
-        font-family: 'Space Mono', monospace !important;
-        color: #000000 !important;
-    }
-    
-    /* Retro buttons */
-    .stButton > button {
-        font-family: 'VT323', monospace !important;
-        background-color: #FFFFFF !important;
-        color: #000000 !important;
-        border: 4px solid #000000 !important;
-        border-radius: 0px !important;
-        box-shadow: 4px 4px 0px #000000 !important;
-        text-transform: uppercase;
-        font-size: 20px !important;
-        letter-spacing: 2px;
-        transition: all 0.1s ease !important;
-    }
-    
-    .stButton > button:hover {
-        transform: translate(2px, 2px);
-        box-shadow: 2px 2px 0px #000000 !important;
-    }
-    
-    /* Pixel-perfect containers */
-    .metric-container {
-        background-color: #FFFFFF;
-        border: 4px solid #000000;
-        border-radius: 0px;
-        padding: 15px;
-        margin: 10px 0;
-        box-shadow: 6px 6px 0px #000000;
-    }
-    
-    /* Sidebar styling */
-    .css-1d391kg {
-        background-color: #F0F0F0 !important;
-        border-right: 4px solid #000000 !important;
-    }
+
+from config.settings import CHART_CONFIG, EXPORT_CONFIG, FEATURES, INGEST_CONFIG, REALTIME_CONFIG, SIMILARITY_CONFIG
+from esg_quest import Selection, load_dataset
+from esg_quest.registry import get_registry
+from esg_quest.sections import build_section, timed_section
+from esg_quest.theme import build_theme_css
+from utils import instrumentation
+from utils.cache import cache_stats
+
+startup.mark('imports')
+
+# Every rerun is traced; ?profile=cpu or ?profile=memory also profiles it
+instrumentation.configure_logging()
+rerun_trace = instrumentation.start_trace('rerun')
+profile_mode = st.query_params.get('profile')
+profiler = instrumentation.Profiler(profile_mode).start() if profile_mode in instrumentation.Profiler.MODES else None
+
+try:
+    # Set page config
+    st.set_page_config(
+        page_title="Ardian ESG Quest Dashboard",
+        page_icon="🎮",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+
+    # Custom CSS for retro gaming aesthetic, built once per process
+    st.markdown(build_theme_css(), unsafe_allow_html=True)
+
+    # Title with pixel art style
+    st.markdown("<h1 style='text-align: center; font-size: 64px;'>🎮 ARDIAN ESG QUEST 🎮</h1>", unsafe_allow_html=True)
+    st.markdown("<h2 style='text-align: center; font-size: 32px;'>PORTFOLIO ANALYSIS DASHBOARD</h2>", unsafe_allow_html=True)
+    st.markdown("<div class='pixel-divider'></div>", unsafe_allow_html=True)
+
+    # Load data
+    registry = get_registry()
+    registry.get_or_load(load_dataset)
+    if FEATURES['enable_real_time_updates']:
+        from esg_quest.realtime import get_pipeline
+        pipeline = get_pipeline(registry.current())
+        if 'live_subscription' not in st.session_state:
+            st.session_state['live_subscription'] = pipeline.subscribe()
+    # One shared, read-only dataset per process, pinned for this rerun; live updates
+    # publish new versions and sections untouched by them stay cached
+    dataset = registry.current()
+    portfolio = dataset.portfolio
+
+    # Sidebar - Game Controls
+    st.sidebar.markdown("<h2>ARDIAN CONTROLS</h2>", unsafe_allow_html=True)
+    st.sidebar.markdown("<p style='font-size: 14px;'>PORTFOLIO NAVIGATOR</p>", unsafe_allow_html=True)
+
+    # Company selector
+    selected_company = st.sidebar.selectbox(
+        "SELECT PORTFOLIO COMPANY",
+        options=portfolio.companies,
+        index=0
+    )
+
+    # Sector filter
+    selected_sector = st.sidebar.selectbox(
+        "FILTER BY SECTOR",
+        options=['All'] + portfolio.sectors,
+        index=0
+    )
+
+    # Metric focus
+    metric_focus = st.sidebar.selectbox(
+        "ANALYSIS FOCUS",
+        options=['ESG Overview', 'Environmental', 'Social', 'Governance', 'Financial'],
+        index=0
+    )
+
+    # Add arcade-style button
+    if st.sidebar.button("🎯 ANALYZE PORTFOLIO"):
+        st.sidebar.success("ARDIAN ANALYSIS ACTIVATED!")
+
+    # Portfolio report export; rendering runs in a background pool, this only polls it
+    if FEATURES['enable_pdf_export']:
+        from esg_quest.export import get_export_queue
+        export_queue = get_export_queue()
+
+        # Poll only while a job is running; a finished job is rendered once, not every second
+        polling_job = export_queue.get(st.session_state.get('export_job', 0))
+        polling = polling_job is not None and polling_job.active
+
+        @st.fragment(run_every=EXPORT_CONFIG['poll_seconds'] if polling else None)
+        def export_controls():
+            job = export_queue.get(st.session_state.get('export_job', 0))
+            if job is None or not job.active:
+                if st.button("📄 EXPORT PDF REPORT"):
+                    st.session_state['export_job'] = export_queue.submit(dataset).id
+                    # Rerun the app so the fragment is redefined with polling on
+                    st.rerun()
+            if job is None:
+                return
+            if job.active:
+                st.progress(job.progress, text=f"EXPORTING {job.pages_done}/{job.total_pages} PAGES")
+                if st.button("✖ CANCEL EXPORT"):
+                    job.cancel()
+                return
+            if polling:
+                # Finished since polling started: rerun the app to stop polling
+                st.rerun()
+            if job.status == 'done':
+                # Read the report once per job, not on every rerun
+                report = st.session_state.get('export_report')
+                if report is None or report[0] != job.id:
+                    with open(job.path, 'rb') as f:
+                        report = st.session_state['export_report'] = (job.id, f.read())
+                st.download_button(
+                    "💾 DOWNLOAD REPORT", report[1], file_name=os.path.basename(job.path), mime='application/pdf'
+                )
+            elif job.status == 'failed':
+                st.error(f"EXPORT FAILED: {job.error}")
+            else:
+                st.caption("EXPORT CANCELLED")
+
+        with st.sidebar:
+            export_controls()
+
+    # Portfolio extract import; only files in the configured import directory are offered
+    if FEATURES['enable_file_ingest']:
+        from utils.ingest import ingest_file, list_extracts
+
+        with st.sidebar.expander("📥 IMPORT PORTFOLIO EXTRACT"):
+            extract_name = st.selectbox("EXTRACT", options=list_extracts(), key='ingest_file')
+            if st.button("IMPORT", disabled=extract_name is None):
+                try:
+                    with st.spinner("IMPORTING..."):
+                        frame, report = ingest_file(os.path.join(INGEST_CONFIG['import_dir'], extract_name))
+                        registry.append(frame)
+                    st.session_state['ingest_report'] = report
+                    st.rerun()
+                except ImportError:
+                    st.error("IMPORT FAILED: EXCEL EXTRACTS NEED OPENPYXL")
+                except (OSError, ValueError) as e:
+                    st.error(f"IMPORT FAILED: {e}")
+            report = st.session_state.get('ingest_report')
+            if report is not None:
+                st.caption(report.summary().upper())
+                for reason, count in sorted(report.reasons.items(), key=lambda item: -item[1]):
+                    st.caption(f"{count:,} × {reason}")
+                if report.report_path:
+                    st.caption(f"REJECTED ROWS: {report.report_path}")
+
+    st.sidebar.markdown("<div class='pixel-divider'></div>", unsafe_allow_html=True)
+
+    # Main content area
+    selection = Selection(selected_company, selected_sector, metric_focus)
+
+    # Score display with progress bars
+    with timed_section('stats'):
+        stats = build_section('stats', dataset, selection)
+        st.markdown("<h2>COMPANY STATS</h2>", unsafe_allow_html=True)
     
-    /* Metric cards */
-    [data-testid="metric-container"] {
-        background-color: #FFFFFF;
-        border: 3px solid #000000;
-        border-radius: 0px;
-        box-shadow: 4px 4px 0px #000000;
-        margin: 5px;
-    }
+        col1, col2, col3 = st.columns(3)
     
-    /* Select boxes */
-    .stSelectbox > div > div {
-        background-color: #FFFFFF !important;
-        border: 2px solid #000000 !important;
-        border-radius: 0px !important;
-    }
+        with col1:
+            st.markdown("<div class='metric-container'>", unsafe_allow_html=True)
+            st.markdown(f"<h3>{stats.company}</h3>", unsafe_allow_html=True)
+            st.markdown(f"<p>SECTOR: {stats.sector}</p>", unsafe_allow_html=True)
+            st.markdown(f"<p>MARKET CAP: ${stats.market_cap:.1f}B</p>", unsafe_allow_html=True)
+            st.markdown(f"<p>SECTOR ESG RANK: P{stats.sector_rank:.0f}</p>", unsafe_allow_html=True)
+            st.markdown("</div>", unsafe_allow_html=True)
     
-    /* Sliders */
-    .stSlider > div > div {
-        background-color: #000000 !important;
-    }
+        with col2:
+            st.markdown("<div class='metric-container'>", unsafe_allow_html=True)
+            st.markdown("<h3>ESG POWER LEVEL</h3>", unsafe_allow_html=True)
+            st.progress(stats.esg_score/100)
+            st.markdown(f"<p style='text-align: center; font-size: 24px;'>{stats.esg_score:.0f}/100</p>", unsafe_allow_html=True)
+            st.markdown(f"<p style='text-align: center;'>TIER: {stats.esg_tier.upper()}</p>", unsafe_allow_html=True)
+            st.markdown("</div>", unsafe_allow_html=True)
     
-    /* Progress bars */
-    .stProgress > div > div {
-        background-color: #000000 !important;
-    }
-    
-    /* 8-bit style divider */
-    .pixel-divider {
-        height: 8px;
-        background-image: repeating-linear-gradient(
-            to right,
-            #000000,
-            #000000 8px,
-            #FFFFFF 8px,
-            #FFFFFF 16px
-        );
-        margin: 20px 0;
+        with col3:
+            st.markdown("<div class='metric-container'>", unsafe_allow_html=True)
+            st.markdown("<h3>FINANCIAL HEALTH</h3>", unsafe_allow_html=True)
+            st.progress(stats.health_score/100)
+            st.markdown(f"<p style='text-align: center; font-size: 24px;'>{stats.health_score:.0f}/100</p>", unsafe_allow_html=True)
+            st.markdown("</div>", unsafe_allow_html=True)
+
+    st.markdown("<div class='pixel-divider'></div>", unsafe_allow_html=True)
+
+    # Detailed metrics based on selection
+    with timed_section('breakdown'):
+        breakdown = build_section('breakdown', dataset, selection)
+        if breakdown is not None:
+            st.markdown(f"<h2>{breakdown.title}</h2>", unsafe_allow_html=True)
+        
+            for column, breakdown_column in zip(st.columns(len(breakdown.columns)), breakdown.columns):
+                with column:
+                    if breakdown_column.title:
+                        st.markdown(f"<h3>{breakdown_column.title}</h3>", unsafe_allow_html=True)
+                    if breakdown_column.score is not None:
+                        st.progress(breakdown_column.score/100)
+                        st.metric("Score", f"{breakdown_column.score:.0f}/100")
+                    for label, value in breakdown_column.metrics:
+                        st.metric(label, value)
+
+    st.markdown("<div class='pixel-divider'></div>", unsafe_allow_html=True)
+
+    # Comparative analysis
+    with timed_section('comparison'):
+        st.markdown("<h2>ARDIAN PORTFOLIO COMPARISON</h2>", unsafe_allow_html=True)
+        compare_with = st.radio(
+            "COMPARE WITH", options=['SECTOR', 'NEAREST PEERS'], horizontal=True, key='compare_with'
+        )
+        peers = SIMILARITY_CONFIG['peer_count'] if compare_with == 'NEAREST PEERS' else 0
+        radar, fig = build_section('comparison', dataset, selection, peers=peers)
+        st.plotly_chart(fig, use_container_width=True)
+        if radar.bands:
+            st.caption(
+                f"{radar.n_companies} COMPANIES: SECTOR {'/'.join(radar.bands)} BANDS "
+                f"WITH THE TOP {CHART_CONFIG['radar_top_n']} BY ESG SCORE"
+            )
+        if radar.peers:
+            st.caption("NEAREST PEERS: " + " · ".join(f"{name} ({distance:.2f})" for name, distance in radar.peers))
+
+    # Time series visualization; its own controls rerun only this fragment
+    @st.fragment
+    def score_history_section(selection):
+        with timed_section('history'):
+            st.markdown("<h2>SCORE HISTORY</h2>", unsafe_allow_html=True)
+        
+            history_col1, history_col2, history_col3 = st.columns([1, 3, 1])
+        
+            with history_col1:
+                history_days = st.selectbox(
+                    "HISTORY",
+                    options=[365, 3 * 365, 5 * 365, 10 * 365],
+                    format_func=lambda days: f"{days // 365} YEAR{'S' if days > 365 else ''}",
+                    key='history_days',
+                    # A new history length starts unzoomed
+                    on_change=lambda: st.session_state.pop('history_range', None)
+                )
+        
+            with history_col3:
+                show_raw = st.checkbox("SHOW RAW DATA", key='history_raw')
+        
+            # The zoom slider is drawn below its bounds, so read its last value first
+            history_range = st.session_state.get('history_range')
+            history, fig = build_section(
+                'history', dataset, selection, days=history_days, date_range=history_range, raw=show_raw
+            )
+        
+            with history_col2:
+                start, end = history.full_range[0].date(), history.full_range[1].date()
+                # A stale range outside the current history must be reset before the slider is created
+                if history_range is not None and not (start <= history_range[0] <= history_range[1] <= end):
+                    del st.session_state['history_range']
+                st.slider("ZOOM", min_value=start, max_value=end, value=(start, end), key='history_range')
+        
+            with history_col3:
+                if history.downsampled:
+                    st.caption(f"{len(history.values):,} OF {history.raw_points:,} POINTS")
+        
+            st.plotly_chart(fig, use_container_width=True)
+        
+            latest = {name: value for name, value in history.latest.items() if value == value}
+            stat_labels = [('vol_30', "30D VOLATILITY {:.1f}"), ('drawdown', "DRAWDOWN {:.1%}"), ('yoy', "YOY {:+.1f}")]
+            st.caption(" · ".join(label.format(latest[name]) for name, label in stat_labels if name in latest))
+
+    score_history_section(selection)
+
+    # Monte Carlo projection of the ESG score
+    with timed_section('outlook'):
+        st.markdown("<h2>ESG OUTLOOK</h2>", unsafe_allow_html=True)
+        fan, fan_fig = build_section('outlook', dataset, selection)
+        outlook_col1, outlook_col2 = st.columns([1, 3])
+        with outlook_col1:
+            st.metric(f"CHANCE OF REACHING {fan.threshold:.0f}", f"{fan.crossing_probability:.0%}")
+            if fan.already_above:
+                st.metric("MEDIAN TIME TO REACH", "ALREADY ABOVE THRESHOLD")
+            elif fan.crossing_probability > 0:
+                st.metric("MEDIAN TIME TO REACH", f"{fan.median_crossing_days / 30.4:.0f} MONTHS")
+        with outlook_col2:
+            st.plotly_chart(fan_fig, use_container_width=True)
+
+    # Portfolio-level rollup of the sector filter, sliced from a precomputed cube
+    ROLLUP_BREAKDOWNS = {
+        'SECTOR': ('sector',),
+        'ESG BAND': ('band',),
+        'MONTH': ('month',),
+        'SECTOR × ESG BAND': ('sector', 'band')
     }
-</style>
-""", unsafe_allow_html=True)
-
-# Generate mock data for companies
-@st.cache_data
-def generate_mock_data():
-    # Using sectors mentioned in the Ardian internship description
-    companies = ['TechVenture SA', 'WindPower Europe', 'RetailNext Group', 'MedTech Solutions', 'LogiTrans International']
-    sectors = ['Technology', 'Renewable Energy', 'Retail', 'Healthcare', 'Transportation']
-    
-    data = []
-    for i, company in enumerate(companies):
-        # Financial metrics
-        financial_data = {
-            'Company': company,
-            'Sector': sectors[i],
-            'Market Cap (B)': np.random.uniform(10, 500),
-            'Revenue (B)': np.random.uniform(5, 200),
-            'P/E Ratio': np.random.uniform(10, 40),
-            'Profit Margin (%)': np.random.uniform(5, 30),
-            'Debt to Equity': np.random.uniform(0.3, 2.5),
-            
-            # ESG scores
-            'ESG Total Score': np.random.uniform(40, 90),
-            'Environmental Score': np.random.uniform(30, 95),
-            'Social Score': np.random.uniform(35, 90),
-            'Governance Score': np.random.uniform(40, 95),
-            
-            # Specific ESG metrics
-            'Carbon Emissions (MT)': np.random.uniform(1000, 50000),
-            'Renewable Energy (%)': np.random.uniform(10, 80),
-            'Employee Diversity (%)': np.random.uniform(20, 60),
-            'Board Independence (%)': np.random.uniform(30, 90),
-            'Safety Incidents': np.random.randint(0, 20)
-        }
-        data.append(financial_data)
-    
-    return pd.DataFrame(data)
-
-# Generate time series data
-@st.cache_data
-def generate_time_series(company, metric, days=365):
-    dates = [datetime.now() - timedelta(days=x) for x in range(days)]
-    base_value = np.random.uniform(50, 100)
-    trend = np.random.uniform(-0.05, 0.1)
-    noise = np.random.normal(0, 5, days)
-    values = base_value + trend * np.arange(days) + noise
-    
-    return pd.DataFrame({
-        'Date': dates,
-        metric: values
-    })
-
-# Title with pixel art style
-st.markdown("<h1 style='text-align: center; font-size: 64px;'>🎮 ARDIAN ESG QUEST 🎮</h1>", unsafe_allow_html=True)
-st.markdown("<h2 style='text-align: center; font-size: 32px;'>PORTFOLIO ANALYSIS DASHBOARD</h2>", unsafe_allow_html=True)
-st.markdown("<div class='pixel-divider'></div>", unsafe_allow_html=True)
-
-# Load data
-df = generate_mock_data()
-
-# Sidebar - Game Controls
-st.sidebar.markdown("<h2>ARDIAN CONTROLS</h2>", unsafe_allow_html=True)
-st.sidebar.markdown("<p style='font-size: 14px;'>PORTFOLIO NAVIGATOR</p>", unsafe_allow_html=True)
-
-# Company selector
-selected_company = st.sidebar.selectbox(
-    "SELECT PORTFOLIO COMPANY",
-    options=df['Company'].tolist(),
-    index=0
-)
-
-# Sector filter
-selected_sector = st.sidebar.selectbox(
-    "FILTER BY SECTOR",
-    options=['All'] + df['Sector'].unique().tolist(),
-    index=0
-)
-
-# Metric focus
-metric_focus = st.sidebar.selectbox(
-    "ANALYSIS FOCUS",
-    options=['ESG Overview', 'Environmental', 'Social', 'Governance', 'Financial'],
-    index=0
-)
-
-# Add arcade-style button
-if st.sidebar.button("🎯 ANALYZE PORTFOLIO"):
-    st.sidebar.success("ARDIAN ANALYSIS ACTIVATED!")
-
-st.sidebar.markdown("<div class='pixel-divider'></div>", unsafe_allow_html=True)
-
-# Main content area
-company_data = df[df['Company'] == selected_company].iloc[0]
-
-# Score display with progress bars
-st.markdown("<h2>COMPANY STATS</h2>", unsafe_allow_html=True)
-
-col1, col2, col3 = st.columns(3)
-
-with col1:
-    st.markdown("<div class='metric-container'>", unsafe_allow_html=True)
-    st.markdown(f"<h3>{selected_company}</h3>", unsafe_allow_html=True)
-    st.markdown(f"<p>SECTOR: {company_data['Sector']}</p>", unsafe_allow_html=True)
-    st.markdown(f"<p>MARKET CAP: ${company_data['Market Cap (B)']:.1f}B</p>", unsafe_allow_html=True)
-    st.markdown("</div>", unsafe_allow_html=True)
-
-with col2:
-    st.markdown("<div class='metric-container'>", unsafe_allow_html=True)
-    st.markdown("<h3>ESG POWER LEVEL</h3>", unsafe_allow_html=True)
-    esg_score = company_data['ESG Total Score']
-    st.progress(esg_score/100)
-    st.markdown(f"<p style='text-align: center; font-size: 24px;'>{esg_score:.0f}/100</p>", unsafe_allow_html=True)
-    st.markdown("</div>", unsafe_allow_html=True)
-
-with col3:
-    st.markdown("<div class='metric-container'>", unsafe_allow_html=True)
-    st.markdown("<h3>FINANCIAL HEALTH</h3>", unsafe_allow_html=True)
-    health_score = min(100, company_data['Profit Margin (%)'] * 3)
-    st.progress(health_score/100)
-    st.markdown(f"<p style='text-align: center; font-size: 24px;'>{health_score:.0f}/100</p>", unsafe_allow_html=True)
-    st.markdown("</div>", unsafe_allow_html=True)
-
-st.markdown("<div class='pixel-divider'></div>", unsafe_allow_html=True)
-
-# Detailed metrics based on selection
-if metric_focus == 'ESG Overview':
-    st.markdown("<h2>ESG STATS BREAKDOWN</h2>", unsafe_allow_html=True)
-    
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.markdown("<h3>ENVIRONMENTAL</h3>", unsafe_allow_html=True)
-        env_score = company_data['Environmental Score']
-        st.progress(env_score/100)
-        st.metric("Score", f"{env_score:.0f}/100")
-        st.metric("Carbon Emissions", f"{company_data['Carbon Emissions (MT)']:,.0f} MT")
-        st.metric("Renewable Energy", f"{company_data['Renewable Energy (%)']:.0f}%")
-    
-    with col2:
-        st.markdown("<h3>SOCIAL</h3>", unsafe_allow_html=True)
-        social_score = company_data['Social Score']
-        st.progress(social_score/100)
-        st.metric("Score", f"{social_score:.0f}/100")
-        st.metric("Employee Diversity", f"{company_data['Employee Diversity (%)']:.0f}%")
-        st.metric("Safety Incidents", f"{company_data['Safety Incidents']}")
-    
-    with col3:
-        st.markdown("<h3>GOVERNANCE</h3>", unsafe_allow_html=True)
-        gov_score = company_data['Governance Score']
-        st.progress(gov_score/100)
-        st.metric("Score", f"{gov_score:.0f}/100")
-        st.metric("Board Independence", f"{company_data['Board Independence (%)']:.0f}%")
-
-elif metric_focus == 'Financial':
-    st.markdown("<h2>FINANCIAL STATS</h2>", unsafe_allow_html=True)
-    
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.metric("Revenue", f"${company_data['Revenue (B)']:.1f}B")
-        st.metric("P/E Ratio", f"{company_data['P/E Ratio']:.1f}")
-    
-    with col2:
-        st.metric("Profit Margin", f"{company_data['Profit Margin (%)']:.1f}%")
-        st.metric("Debt to Equity", f"{company_data['Debt to Equity']:.2f}")
-    
-    with col3:
-        st.metric("Market Cap", f"${company_data['Market Cap (B)']:.1f}B")
-
-st.markdown("<div class='pixel-divider'></div>", unsafe_allow_html=True)
-
-# Comparative analysis
-st.markdown("<h2>ARDIAN PORTFOLIO COMPARISON</h2>", unsafe_allow_html=True)
 
-# Filter data based on sector selection
-filtered_df = df if selected_sector == 'All' else df[df['Sector'] == selected_sector]
-
-# Create radar chart
-fig = go.Figure()
-
-categories = ['Environmental Score', 'Social Score', 'Governance Score', 
-              'Profit Margin (%)', 'Renewable Energy (%)']
-
-for company in filtered_df['Company']:
-    company_values = filtered_df[filtered_df['Company'] == company]
-    values = [company_values[cat].iloc[0] for cat in categories]
-    
-    fig.add_trace(go.Scatterpolar(
-        r=values + [values[0]],
-        theta=categories + [categories[0]],
-        fill='toself',
-        name=company,
-        line=dict(color='black' if company == selected_company else 'gray', width=3)
-    ))
-
-fig.update_layout(
-    polar=dict(
-        radialaxis=dict(
-            visible=True,
-            range=[0, 100],
-            gridcolor='black',
-            gridwidth=2
-        ),
-        angularaxis=dict(
-            gridcolor='black',
-            gridwidth=2
-        )
-    ),
-    showlegend=True,
-    template=None,
-    plot_bgcolor='white',
-    paper_bgcolor='white',
-    font=dict(family='Space Mono', color='black')
-)
-
-st.plotly_chart(fig, use_container_width=True)
-
-# Time series visualization
-st.markdown("<h2>SCORE HISTORY</h2>", unsafe_allow_html=True)
-
-time_series_data = generate_time_series(selected_company, 'ESG Score')
-
-fig2 = go.Figure()
-
-fig2.add_trace(go.Scatter(
-    x=time_series_data['Date'],
-    y=time_series_data['ESG Score'],
-    mode='lines',
-    line=dict(color='black', width=3),
-    fill='tozeroy',
-    fillcolor='rgba(0,0,0,0.1)'
-))
-
-fig2.update_layout(
-    title=f"ARDIAN PORTFOLIO: {selected_company} ESG Score Evolution",
-    xaxis_title="Time",
-    yaxis_title="ESG Score",
-    template=None,
-    plot_bgcolor='white',
-    paper_bgcolor='white',
-    font=dict(family='Space Mono', color='black'),
-    xaxis=dict(gridcolor='black', gridwidth=1),
-    yaxis=dict(gridcolor='black', gridwidth=1)
-)
-
-st.plotly_chart(fig2, use_container_width=True)
-
-# Footer
-st.markdown("<div class='pixel-divider'></div>", unsafe_allow_html=True)
-st.markdown("<p style='text-align: center; font-size: 16px;'>🕹️ ARDIAN ESG QUEST v1.0 - PRESS START TO INVEST RESPONSIBLY 🕹️</p>", unsafe_allow_html=True)
-st.markdown("<p style='text-align: center; font-size: 14px;'>DEVELOPED FOR ARDIAN DATA SCIENCE INTERNSHIP 2025</p>", unsafe_allow_html=True)
\ No newline at end of file
+    with timed_section('rollup'):
+        st.markdown("<h2>PORTFOLIO ROLLUP</h2>", unsafe_allow_html=True)
+        rollup_by = st.selectbox("BREAK DOWN BY", options=list(ROLLUP_BREAKDOWNS), key='rollup_by')
+        rollup = build_section('rollup', dataset, selection, by=ROLLUP_BREAKDOWNS[rollup_by])
+        st.caption(f"{rollup.months[0]} TO {rollup.months[1]} · HOLDINGS COUNT COMPANY-MONTHS")
+        st.dataframe(rollup.rows, hide_index=True, use_container_width=True)
+
+    # Live updates: poll this session's mailbox and rerun when a section changed
+    if FEATURES['enable_real_time_updates']:
+        @st.fragment(run_every=REALTIME_CONFIG['poll_seconds'])
+        def live_updates():
+            change = st.session_state['live_subscription'].poll()
+            if change is not None and change.sections:
+                st.rerun()
+            st.caption(f"LIVE · REVISION {pipeline.store.revision}")
+
+        live_updates()
+
+    # Footer
+    st.markdown("<div class='pixel-divider'></div>", unsafe_allow_html=True)
+    st.markdown("<p style='text-align: center; font-size: 16px;'>🕹️ ARDIAN ESG QUEST v1.0 - PRESS START TO INVEST RESPONSIBLY 🕹️</p>", unsafe_allow_html=True)
+    st.markdown("<p style='text-align: center; font-size: 14px;'>DEVELOPED FOR ARDIAN DATA SCIENCE INTERNSHIP 2025</p>", unsafe_allow_html=True)
+
+    # Cold start timings of this worker process
+    startup.mark('first_paint')
+    st.sidebar.caption(
+        f"COLD START: IMPORTS {startup.timings()['imports']:.0f} MS · FIRST PAINT {startup.timings()['first_paint']:.0f} MS"
+    )
+finally:
+    # Also runs on st.rerun()/st.stop() and errors, so no capture outlives its rerun
+    instrumentation.finish_trace(rerun_trace)
+    profile_report = profiler.stop() if profiler is not None else None
+
+# Hidden diagnostics panel, shown with ?diagnostics=1
+if st.query_params.get('diagnostics'):
+    with st.sidebar.expander("🛠 DIAGNOSTICS", expanded=True):
+        st.markdown("<p>RERUN SPANS</p>", unsafe_allow_html=True)
+        st.code(rerun_trace.render(), language=None)
+        st.markdown("<p>CACHE HIT RATES</p>", unsafe_allow_html=True)
+        st.dataframe([{'cache': name, **stats} for name, stats in cache_stats().items()], hide_index=True)
+        st.caption(f"PORTFOLIO FRAME: {dataset.df.memory_usage(deep=True).sum() / 1e6:.2f} MB")
+        if profiler is not None and profiler.busy:
+            st.caption("PROFILER BUSY: ANOTHER SESSION IS PROFILING, RELOAD TO RETRY")
+        elif profile_report:
+            st.markdown(f"<p>{profile_mode.upper()} PROFILE</p>", unsafe_allow_html=True)
+            st.code(profile_report, language=None)
@@ -0,0 +1,360 @@
+"""
+Benchmark suite for Ardian ESG Dashboard
+
+Times data generation, scoring, lookups, market data refreshes against a
+local mock provider and figure construction over a grid of portfolio
+sizes and history lengths, records wall time and peak traced memory for
+each stage, and writes the results as JSON so two runs can be diffed.
+
+Usage:
+    python benchmarks/run_benchmarks.py                 # full grid
+    python benchmarks/run_benchmarks.py --quick         # smallest sizes only
+    python benchmarks/run_benchmarks.py --filter radar  # stages matching a substring
+    python benchmarks/run_benchmarks.py --compare old.json new.json
+"""
+
+import argparse
+import asyncio
+import gc
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pandas as pd
+
+from config.settings import APP_VERSION
+from esg_quest import Selection, build_dataset, build_radar
+from esg_quest.figures import build_radar_figure, build_score_history_figure
+from esg_quest.views import ScoreHistory
+from utils.data_generator import (
+    calculate_esg_score,
+    generate_company_names,
+    generate_portfolio,
+    generate_time_series,
+    generate_time_series_panel
+)
+from utils.market_data import MarketDataClient
+from utils.mock_market_server import MockMarketServer
+from utils.portfolio import PortfolioIndex
+from utils.rollup import RollupCube
+from utils.scoring import rescore_portfolio
+from utils.similarity import PeerIndex
+
+
+PORTFOLIO_SIZES = [5, 1_000, 100_000]
+HISTORY_DAYS = [365, 3 * 365, 10 * 365]
+QUOTE_SYMBOLS = [100, 2_000]
+RESULTS_DIR = os.path.join(ROOT, 'benchmarks', 'results')
+
+# Skip grid cells whose working set would not fit a dev machine
+MAX_PANEL_CELLS = 50_000_000
+MAX_LOOP_COMPANIES = 10_000
+
+
+class Skip(Exception):
+    """Raised by a setup function for parameter combinations not worth running."""
+
+
+BENCHMARKS: List[Dict[str, Any]] = []
+
+
+def benchmark(name: str, repeat: int = 5, **params: List[Any]) -> Callable:
+    """
+    Register a benchmark over the cartesian product of parameter lists.
+
+    The decorated function receives the parameters and returns the
+    callable to time; work done before returning is setup and not timed.
+
+    Args:
+        name: Benchmark name
+        repeat: Timed runs per parameter combination
+        **params: Parameter name -> values
+
+    Returns:
+        Callable: Decorator
+    """
+    def decorator(setup: Callable) -> Callable:
+        BENCHMARKS.append({'name': name, 'setup': setup, 'params': params, 'repeat': repeat})
+        return setup
+    return decorator
+
+
+# ---------------------------------------------------------------------------
+# Data generation
+
+@benchmark('generate_portfolio', n_companies=PORTFOLIO_SIZES)
+def bench_generate_portfolio(n_companies):
+    return lambda: generate_portfolio(n_companies, seed=0)
+
+
+@benchmark('generate_time_series', days=HISTORY_DAYS)
+def bench_generate_time_series(days):
+    return lambda: generate_time_series('TechVenture SA', 'ESG Score', days, seed=0)
+
+
+@benchmark('generate_time_series_panel', repeat=3, n_companies=PORTFOLIO_SIZES, days=HISTORY_DAYS)
+def bench_generate_time_series_panel(n_companies, days):
+    if n_companies * days > MAX_PANEL_CELLS:
+        raise Skip(f'{n_companies * days:,} cells')
+    companies = generate_company_names(n_companies)
+    return lambda: generate_time_series_panel(companies, ['ESG Score'], days, seed=0)
+
+
+# ---------------------------------------------------------------------------
+# Scoring
+
+@benchmark('calculate_esg_score_loop', n_companies=PORTFOLIO_SIZES)
+def bench_calculate_esg_score_loop(n_companies):
+    if n_companies > MAX_LOOP_COMPANIES:
+        raise Skip('per-row loop')
+    df = generate_portfolio(n_companies, seed=0)
+    rows = df[['Environmental Score', 'Social Score', 'Governance Score']].to_numpy().tolist()
+    return lambda: [calculate_esg_score(*row) for row in rows]
+
+
+@benchmark('rescore_portfolio', n_companies=PORTFOLIO_SIZES)
+def bench_rescore_portfolio(n_companies):
+    df = generate_portfolio(n_companies, seed=0)
+    return lambda: rescore_portfolio(df)
+
+
+# ---------------------------------------------------------------------------
+# Lookup
+
+@benchmark('portfolio_index_build', n_companies=PORTFOLIO_SIZES)
+def bench_portfolio_index_build(n_companies):
+    df = generate_portfolio(n_companies, seed=0)
+    return lambda: PortfolioIndex(df)
+
+
+@benchmark('company_lookup_x1000', n_companies=PORTFOLIO_SIZES)
+def bench_company_lookup(n_companies):
+    index = PortfolioIndex(generate_portfolio(n_companies, seed=0))
+    companies = np.random.default_rng(0).choice(index.companies, 1000).tolist()
+    return lambda: [index.row(company) for company in companies]
+
+
+@benchmark('boolean_mask_lookup_x1000', n_companies=PORTFOLIO_SIZES)
+def bench_boolean_mask_lookup(n_companies):
+    if n_companies > MAX_LOOP_COMPANIES:
+        raise Skip('O(n) scan per lookup')
+    df = generate_portfolio(n_companies, seed=0)
+    companies = np.random.default_rng(0).choice(df['Company'], 1000).tolist()
+    return lambda: [df[df['Company'] == company].iloc[0] for company in companies]
+
+
+@benchmark('peer_query_x100', n_companies=PORTFOLIO_SIZES)
+def bench_peer_query(n_companies):
+    index = PeerIndex.from_frame(generate_portfolio(n_companies, seed=0))
+    companies = np.random.default_rng(0).choice(index.names, 100).tolist()
+    return lambda: [index.query(company) for company in companies]
+
+
+@benchmark('rollup_build', repeat=3, n_companies=PORTFOLIO_SIZES)
+def bench_rollup_build(n_companies):
+    df = generate_portfolio(n_companies, seed=0)
+    dates, panel = generate_time_series_panel(
+        df['Company'], ['ESG Total Score', 'Carbon Emissions (MT)'], 365, seed=0, dtype=np.float32
+    )
+    return lambda: RollupCube.build(df, dates, panel[:, 0], panel[:, 1])
+
+
+@benchmark('rollup_query', n_companies=PORTFOLIO_SIZES)
+def bench_rollup_query(n_companies):
+    df = generate_portfolio(n_companies, seed=0)
+    dates, panel = generate_time_series_panel(
+        df['Company'], ['ESG Total Score', 'Carbon Emissions (MT)'], 365, seed=0, dtype=np.float32
+    )
+    cube = RollupCube.build(df, dates, panel[:, 0], panel[:, 1])
+    return lambda: cube.query(by=('sector', 'band'), sectors=['Retail'])
+
+
+# ---------------------------------------------------------------------------
+# Market data
+
+@benchmark('market_data_refresh', repeat=3, n_symbols=QUOTE_SYMBOLS)
+def bench_market_data_refresh(n_symbols):
+    # Client overhead against a local mock provider, with rate limits lifted and a cold cache
+    symbols = [f"SYM{i:05d}" for i in range(n_symbols)]
+
+    async def refresh(server):
+        async with MarketDataClient(server.providers(requests_per_minute=10**9), cache_path=':memory:') as client:
+            quotes = await client.quotes(symbols)
+        if quotes['Price'].isna().any():
+            raise RuntimeError('mock quotes failed')
+
+    def run():
+        with MockMarketServer() as server:
+            asyncio.run(refresh(server))
+    return run
+
+
+# ---------------------------------------------------------------------------
+# Figures
+
+@benchmark('radar_figure', repeat=3, n_companies=PORTFOLIO_SIZES)
+def bench_radar_figure(n_companies):
+    dataset = build_dataset(generate_portfolio(n_companies, seed=0))
+    selection = Selection(dataset.portfolio.companies[0])
+    return lambda: build_radar_figure(build_radar(dataset, selection))
+
+
+@benchmark('score_history_figure', days=HISTORY_DAYS)
+def bench_score_history_figure(days):
+    series = generate_time_series('TechVenture SA', 'ESG Score', days, seed=0)
+    history = ScoreHistory('TechVenture SA', 'ESG Score', pd.DatetimeIndex(series['Date']), series['ESG Score'].to_numpy())
+    return lambda: build_score_history_figure(history).to_json()
+
+
+# ---------------------------------------------------------------------------
+# Runner
+
+def measure(func: Callable, repeat: int) -> Dict[str, float]:
+    """
+    Time a callable and trace its peak memory.
+
+    Args:
+        func: Callable to measure
+        repeat: Number of timed runs
+
+    Returns:
+        Dict: Wall time statistics in seconds and peak traced memory in bytes
+    """
+    # One traced run for memory; tracing slows the code, so time separately
+    gc.collect()
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    return {
+        'wall_time_min': min(times),
+        'wall_time_median': statistics.median(times),
+        'wall_time_max': max(times),
+        'peak_memory_bytes': peak,
+        'repeat': repeat
+    }
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the machine and code version the results were taken on."""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'app_version': APP_VERSION,
+        'commit': commit,
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def run(name_filter: Optional[str] = None, quick: bool = False) -> Dict[str, Any]:
+    """
+    Run the registered benchmarks.
+
+    Args:
+        name_filter: Only run benchmarks whose name contains this substring
+        quick: Only run the first value of every parameter
+
+    Returns:
+        Dict: Environment and per-benchmark results
+    """
+    results = []
+    for bench in BENCHMARKS:
+        if name_filter and name_filter not in bench['name']:
+            continue
+        names = list(bench['params'])
+        grids = [values[:1] if quick else values for values in bench['params'].values()]
+        for combination in itertools.product(*grids):
+            params = dict(zip(names, combination))
+            label = f"{bench['name']}({', '.join(f'{k}={v}' for k, v in params.items())})"
+            try:
+                func = bench['setup'](**params)
+            except Skip as reason:
+                print(f'{label:<60} skipped: {reason}')
+                continue
+            stats = measure(func, bench['repeat'])
+            results.append({'benchmark': bench['name'], 'params': params, **stats})
+            print(f"{label:<60} {stats['wall_time_median'] * 1e3:>10.2f} ms  {stats['peak_memory_bytes'] / 2**20:>9.1f} MiB")
+    return {'environment': environment(), 'results': results}
+
+
+def compare(old_path: str, new_path: str) -> None:
+    """
+    Print the wall time and memory ratio of two result files.
+
+    Args:
+        old_path: Baseline results JSON
+        new_path: Candidate results JSON
+    """
+    def load(path):
+        with open(path) as f:
+            data = json.load(f)
+        return {
+            (r['benchmark'], json.dumps(r['params'], sort_keys=True)): r for r in data['results']
+        }
+
+    old, new = load(old_path), load(new_path)
+    print(f"{'benchmark':<60} {'time':>8} {'memory':>8}")
+    for key in sorted(old.keys() & new.keys()):
+        time_ratio = new[key]['wall_time_median'] / old[key]['wall_time_median']
+        memory_ratio = new[key]['peak_memory_bytes'] / max(old[key]['peak_memory_bytes'], 1)
+        label = f"{key[0]}({', '.join(f'{k}={v}' for k, v in json.loads(key[1]).items())})"
+        flag = '  <-- slower' if time_ratio > 1.1 else ''
+        print(f'{label:<60} {time_ratio:>7.2f}x {memory_ratio:>7.2f}x{flag}')
+    for key in sorted(old.keys() ^ new.keys()):
+        print(f"{key[0]} {key[1]} only in {'old' if key in old else 'new'} results")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--filter', help='only run benchmarks whose name contains this substring')
+    parser.add_argument('--quick', action='store_true', help='only run the smallest parameter values')
+    parser.add_argument('--output', help='results JSON path (defaults to benchmarks/results/<timestamp>.json)')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='diff two results files and exit')
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    report = run(args.filter, args.quick)
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{report['environment']['commit'] or 'local'}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f'Results written to {output}')
+
+
+if __name__ == '__main__':
+    main()
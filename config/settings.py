@@ -22,7 +22,8 @@ COLORS = {
     'background': '#FFFFFF',
     'text': '#000000',
     'shadow': '#808080',
-    'accent': '#C0C0C0'
+    'accent': '#C0C0C0',
+    'sidebar': '#F0F0F0'
 }
 
 # Typography
@@ -57,7 +58,12 @@ CHART_CONFIG = {
     'font_family': 'Space Mono',
     'font_color': '#000000',
     'gridcolor': '#000000',
-    'linewidth': 3
+    'linewidth': 3,
+    'width_px': 1200,  # Assumed chart width for downsampling
+    'downsampling': 'lttb',  # 'lttb' or 'minmax'
+    'radar_max_companies': 50,  # Above this, the radar shows sector quantile bands instead of every company
+    'radar_quantiles': (10, 50, 90),
+    'radar_top_n': 5  # Top companies by ESG Total Score drawn over the bands
 }
 
 # ESG Score weights
@@ -67,6 +73,9 @@ ESG_WEIGHTS = {
     'Governance': 0.30
 }
 
+# Per-sector ESG weight overrides, e.g. {'Renewable Energy': {'Environmental': 0.5, 'Social': 0.25, 'Governance': 0.25}}
+SECTOR_ESG_WEIGHTS = {}
+
 # Metric thresholds
 THRESHOLDS = {
     'esg_excellent': 80,
@@ -84,23 +93,37 @@ THRESHOLDS = {
 API_CONFIG = {
     'alpha_vantage': {
         'base_url': 'https://www.alphavantage.co/query',
-        'timeout': 30
+        'timeout': 30,
+        'api_key_env': 'ALPHA_VANTAGE_API_KEY',
+        'max_concurrency': 4,
+        'requests_per_minute': 75,
+        'cache_ttl': 3600
     },
     'finnhub': {
         'base_url': 'https://finnhub.io/api/v1',
-        'timeout': 30
+        'timeout': 30,
+        'api_key_env': 'FINNHUB_API_KEY',
+        'max_concurrency': 8,
+        'requests_per_minute': 300,
+        'cache_ttl': 3600
     }
 }
 
+# Persistent response cache of the market data client
+MARKET_DATA_CACHE = 'data/market_data/responses.sqlite'
+
 # Cache settings
 CACHE_CONFIG = {
     'ttl': 3600,  # 1 hour
-    'max_entries': 1000
+    'max_entries': 1000,
+    'max_bytes': 512 * 1024 * 1024  # 512 MB per cache, 0 to disable
 }
 
 # File paths
 DATA_PATH = 'data/'
 ASSETS_PATH = 'assets/'
+STATIC_PATH = 'static/'  # Served at app/static/ (server.enableStaticServing)
+FONTS_PATH = 'static/fonts/'
 SCREENSHOTS_PATH = 'assets/screenshots/'
 
 # Feature flags
@@ -108,7 +131,75 @@ FEATURES = {
     'enable_api_integration': False,
     'enable_pdf_export': False,
     'enable_advanced_analytics': True,
-    'enable_real_time_updates': False
+    'enable_real_time_updates': False,
+    'enable_file_ingest': False
+}
+
+# Real-time update pipeline (used when FEATURES['enable_real_time_updates'] is on)
+REALTIME_CONFIG = {
+    'source': 'replay',  # 'replay' (JSON lines file) or 'socket' (JSON lines over TCP)
+    'replay_path': 'data/live_updates.jsonl',
+    'replay_interval': 0.05,  # Seconds between replayed updates
+    'host': '127.0.0.1',
+    'port': 9099,
+    'queue_size': 10000,  # Bounded ingest queue; full queue pauses the source
+    'batch_size': 500,
+    'linger_ms': 250,  # Max wait to fill a micro-batch
+    'history_points': 10000,  # Live points kept per company/metric
+    'subscriber_queue_size': 100,
+    'poll_seconds': 2
+}
+
+# Report export (used when FEATURES['enable_pdf_export'] is on)
+EXPORT_CONFIG = {
+    'output_dir': 'exports/',
+    'workers': 2,  # Reports rendered concurrently
+    'poll_seconds': 1,
+    'keep_finished_seconds': 3600  # Finished jobs stay pollable this long
+}
+
+# Portfolio file ingest (quarterly CSV/Excel extracts with the generated portfolio columns)
+INGEST_CONFIG = {
+    'chunk_rows': 100000,  # Rows read and validated at a time
+    'workers': 2,  # Chunks validated concurrently
+    'max_pending_chunks': 4,  # Chunks read ahead of validation; bounds memory
+    'import_dir': 'data/imports/',  # Extracts offered for import on the dashboard
+    'report_dir': 'data/ingest/'  # Rejected-rows reports
+}
+
+# Accepted (low, high) range per ingested metric, inclusive; None leaves a side open
+VALUE_RANGES = {
+    'Market Cap (B)': (0, None),
+    'Revenue (B)': (0, None),
+    'P/E Ratio': (None, None),
+    'Profit Margin (%)': (-100, 100),
+    'Debt to Equity': (0, None),
+    'ESG Total Score': (0, 100),
+    'Environmental Score': (0, 100),
+    'Social Score': (0, 100),
+    'Governance Score': (0, 100),
+    'Carbon Emissions (MT)': (0, None),
+    'Renewable Energy (%)': (0, 100),
+    'Employee Diversity (%)': (0, 100),
+    'Board Independence (%)': (0, 100),
+    'Safety Incidents': (0, None),
+    'Employee Satisfaction': (0, 100),
+    'Community Investment (M)': (0, None),
+    'Waste Recycled (%)': (0, 100),
+    'Water Usage (M Liters)': (0, None),
+    'Innovation Score': (0, 100)
+}
+
+# Portfolio rollup cube (sector x ESG band x month)
+ROLLUP_CONFIG = {
+    'history_days': 365,  # Days of ESG and emissions history rolled up
+    'incident_bins': (0, 5, 10, 20, 50)  # Lower edges of the Safety Incidents distribution
+}
+
+# Peer similarity search (PORTFOLIO COMPARISON nearest peers)
+SIMILARITY_CONFIG = {
+    'peer_count': 5,  # Peers shown next to the selected company
+    'block_size': 1024  # Query rows per distance block in batch searches
 }
 
 # Logging configuration
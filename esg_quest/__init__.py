@@ -0,0 +1,42 @@
+"""
+ESG Quest compute core
+
+Headless data preparation for the Streamlit dashboard: datasets, view
+models and figures can be built, benchmarked and precomputed without a
+Streamlit runtime.
+"""
+
+from esg_quest.dataset import Dataset, build_dataset, load_dataset, load_time_series
+from esg_quest.views import (
+    PEER_FEATURES,
+    RADAR_CATEGORIES,
+    Breakdown,
+    BreakdownColumn,
+    DashboardView,
+    RadarTrace,
+    RadarView,
+    RollupTable,
+    ScenarioFan,
+    ScoreHistory,
+    SectorRadarAggregate,
+    Selection,
+    StatsCards,
+    build_breakdown,
+    build_dashboard,
+    build_radar,
+    build_rollup,
+    build_scenario_fan,
+    build_score_history,
+    build_stats_cards,
+    peer_index,
+    portfolio_rollup,
+    sector_radar_aggregate
+)
+
+__all__ = [
+    'Dataset', 'build_dataset', 'load_dataset', 'load_time_series',
+    'PEER_FEATURES', 'RADAR_CATEGORIES', 'Breakdown', 'BreakdownColumn', 'DashboardView', 'RadarTrace', 'RadarView',
+    'RollupTable', 'ScenarioFan', 'ScoreHistory', 'SectorRadarAggregate', 'Selection', 'StatsCards', 'build_breakdown',
+    'build_dashboard', 'build_radar', 'build_rollup', 'build_scenario_fan', 'build_score_history',
+    'build_stats_cards', 'peer_index', 'portfolio_rollup', 'sector_radar_aggregate'
+]
@@ -0,0 +1,100 @@
+"""
+Dataset loading for the ESG Quest compute core
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Mapping, Optional
+
+import pandas as pd
+
+from utils.cache import cached
+from utils.data_generator import generate_portfolio, generate_time_series
+from utils.instrumentation import timed
+from utils.portfolio import PortfolioIndex
+from utils.schema import compact
+from utils.sector_index import SectorBenchmarkIndex
+
+
+@dataclass(frozen=True)
+class Dataset:
+    """
+    Indexed portfolio plus its sector benchmarks, one per dataset version.
+
+    Live updates derive new datasets from a snapshot: ``lineage`` keeps the
+    snapshot version and ``revisions`` counts the updates that touched each
+    dashboard section, so untouched sections stay cached.
+    """
+
+    portfolio: PortfolioIndex
+    sectors: SectorBenchmarkIndex
+    lineage: Optional[str] = None
+    revisions: Mapping[str, int] = field(default_factory=dict)
+    live_series: Optional[Any] = None
+
+    @property
+    def version(self) -> str:
+        return self.portfolio.version
+
+    def section_version(self, section: str) -> str:
+        """
+        Version of the inputs of one dashboard section.
+
+        Args:
+            section: Section name
+
+        Returns:
+            str: Snapshot version plus the section's live revision
+        """
+        return f"{self.lineage or self.version}/{self.revisions.get(section, 0)}"
+
+    @property
+    def df(self) -> pd.DataFrame:
+        return self.portfolio.df
+
+
+@timed('dataset.build_dataset')
+def build_dataset(df: pd.DataFrame, version: Optional[str] = None) -> Dataset:
+    """
+    Index a portfolio DataFrame into a dataset.
+
+    Args:
+        df: Portfolio DataFrame
+        version: Dataset version (computed from the contents if omitted)
+
+    Returns:
+        Dataset: Indexed dataset
+    """
+    portfolio = PortfolioIndex(df, version)
+    return Dataset(portfolio=portfolio, sectors=SectorBenchmarkIndex(portfolio))
+
+
+@cached()
+def load_dataset(n_companies: int = 5, seed: Optional[int] = None) -> Dataset:
+    """
+    Generate and index the mock portfolio in compact dtypes.
+
+    Args:
+        n_companies: Number of companies to generate
+        seed: Seed for reproducible output
+
+    Returns:
+        Dataset: Indexed dataset
+    """
+    return build_dataset(compact(generate_portfolio(n_companies, seed=seed), 'portfolio'))
+
+
+@cached()
+def load_time_series(company: str, metric: str, days: int = 365) -> pd.DataFrame:
+    """
+    Load the daily history of one company metric.
+
+    Args:
+        company: Company name
+        metric: Metric to load
+        days: Number of days of history
+
+    Returns:
+        pd.DataFrame: Time series data with int32 Day offsets (see utils.schema) and metric columns
+    """
+    return compact(generate_time_series(company, metric, days), f"{company} {metric} history", logging.DEBUG)
@@ -0,0 +1,256 @@
+"""
+Background PDF report export
+
+Portfolio reports are rendered in a worker pool off the Streamlit script
+thread. Each company page is built from the dashboard view builders,
+drawn with matplotlib's object-oriented API and written to the PDF as soon
+as it is done, so only one page is held in memory at a time.
+"""
+
+import itertools
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from config.settings import CHART_CONFIG, COLORS, EXPORT_CONFIG
+from esg_quest.dataset import Dataset, load_time_series
+from esg_quest.views import (
+    LIVE_HISTORY_METRIC,
+    RADAR_CATEGORIES,
+    ScoreHistory,
+    Selection,
+    build_breakdown,
+    build_stats_cards
+)
+from utils.downsampling import downsample_indices, target_points
+from utils.schema import decode_days
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ExportJob:
+    """Progress and outcome of one report export."""
+
+    id: int
+    path: str
+    companies: List[str]
+    status: str = 'queued'  # queued, running, done, cancelled or failed
+    pages_done: int = 0
+    error: Optional[str] = None
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    _cancel: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def total_pages(self) -> int:
+        return len(self.companies)
+
+    @property
+    def progress(self) -> float:
+        return self.pages_done / max(self.total_pages, 1)
+
+    @property
+    def active(self) -> bool:
+        return self.status in ('queued', 'running')
+
+    def cancel(self) -> None:
+        """Ask the worker to stop after the current page."""
+        self._cancel.set()
+
+
+def _report_history(dataset: Dataset, company: str, days: int = 365) -> ScoreHistory:
+    # Generated without the shared caches (load_time_series, live rolling statistics),
+    # so a large export does not evict the dashboard's entries
+    series = load_time_series.__wrapped__(company, 'ESG Score', days)
+    dates = decode_days(series['Day'].to_numpy())
+    values = series['ESG Score'].to_numpy(dtype=float)
+    if dataset.live_series is not None and len(dates):
+        live_dates, live_values = dataset.live_series.series(company, LIVE_HISTORY_METRIC)
+        newer = live_dates > dates[-1]
+        dates = np.concatenate([dates, live_dates[newer].astype(dates.dtype)])
+        values = np.concatenate([values, live_values[newer]])
+    indices = downsample_indices(dates, values, target_points(), CHART_CONFIG['downsampling'])
+    return ScoreHistory(company, 'ESG Score', pd.DatetimeIndex(dates[indices]), values[indices], raw_points=len(values))
+
+
+def render_company_page(dataset: Dataset, company: str):
+    """
+    Draw the report page of one company.
+
+    Args:
+        dataset: Indexed dataset
+        company: Company name
+
+    Returns:
+        matplotlib.figure.Figure: A4 landscape page
+    """
+    # Figure is used directly (no pyplot) so pages can be drawn off the main thread
+    from matplotlib.figure import Figure
+
+    # View builders are called directly: memoizing every exported company in the
+    # shared section cache would push out the live dashboard's entries
+    selection = Selection(company)
+    stats = build_stats_cards(dataset, selection)
+    breakdown = build_breakdown(dataset, selection)
+    history = _report_history(dataset, company)
+
+    fig = Figure(figsize=(11.69, 8.27))
+    fig.suptitle(f"ARDIAN ESG QUEST: {company}", fontsize=18, fontweight='bold', fontfamily='monospace')
+    grid = fig.add_gridspec(2, 3, height_ratios=[1, 1.3], hspace=0.35, wspace=0.3)
+
+    # Stats cards
+    ax = fig.add_subplot(grid[0, 0])
+    ax.axis('off')
+    ax.text(0, 1, "\n".join([
+        f"SECTOR        {stats.sector}",
+        f"MARKET CAP    ${stats.market_cap:.1f}B",
+        f"SECTOR RANK   P{stats.sector_rank:.0f}",
+        f"ESG SCORE     {stats.esg_score:.1f} ({stats.esg_tier.upper()})",
+        f"HEALTH        {stats.health_score:.0f}/100"
+    ]), va='top', fontfamily='monospace', fontsize=10)
+
+    # ESG breakdown
+    ax = fig.add_subplot(grid[0, 1])
+    scored = [column for column in breakdown.columns if column.score is not None]
+    ax.barh([column.title for column in scored], [column.score for column in scored], color='black')
+    ax.set_xlim(0, 100)
+    ax.set_title(breakdown.title, fontfamily='monospace', fontsize=10)
+    ax.invert_yaxis()
+
+    # Radar: company against its sector mean
+    ax = fig.add_subplot(grid[0, 2], projection='polar')
+    angles = np.linspace(0, 2 * np.pi, len(RADAR_CATEGORIES), endpoint=False)
+    angles = np.append(angles, angles[0])
+    position = dataset.portfolio.position(company)
+    company_values = dataset.portfolio.category_matrix(RADAR_CATEGORIES)[position]
+    sector_values = np.array([dataset.sectors.mean(stats.sector, metric) for metric in RADAR_CATEGORIES])
+    for values, color, label in [(sector_values, 'gray', 'SECTOR MEAN'), (company_values, 'black', company)]:
+        closed = np.append(values, values[0])
+        ax.plot(angles, closed, color=color, linewidth=2, label=label)
+        ax.fill(angles, closed, color=color, alpha=0.15)
+    ax.set_xticks(angles[:-1])
+    ax.set_xticklabels(RADAR_CATEGORIES, fontsize=7)
+    ax.set_ylim(0, 100)
+    ax.legend(loc='lower right', fontsize=7, bbox_to_anchor=(1.3, -0.1))
+
+    # Score history
+    ax = fig.add_subplot(grid[1, :])
+    ax.plot(history.dates, history.values, color='black', linewidth=1.5)
+    ax.fill_between(history.dates, history.values, color='black', alpha=0.1)
+    ax.set_title(history.title, fontfamily='monospace', fontsize=10)
+    ax.set_ylabel(history.metric)
+    ax.grid(color=COLORS['accent'], linewidth=0.5)
+    return fig
+
+
+class ExportQueue:
+    """Runs report exports in a small background worker pool."""
+
+    def __init__(
+        self,
+        max_workers: int = EXPORT_CONFIG['workers'],
+        output_dir: str = EXPORT_CONFIG['output_dir'],
+        keep_finished: float = EXPORT_CONFIG['keep_finished_seconds']
+    ):
+        """
+        Args:
+            max_workers: Reports rendered concurrently
+            output_dir: Directory of the exported PDFs
+            keep_finished: Seconds a finished job stays available to :meth:`get`
+        """
+        self.output_dir = output_dir
+        self.keep_finished = keep_finished
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='pdf-export')
+        self._ids = itertools.count(1)
+        self._jobs: Dict[int, ExportJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, dataset: Dataset, companies: Optional[Sequence[str]] = None) -> ExportJob:
+        """
+        Queue a report export.
+
+        Args:
+            dataset: Dataset version to export (snapshotted; later updates are not included)
+            companies: Companies to include (defaults to the whole portfolio)
+
+        Returns:
+            ExportJob: Job to poll for progress
+        """
+        job_id = next(self._ids)
+        job = ExportJob(
+            id=job_id,
+            path=os.path.join(self.output_dir, f"ardian_esg_report_{dataset.version}_{job_id}.pdf"),
+            companies=list(companies if companies is not None else dataset.portfolio.companies)
+        )
+        with self._lock:
+            self._prune()
+            self._jobs[job_id] = job
+        self._executor.submit(self._run, job, dataset)
+        return job
+
+    def get(self, job_id: int) -> Optional[ExportJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _prune(self) -> None:
+        # Forget jobs finished longer ago than keep_finished; their PDFs stay on disk
+        cutoff = time.time() - self.keep_finished
+        for job_id in [i for i, job in self._jobs.items() if job.finished is not None and job.finished < cutoff]:
+            del self._jobs[job_id]
+
+    def _run(self, job: ExportJob, dataset: Dataset) -> None:
+        from matplotlib.backends.backend_pdf import PdfPages
+
+        if job._cancel.is_set():
+            job.status, job.finished = 'cancelled', time.time()
+            return
+        job.status, job.started = 'running', time.time()
+        os.makedirs(os.path.dirname(job.path) or '.', exist_ok=True)
+        partial = job.path + '.part'
+        try:
+            # Every page is written when saved; the document is never held in memory
+            with PdfPages(partial) as pdf:
+                for company in job.companies:
+                    if job._cancel.is_set():
+                        break
+                    pdf.savefig(render_company_page(dataset, company))
+                    job.pages_done += 1
+            if job._cancel.is_set():
+                os.remove(partial)
+                job.status = 'cancelled'
+            else:
+                os.replace(partial, job.path)
+                job.status = 'done'
+        except Exception as e:
+            logger.exception("report export %d failed", job.id)
+            if os.path.exists(partial):
+                os.remove(partial)
+            job.status, job.error = 'failed', str(e)
+        finally:
+            job.finished = time.time()
+            logger.info(
+                "report export %d %s: %d of %d pages in %.1f s",
+                job.id, job.status, job.pages_done, job.total_pages, job.finished - job.started
+            )
+
+
+_QUEUE: Optional[ExportQueue] = None
+_QUEUE_LOCK = threading.Lock()
+
+
+def get_export_queue() -> ExportQueue:
+    """Get the process-wide export queue."""
+    global _QUEUE
+    with _QUEUE_LOCK:
+        if _QUEUE is None:
+            _QUEUE = ExportQueue()
+        return _QUEUE
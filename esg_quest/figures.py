@@ -0,0 +1,173 @@
+"""
+Plotly figure builders for the ESG Quest dashboard
+"""
+
+from typing import TYPE_CHECKING
+
+from esg_quest.views import RadarView, ScenarioFan, ScoreHistory
+from utils.instrumentation import timed
+
+if TYPE_CHECKING:
+    import plotly.graph_objects as go
+
+
+def _graph_objects():
+    # Plotly is imported on first use so it stays off the cold-start path
+    import plotly.graph_objects as go
+    return go
+
+
+@timed('figures.build_radar_figure')
+def build_radar_figure(radar: RadarView) -> 'go.Figure':
+    """
+    Build the PORTFOLIO COMPARISON radar chart.
+
+    Args:
+        radar: Radar view model
+
+    Returns:
+        go.Figure: Radar chart
+    """
+    go = _graph_objects()
+    fig = go.Figure()
+
+    # Aggregated mode: the outer envelope fills down to the inner one, inner quantiles dashed
+    labels = list(radar.bands)
+    if labels:
+        ordered = [labels[0], labels[-1]] + labels[1:-1] if len(labels) > 1 else labels
+        for i, label in enumerate(ordered):
+            fig.add_trace(go.Scatterpolar(
+                r=radar.bands[label],
+                theta=radar.categories,
+                fill='tonext' if i == 1 else None,
+                fillcolor='rgba(0, 0, 0, 0.12)',
+                name=f"SECTOR {label}",
+                line=dict(color='gray', width=1, dash='dash' if i > 1 else 'solid')
+            ))
+
+    for trace in radar.traces:
+        fig.add_trace(go.Scatterpolar(
+            r=trace.values,
+            theta=radar.categories,
+            # Filled polygons would hide the quantile bands
+            fill=None if radar.bands else 'toself',
+            name=trace.name,
+            line=dict(color='black' if trace.highlighted else 'gray', width=3)
+        ))
+
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(
+                visible=True,
+                range=[0, 100],
+                gridcolor='black',
+                gridwidth=2
+            ),
+            angularaxis=dict(
+                gridcolor='black',
+                gridwidth=2
+            )
+        ),
+        showlegend=True,
+        template=None,
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font=dict(family='Space Mono', color='black')
+    )
+    return fig
+
+
+@timed('figures.build_score_history_figure')
+def build_score_history_figure(history: ScoreHistory) -> 'go.Figure':
+    """
+    Build the SCORE HISTORY chart.
+
+    Args:
+        history: Score history view model
+
+    Returns:
+        go.Figure: Filled line chart
+    """
+    go = _graph_objects()
+    fig = go.Figure()
+
+    fig.add_trace(go.Scatter(
+        x=history.dates,
+        y=history.values,
+        mode='lines',
+        line=dict(color='black', width=3),
+        fill='tozeroy',
+        fillcolor='rgba(0,0,0,0.1)',
+        name='DAILY'
+    ))
+
+    for (window, means), dash in zip(sorted(history.rolling_means.items()), ['dot', 'dash', 'longdash']):
+        fig.add_trace(go.Scatter(
+            x=history.dates,
+            y=means,
+            mode='lines',
+            line=dict(color='gray', width=2, dash=dash),
+            name=f'{window}D MEAN'
+        ))
+
+    fig.update_layout(
+        title=history.title,
+        xaxis_title="Time",
+        yaxis_title=history.metric,
+        template=None,
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font=dict(family='Space Mono', color='black'),
+        xaxis=dict(gridcolor='black', gridwidth=1),
+        yaxis=dict(gridcolor='black', gridwidth=1)
+    )
+    return fig
+
+
+@timed('figures.build_scenario_fan_figure')
+def build_scenario_fan_figure(fan: ScenarioFan) -> 'go.Figure':
+    """
+    Build the ESG OUTLOOK fan chart.
+
+    Outer quantile pairs are drawn as nested shaded bands around the median,
+    with the target threshold as a dashed line.
+
+    Args:
+        fan: Scenario fan view model
+
+    Returns:
+        go.Figure: Fan chart
+    """
+    go = _graph_objects()
+    fig = go.Figure()
+
+    n_bands = len(fan.quantiles) // 2
+    for i in range(n_bands):
+        lower, upper = fan.bands[i], fan.bands[-1 - i]
+        label = f"P{fan.quantiles[i] * 100:g}-P{fan.quantiles[-1 - i] * 100:g}"
+        fig.add_trace(go.Scatter(
+            x=fan.dates, y=upper, mode='lines', line=dict(width=0), showlegend=False, hoverinfo='skip'
+        ))
+        fig.add_trace(go.Scatter(
+            x=fan.dates, y=lower, mode='lines', line=dict(width=0), fill='tonexty',
+            fillcolor=f'rgba(0,0,0,{0.1 * (i + 1)})', name=label
+        ))
+
+    if len(fan.quantiles) % 2:
+        fig.add_trace(go.Scatter(
+            x=fan.dates, y=fan.bands[n_bands], mode='lines', line=dict(color='black', width=3), name='MEDIAN'
+        ))
+    fig.add_hline(y=fan.threshold, line=dict(color='black', width=2, dash='dash'))
+
+    fig.update_layout(
+        title=fan.title,
+        xaxis_title="Time",
+        yaxis_title="ESG Score",
+        template=None,
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        font=dict(family='Space Mono', color='black'),
+        xaxis=dict(gridcolor='black', gridwidth=1),
+        yaxis=dict(gridcolor='black', gridwidth=1)
+    )
+    return fig
@@ -0,0 +1,648 @@
+"""
+Real-time metric update pipeline
+
+Live ESG and financial ticks flow from a pluggable async source through a
+bounded queue into micro-batches. Each batch is applied as a delta to the
+live dataset (copying only the touched columns) and to the live time
+series store, then the affected dashboard sections are pushed to
+subscribed sessions.
+"""
+
+import asyncio
+import collections
+import json
+import logging
+import os
+import queue
+import threading
+import weakref
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Deque, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.settings import REALTIME_CONFIG
+from esg_quest.dataset import Dataset
+from esg_quest.registry import DatasetRegistry, get_registry
+from esg_quest.sections import SECTIONS, sections_for_metrics
+from utils.rolling import ROLLING_WINDOWS, RollingStats, stat_names
+from utils.scoring import ESG_COMPONENTS, score_esg
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class MetricUpdate:
+    """One live reading; ``delta`` updates add to the current value (e.g. incident reports)."""
+
+    company: str
+    metric: str
+    value: float
+    timestamp: pd.Timestamp = field(default_factory=pd.Timestamp.now)
+    delta: bool = False
+
+    @classmethod
+    def from_json(cls, line: str) -> 'MetricUpdate':
+        record = json.loads(line)
+        return cls(
+            company=record['company'],
+            metric=record['metric'],
+            value=float(record['value']),
+            timestamp=pd.Timestamp(record['timestamp']) if record.get('timestamp') else pd.Timestamp.now(),
+            delta=bool(record.get('delta', False))
+        )
+
+    def to_json(self) -> str:
+        return json.dumps({
+            'company': self.company,
+            'metric': self.metric,
+            'value': self.value,
+            'timestamp': self.timestamp.isoformat(),
+            'delta': self.delta
+        })
+
+
+@dataclass(frozen=True)
+class Change:
+    """Sections and companies touched by one applied batch."""
+
+    revision: int
+    sections: FrozenSet[str]
+    companies: FrozenSet[str]
+
+
+# ---------------------------------------------------------------------------
+# Sources
+
+class ReplaySource:
+    """Replays updates from a JSON lines file, standing in for a live feed."""
+
+    def __init__(self, path: str, interval: float = 0.0):
+        """
+        Args:
+            path: JSON lines file, one MetricUpdate per line
+            interval: Seconds to wait between updates
+        """
+        self.path = path
+        self.interval = interval
+
+    async def __aiter__(self) -> AsyncIterator[MetricUpdate]:
+        if not os.path.exists(self.path):
+            logger.warning("replay file %s not found, no live updates", self.path)
+            return
+        with open(self.path) as f:
+            for line in f:
+                if line.strip():
+                    yield MetricUpdate.from_json(line)
+                    if self.interval:
+                        await asyncio.sleep(self.interval)
+
+
+class SocketSource:
+    """Reads updates as JSON lines from a TCP socket."""
+
+    def __init__(self, host: str, port: int):
+        """
+        Args:
+            host: Feed host
+            port: Feed port
+        """
+        self.host = host
+        self.port = port
+
+    async def __aiter__(self) -> AsyncIterator[MetricUpdate]:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    yield MetricUpdate.from_json(line.decode())
+        finally:
+            writer.close()
+
+
+def source_from_config(config: Dict = REALTIME_CONFIG):
+    """
+    Create the update source configured in REALTIME_CONFIG.
+
+    Args:
+        config: Real-time settings
+
+    Returns:
+        Async iterable of MetricUpdate
+    """
+    if config['source'] == 'socket':
+        return SocketSource(config['host'], config['port'])
+    if config['source'] == 'replay':
+        return ReplaySource(config['replay_path'], config['replay_interval'])
+    raise ValueError(f"Unknown real-time source: {config['source']}")
+
+
+def write_replay_file(
+    path: str,
+    dataset: Dataset,
+    n_updates: int = 1000,
+    seed: Optional[int] = None
+) -> None:
+    """
+    Write a synthetic replay file of score, emissions and incident updates.
+
+    Args:
+        path: Output JSON lines file
+        dataset: Dataset whose companies receive updates
+        n_updates: Number of updates
+        seed: Seed for reproducible output
+    """
+    rng = np.random.default_rng(seed)
+    companies = rng.choice(dataset.portfolio.companies, n_updates)
+    metrics = rng.choice(['ESG Total Score', 'Carbon Emissions (MT)', 'Safety Incidents'], n_updates)
+    start = pd.Timestamp.now().normalize()
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w') as f:
+        for i, (company, metric) in enumerate(zip(companies, metrics)):
+            current = dataset.portfolio.row(company)[metric]
+            if metric == 'Safety Incidents':
+                update = MetricUpdate(company, metric, 1.0, start + pd.Timedelta(minutes=i), delta=True)
+            else:
+                value = float(current * rng.normal(1, 0.02))
+                update = MetricUpdate(company, metric, value, start + pd.Timedelta(minutes=i))
+            f.write(update.to_json() + '\n')
+
+
+# ---------------------------------------------------------------------------
+# Stores
+
+class _LiveRolling:
+    """Rolling statistics of one live series, continuing a daily history."""
+
+    def __init__(self, history: np.ndarray, windows: Tuple[int, ...], max_points: int):
+        self.history = history
+        self.names = stat_names(windows)
+        self.stats = RollingStats(history, windows)
+        # Statistics after each live point, aligned with the store's buffer
+        self.rows: Deque[Tuple[float, ...]] = collections.deque(maxlen=max_points)
+
+    def push(self, value: float) -> None:
+        self.stats.append(value)
+        latest = self.stats.latest()
+        self.rows.append(tuple(float(latest[name]) for name in self.names))
+
+
+class TimeSeriesStore:
+    """
+    Bounded per-(company, metric) buffers of live points.
+
+    Series read through :meth:`rolling_series` also keep rolling statistics:
+    every appended point is fed into an incremental :class:`RollingStats`
+    seeded from the daily history it extends.
+    """
+
+    def __init__(self, max_points: int = REALTIME_CONFIG['history_points']):
+        """
+        Args:
+            max_points: Points kept per company/metric; older points are dropped
+        """
+        self.max_points = max_points
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, str], Deque[Tuple[np.datetime64, float]]] = {}
+        # (company, metric) -> (history length, windows) -> rolling statistics
+        self._rolling: Dict[Tuple[str, str], Dict[Tuple[int, Tuple[int, ...]], _LiveRolling]] = {}
+
+    def append(self, company: str, metric: str, timestamp: pd.Timestamp, value: float) -> None:
+        """
+        Append a live point.
+
+        Args:
+            company: Company name
+            metric: Metric name
+            timestamp: Reading time
+            value: Metric value after the update
+        """
+        with self._lock:
+            buffer = self._series.get((company, metric))
+            if buffer is None:
+                buffer = self._series[(company, metric)] = collections.deque(maxlen=self.max_points)
+            buffer.append((timestamp.to_datetime64(), value))
+            for rolling in self._rolling.get((company, metric), {}).values():
+                rolling.push(value)
+
+    def series(self, company: str, metric: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the live points of one company metric.
+
+        Args:
+            company: Company name
+            metric: Metric name
+
+        Returns:
+            Tuple: Timestamps (datetime64) and values
+        """
+        with self._lock:
+            points = list(self._series.get((company, metric), ()))
+        if not points:
+            return np.array([], dtype='datetime64[ns]'), np.array([], dtype=float)
+        timestamps, values = zip(*points)
+        return np.array(timestamps, dtype='datetime64[ns]'), np.array(values, dtype=float)
+
+    def rolling_series(
+        self,
+        company: str,
+        metric: str,
+        history: np.ndarray,
+        windows: Sequence[int] = ROLLING_WINDOWS
+    ) -> Tuple[np.ndarray, np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Get the live points of one company metric with their rolling statistics.
+
+        Each live point counts as the next day after ``history``. The first
+        call for a history seeds the statistics and replays the buffered
+        points; later points are added incrementally as they are appended.
+
+        Args:
+            company: Company name
+            metric: Metric name
+            history: Daily values the live points extend
+            windows: Window lengths in days
+
+        Returns:
+            Tuple: Timestamps (datetime64), values, and statistic name -> value per live point
+        """
+        history = np.asarray(history, dtype=np.float64)
+        windows = tuple(windows)
+        names = stat_names(windows)
+        with self._lock:
+            trackers = self._rolling.setdefault((company, metric), {})
+            rolling = trackers.get((len(history), windows))
+            if rolling is None or not np.array_equal(rolling.history, history, equal_nan=True):
+                rolling = trackers[(len(history), windows)] = _LiveRolling(history.copy(), windows, self.max_points)
+                for _, value in self._series.get((company, metric), ()):
+                    rolling.push(value)
+            points = list(self._series.get((company, metric), ()))
+            rows = list(rolling.rows)
+        if not points:
+            empty = np.array([], dtype=float)
+            return np.array([], dtype='datetime64[ns]'), empty, {name: empty for name in names}
+        timestamps, values = zip(*points)
+        columns = np.array(rows, dtype=float).reshape(len(rows), len(names)).T
+        return (
+            np.array(timestamps, dtype='datetime64[ns]'),
+            np.array(values, dtype=float),
+            {name: column for name, column in zip(names, columns)}
+        )
+
+
+class LiveStore:
+    """
+    Holds the current live dataset and applies update batches to it.
+
+    Every batch publishes a new immutable :class:`Dataset` by swapping one
+    reference, so sessions reading the previous version are never affected.
+    """
+
+    def __init__(
+        self,
+        dataset: Dataset,
+        time_series: Optional[TimeSeriesStore] = None,
+        registry: Optional[DatasetRegistry] = None
+    ):
+        """
+        Args:
+            dataset: Snapshot dataset the live updates start from
+            time_series: Store receiving every live point
+            registry: Registry the live versions are published to (a private one by default)
+        """
+        self.time_series = time_series or TimeSeriesStore()
+        self.registry = registry or DatasetRegistry()
+        self.revision = 0
+        self.rejected = 0
+        self.registry.publish(Dataset(
+            portfolio=dataset.portfolio,
+            sectors=dataset.sectors,
+            lineage=dataset.lineage or dataset.version,
+            revisions=dict(dataset.revisions),
+            live_series=self.time_series
+        ))
+
+    @property
+    def dataset(self) -> Dataset:
+        """Current live dataset."""
+        return self.registry.current()
+
+    def apply(self, batch: List[MetricUpdate]) -> Optional[Change]:
+        """
+        Apply a micro-batch of updates as one new dataset version.
+
+        Updates are folded per (company, metric) first, so a burst of ticks
+        for one value costs a single write.
+
+        Args:
+            batch: Updates in arrival order
+
+        Returns:
+            Change: Touched sections and companies, or None if nothing changed
+        """
+        # Other writers (e.g. ingest) may publish too; apply on top of the latest version
+        with self.registry.writing():
+            return self._apply(batch)
+
+    def _apply(self, batch: List[MetricUpdate]) -> Optional[Change]:
+        dataset = self.dataset
+        portfolio = dataset.portfolio
+        df = dataset.df
+
+        # Only numeric portfolio metrics take live values (not Company or Sector)
+        metrics = {column for column in df.columns if pd.api.types.is_numeric_dtype(df[column].dtype)}
+
+        # Fold the batch in arrival order: sets replace, deltas accumulate. Every
+        # point keeps the running value it produced, for the live history.
+        folded: Dict[Tuple[str, str], float] = {}
+        points: List[Tuple[MetricUpdate, float]] = []
+        for update in batch:
+            if update.metric not in metrics or update.company not in portfolio:
+                self.rejected += 1
+                continue
+            key = (update.company, update.metric)
+            if update.delta:
+                current = folded.get(key)
+                if current is None:
+                    current = float(df[update.metric].iat[portfolio.position(update.company)])
+                folded[key] = current + update.value
+            else:
+                folded[key] = update.value
+            points.append((update, folded[key]))
+        if not folded:
+            return None
+
+        # Copy only the touched columns into a shallow copy of the frame
+        new_df = df.copy(deep=False)
+        columns: Dict[str, np.ndarray] = {}
+        company_values: Dict[str, Dict[str, float]] = collections.defaultdict(dict)
+        for (company, metric), value in folded.items():
+            column = columns.get(metric)
+            if column is None:
+                column = columns[metric] = df[metric].to_numpy(copy=True)
+            position = portfolio.position(company)
+            column[position] = value
+            company_values[company][metric] = float(column[position])
+
+        # Keep the total score consistent when a pillar score moved, unless the
+        # batch set the total itself
+        pillars = list(ESG_COMPONENTS.values())
+        rescored = [
+            company for company, values in company_values.items()
+            if set(values) & set(pillars) and 'ESG Total Score' not in values
+        ]
+        if rescored:
+            positions = np.array([portfolio.position(company) for company in rescored])
+            pillar_values = [
+                (columns[pillar] if pillar in columns else df[pillar].to_numpy())[positions] for pillar in pillars
+            ]
+            totals = score_esg(*pillar_values, sectors=df['Sector'].to_numpy()[positions])
+            total = columns.get('ESG Total Score')
+            if total is None:
+                total = columns['ESG Total Score'] = df['ESG Total Score'].to_numpy(copy=True)
+            total[positions] = totals
+            for company, value in zip(rescored, totals):
+                company_values[company]['ESG Total Score'] = float(value)
+
+        for metric, column in columns.items():
+            new_df[metric] = column.astype(df[metric].dtype, copy=False)
+
+        self.revision += 1
+        lineage = dataset.lineage or dataset.version
+        new_portfolio = portfolio.with_frame(new_df, f"{lineage}+{self.revision}")
+        sectors = dataset.sectors.copy(new_portfolio)
+        for company, values in company_values.items():
+            sectors.update_company(company, {m: v for m, v in values.items() if m in sectors.metrics})
+
+        for update, value in points:
+            self.time_series.append(update.company, update.metric, update.timestamp, value)
+
+        touched = sections_for_metrics(columns)
+        revisions = dict(dataset.revisions)
+        for section in touched:
+            revisions[section] = revisions.get(section, 0) + 1
+
+        self.registry.publish(Dataset(
+            portfolio=new_portfolio,
+            sectors=sectors,
+            lineage=lineage,
+            revisions=revisions,
+            live_series=self.time_series
+        ))
+        return Change(self.revision, touched, frozenset(company_values))
+
+
+# ---------------------------------------------------------------------------
+# Pipeline
+
+class Subscription:
+    """Per-session mailbox of changes, bounded; the oldest change is dropped when full."""
+
+    def __init__(self, maxsize: int = REALTIME_CONFIG['subscriber_queue_size']):
+        self._queue: 'queue.Queue[Change]' = queue.Queue(maxsize)
+        self.dropped = 0
+
+    def push(self, change: Change) -> None:
+        while True:
+            try:
+                self._queue.put_nowait(change)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def poll(self) -> Optional[Change]:
+        """
+        Merge every pending change.
+
+        Returns:
+            Change: Union of the pending changes, or None if there were none
+        """
+        changes = []
+        while True:
+            try:
+                changes.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if not changes and not self.dropped:
+            return None
+        if self.dropped:
+            # Lost changes are unknown; treat everything as changed
+            self.dropped = 0
+            return Change(changes[-1].revision if changes else -1, frozenset(SECTIONS), frozenset())
+        return Change(
+            changes[-1].revision,
+            frozenset().union(*(change.sections for change in changes)),
+            frozenset().union(*(change.companies for change in changes))
+        )
+
+
+class UpdatePipeline:
+    """
+    Consumes a source into bounded micro-batches and applies them to a LiveStore.
+
+    The ingest queue is bounded: when batches apply slower than the source
+    produces, ``put`` waits and the source is paused (backpressure).
+    """
+
+    def __init__(
+        self,
+        store: LiveStore,
+        source,
+        queue_size: int = REALTIME_CONFIG['queue_size'],
+        batch_size: int = REALTIME_CONFIG['batch_size'],
+        linger_ms: float = REALTIME_CONFIG['linger_ms']
+    ):
+        """
+        Args:
+            store: Live store receiving the batches
+            source: Async iterable of MetricUpdate
+            queue_size: Ingest queue bound
+            batch_size: Max updates per micro-batch
+            linger_ms: Max wait for a micro-batch to fill
+        """
+        self.store = store
+        self.source = source
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.linger = linger_ms / 1000
+        self.batches = 0
+        self.updates = 0
+        # Weak, so a mailbox goes away with the session state holding it
+        self._subscribers: 'weakref.WeakSet[Subscription]' = weakref.WeakSet()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def subscribe(self) -> Subscription:
+        """
+        Register a session and return its mailbox.
+
+        The pipeline only holds a weak reference: the session keeps the
+        mailbox (e.g. in ``st.session_state``) and it stops receiving
+        changes once the session is gone.
+
+        Returns:
+            Subscription: The session's mailbox
+        """
+        subscription = Subscription()
+        with self._lock:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def _publish(self, change: Change) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscription in subscribers:
+            subscription.push(change)
+
+    async def _produce(self, updates: 'asyncio.Queue[Optional[MetricUpdate]]') -> None:
+        try:
+            async for update in self.source:
+                await updates.put(update)
+        finally:
+            await updates.put(None)
+
+    async def _consume(self, updates: 'asyncio.Queue[Optional[MetricUpdate]]') -> None:
+        loop = asyncio.get_running_loop()
+        done = False
+        while not done:
+            first = await updates.get()
+            if first is None:
+                break
+            batch = [first]
+            deadline = loop.time() + self.linger
+            while len(batch) < self.batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    update = await asyncio.wait_for(updates.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if update is None:
+                    done = True
+                    break
+                batch.append(update)
+
+            # Applying is CPU-bound pandas/numpy work; keep the loop free for the source
+            change = await asyncio.to_thread(self.store.apply, batch)
+            self.batches += 1
+            self.updates += len(batch)
+            if change is not None:
+                self._publish(change)
+
+    async def run(self) -> None:
+        """Run until the source is exhausted or the pipeline is stopped."""
+        updates: 'asyncio.Queue[Optional[MetricUpdate]]' = asyncio.Queue(self.queue_size)
+        producer = asyncio.create_task(self._produce(updates))
+        try:
+            await self._consume(updates)
+        finally:
+            producer.cancel()
+            logger.info("real-time pipeline stopped after %d updates in %d batches", self.updates, self.batches)
+
+    def start(self) -> None:
+        """Run the pipeline on its own event loop in a daemon thread."""
+        if self._thread is not None:
+            return
+
+        def target():
+            self._loop = asyncio.new_event_loop()
+            self._task = self._loop.create_task(self.run())
+            try:
+                self._loop.run_until_complete(self._task)
+            except asyncio.CancelledError:
+                pass
+            except Exception:
+                logger.exception("real-time pipeline failed")
+            finally:
+                self._loop.close()
+
+        self._thread = threading.Thread(target=target, name='realtime-pipeline', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Cancel the pipeline and wait for its thread."""
+        if self._loop is not None and self._task is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._task.cancel)
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+_PIPELINE: Optional[UpdatePipeline] = None
+_PIPELINE_LOCK = threading.Lock()
+
+
+def get_pipeline(dataset: Dataset) -> UpdatePipeline:
+    """
+    Get the process-wide pipeline, starting it from ``dataset`` on first use.
+
+    Live versions are published to the process-wide dataset registry.
+
+    Args:
+        dataset: Snapshot dataset the live updates start from
+
+    Returns:
+        UpdatePipeline: Running pipeline
+    """
+    global _PIPELINE
+    with _PIPELINE_LOCK:
+        if _PIPELINE is None:
+            _PIPELINE = UpdatePipeline(LiveStore(dataset, registry=get_registry()), source_from_config())
+            _PIPELINE.start()
+        return _PIPELINE
@@ -0,0 +1,139 @@
+"""
+Process-wide dataset registry
+
+One immutable, versioned dataset is shared by every session of the
+process. Readers take the current dataset with a plain reference read and
+never block; writers build a new dataset off to the side and publish it
+with a single reference swap. Sessions work on :class:`DatasetView` objects,
+which select their sector and company through position arrays instead of
+copying frames.
+"""
+
+import contextlib
+import dataclasses
+import logging
+import threading
+from typing import Callable, Iterator, Optional
+
+import pandas as pd
+
+from esg_quest.dataset import Dataset, build_dataset
+from esg_quest.views import DatasetView, Selection, dataset_view
+from utils.schema import compact_frame
+
+
+logger = logging.getLogger(__name__)
+
+
+class DatasetRegistry:
+    """Holds the current dataset version of the process and swaps it atomically."""
+
+    def __init__(self):
+        self._current: Optional[Dataset] = None
+        # Serializes writers only; readers never take it
+        self._write_lock = threading.RLock()
+        self.published = 0
+
+    def current(self) -> Dataset:
+        """
+        Get the current dataset.
+
+        Pin the result for the duration of a rerun so every section reads
+        the same version.
+
+        Returns:
+            Dataset: Current dataset
+
+        Raises:
+            LookupError: If nothing was published yet
+        """
+        dataset = self._current
+        if dataset is None:
+            raise LookupError("No dataset published")
+        return dataset
+
+    @property
+    def version(self) -> Optional[str]:
+        dataset = self._current
+        return dataset.version if dataset is not None else None
+
+    @contextlib.contextmanager
+    def writing(self) -> Iterator['DatasetRegistry']:
+        """Hold the writer lock, for read-modify-write updates of the current dataset."""
+        with self._write_lock:
+            yield self
+
+    def publish(self, dataset: Dataset) -> None:
+        """
+        Make a dataset the current version.
+
+        Args:
+            dataset: New immutable dataset
+        """
+        with self._write_lock:
+            self._current = dataset
+            self.published += 1
+        logger.debug("published dataset %s (#%d)", dataset.version, self.published)
+
+    def get_or_load(self, loader: Callable[[], Dataset]) -> Dataset:
+        """
+        Get the current dataset, loading and publishing it first if there is none.
+
+        Args:
+            loader: Builds the initial dataset
+
+        Returns:
+            Dataset: Current dataset
+        """
+        dataset = self._current
+        if dataset is not None:
+            return dataset
+        with self._write_lock:
+            if self._current is None:
+                self.publish(loader())
+            return self._current
+
+    def append(self, df: pd.DataFrame) -> Dataset:
+        """
+        Add companies to the current dataset and publish the result.
+
+        Companies already in the portfolio are replaced by their new rows.
+        The merged frame is compacted and indexed as a new snapshot; live
+        series carry over.
+
+        Args:
+            df: Validated portfolio rows, e.g. from :func:`utils.ingest.ingest_file`
+
+        Returns:
+            Dataset: The published dataset
+        """
+        with self._write_lock:
+            current = self._current
+            if current is not None:
+                kept = current.df[~current.df['Company'].isin(df['Company'])]
+                df = pd.concat([kept, df], ignore_index=True)
+            dataset = build_dataset(compact_frame(df.reset_index(drop=True)))
+            if current is not None:
+                dataset = dataclasses.replace(dataset, live_series=current.live_series)
+            self.publish(dataset)
+        return dataset
+
+    def view(self, selection: Selection) -> DatasetView:
+        """
+        Get a view of the current dataset for a session's selection.
+
+        Args:
+            selection: Sidebar selection
+
+        Returns:
+            DatasetView: Position-based view
+        """
+        return dataset_view(self.current(), selection)
+
+
+_REGISTRY = DatasetRegistry()
+
+
+def get_registry() -> DatasetRegistry:
+    """Get the process-wide dataset registry."""
+    return _REGISTRY
@@ -0,0 +1,153 @@
+"""
+Independently cached dashboard sections
+
+Each section declares which selection fields and portfolio metrics it
+depends on. Its output (view model or figure) is memoized under its section
+version plus those fields only, so a widget change or a live update
+rebuilds just the sections that read it.
+"""
+
+import contextlib
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Iterator, Tuple
+
+from esg_quest.dataset import Dataset
+from esg_quest.views import (
+    LIVE_HISTORY_METRIC,
+    PEER_FEATURES,
+    RADAR_CATEGORIES,
+    Selection,
+    build_breakdown,
+    build_radar,
+    build_rollup,
+    build_scenario_fan,
+    build_score_history,
+    build_stats_cards
+)
+from utils.cache import TTLCache, make_key
+from utils.instrumentation import span
+
+
+def _build_comparison(dataset: Dataset, selection: Selection, **options) -> Any:
+    from esg_quest.figures import build_radar_figure
+    radar = build_radar(dataset, selection, **options)
+    return radar, build_radar_figure(radar)
+
+
+def _build_history(dataset: Dataset, selection: Selection, **options) -> Any:
+    from esg_quest.figures import build_score_history_figure
+    history = build_score_history(dataset, selection, **options)
+    return history, build_score_history_figure(history)
+
+
+def _build_outlook(dataset: Dataset, selection: Selection, **options) -> Any:
+    from esg_quest.figures import build_scenario_fan_figure
+    fan = build_scenario_fan(dataset, selection, **options)
+    return fan, build_scenario_fan_figure(fan)
+
+
+@dataclass(frozen=True)
+class Section:
+    """A dashboard section, the selection fields it reads and the portfolio metrics it shows."""
+
+    name: str
+    depends_on: Tuple[str, ...]
+    build: Callable[..., Any]
+    metrics: Tuple[str, ...] = ()
+
+
+SECTIONS: Dict[str, Section] = {
+    section.name: section for section in [
+        Section('stats', ('company',), build_stats_cards, (
+            'Sector', 'Market Cap (B)', 'ESG Total Score', 'Profit Margin (%)'
+        )),
+        Section('breakdown', ('company', 'focus'), build_breakdown, (
+            'Environmental Score', 'Social Score', 'Governance Score', 'Carbon Emissions (MT)',
+            'Renewable Energy (%)', 'Employee Diversity (%)', 'Safety Incidents', 'Board Independence (%)',
+            'Revenue (B)', 'P/E Ratio', 'Profit Margin (%)', 'Debt to Equity', 'Market Cap (B)'
+        )),
+        # Peer search reads every PEER_FEATURES metric; large radars rank companies by the total
+        Section('comparison', ('company', 'sector'), _build_comparison, tuple(
+            dict.fromkeys(RADAR_CATEGORIES + PEER_FEATURES + ['ESG Total Score'])
+        )),
+        Section('history', ('company',), _build_history, (LIVE_HISTORY_METRIC,)),
+        Section('outlook', ('company',), _build_outlook, ('ESG Total Score',)),
+        Section('rollup', ('sector',), build_rollup, (
+            'Sector', 'Market Cap (B)', 'Revenue (B)', 'Carbon Emissions (MT)', 'Safety Incidents'
+        ))
+    ]
+}
+
+
+def sections_for_metrics(metrics) -> FrozenSet[str]:
+    """
+    Get the sections that display any of the given metrics.
+
+    Args:
+        metrics: Portfolio metric columns
+
+    Returns:
+        FrozenSet: Section names
+    """
+    metrics = set(metrics)
+    return frozenset(name for name, section in SECTIONS.items() if metrics.intersection(section.metrics))
+
+
+_SECTION_CACHE = TTLCache('sections')
+
+
+def section_key(name: str, dataset: Dataset, selection: Selection, **options) -> tuple:
+    """
+    Cache key of a section: section version, the selection fields it reads and its options.
+
+    Args:
+        name: Section name
+        dataset: Indexed dataset
+        selection: Sidebar selection
+        **options: Section-specific options (e.g. history zoom)
+
+    Returns:
+        tuple: Hashable cache key
+    """
+    section = SECTIONS[name]
+    return (
+        name,
+        dataset.section_version(name),
+        tuple(getattr(selection, field) for field in section.depends_on),
+        make_key((), options)
+    )
+
+
+def build_section(name: str, dataset: Dataset, selection: Selection, **options) -> Any:
+    """
+    Build a section, reusing the memoized result when its inputs did not change.
+
+    Args:
+        name: Section name
+        dataset: Indexed dataset
+        selection: Sidebar selection
+        **options: Section-specific options passed to its builder
+
+    Returns:
+        Any: Section view model or figure
+    """
+    key = section_key(name, dataset, selection, **options)
+    missing = object()
+    value = _SECTION_CACHE.get(key, missing)
+    if value is missing:
+        with span(f"section.{name}.build"):
+            value = SECTIONS[name].build(dataset, selection, **options)
+        _SECTION_CACHE.set(key, value)
+    return value
+
+
+@contextlib.contextmanager
+def timed_section(name: str) -> Iterator[None]:
+    """
+    Time a section's build and render as a span of the current rerun.
+
+    Args:
+        name: Section name
+    """
+    with span(f"section.{name}"):
+        yield
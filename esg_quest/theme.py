@@ -0,0 +1,181 @@
+"""
+Theme stylesheet for the ESG Quest dashboard
+"""
+
+import functools
+import os
+from typing import Dict, Tuple
+
+from config.settings import COLORS, FONTS, FONTS_PATH, STATIC_PATH
+
+
+# Local font files per family: (file name, weight)
+FONT_FILES = {
+    'VT323': [('VT323-Regular.woff2', 400)],
+    'Space Mono': [('SpaceMono-Regular.woff2', 400), ('SpaceMono-Bold.woff2', 700)]
+}
+
+# Remote stylesheets used for families whose files are not shipped
+FONT_FALLBACK_URLS = {
+    'VT323': 'https://fonts.googleapis.com/css2?family=VT323&display=swap',
+    'Space Mono': 'https://fonts.googleapis.com/css2?family=Space+Mono:wght@400;700&display=swap'
+}
+
+FONT_FORMATS = {'.ttf': 'truetype', '.otf': 'opentype', '.woff': 'woff', '.woff2': 'woff2'}
+
+THEME_TEMPLATE = """
+<style>
+{font_faces}
+    /* Main container */
+    .stApp {{
+        background-color: {colors[background]};
+    }}
+    
+    /* Headers with the heading font */
+    h1, h2, h3, h4, h5, h6 {{
+        font-family: '{fonts[heading]}', monospace !important;
+        color: {colors[primary]} !important;
+        text-transform: uppercase;
+        letter-spacing: 3px;
+        text-shadow: 3px 3px 0px {colors[shadow]};
+    }}
+    
+    /* Body text */
+    p, span, label, div {{
+        font-family: '{fonts[body]}', monospace !important;
+        color: {colors[primary]} !important;
+    }}
+    
+    /* Retro buttons */
+    .stButton > button {{
+        font-family: '{fonts[heading]}', monospace !important;
+        background-color: {colors[background]} !important;
+        color: {colors[primary]} !important;
+        border: 4px solid {colors[primary]} !important;
+        border-radius: 0px !important;
+        box-shadow: 4px 4px 0px {colors[primary]} !important;
+        text-transform: uppercase;
+        font-size: 20px !important;
+        letter-spacing: 2px;
+        transition: all 0.1s ease !important;
+    }}
+    
+    .stButton > button:hover {{
+        transform: translate(2px, 2px);
+        box-shadow: 2px 2px 0px {colors[primary]} !important;
+    }}
+    
+    /* Pixel-perfect containers */
+    .metric-container {{
+        background-color: {colors[background]};
+        border: 4px solid {colors[primary]};
+        border-radius: 0px;
+        padding: 15px;
+        margin: 10px 0;
+        box-shadow: 6px 6px 0px {colors[primary]};
+    }}
+    
+    /* Sidebar styling */
+    .css-1d391kg {{
+        background-color: {colors[sidebar]} !important;
+        border-right: 4px solid {colors[primary]} !important;
+    }}
+    
+    /* Metric cards */
+    [data-testid="metric-container"] {{
+        background-color: {colors[background]};
+        border: 3px solid {colors[primary]};
+        border-radius: 0px;
+        box-shadow: 4px 4px 0px {colors[primary]};
+        margin: 5px;
+    }}
+    
+    /* Select boxes */
+    .stSelectbox > div > div {{
+        background-color: {colors[background]} !important;
+        border: 2px solid {colors[primary]} !important;
+        border-radius: 0px !important;
+    }}
+    
+    /* Sliders */
+    .stSlider > div > div {{
+        background-color: {colors[primary]} !important;
+    }}
+    
+    /* Progress bars */
+    .stProgress > div > div {{
+        background-color: {colors[primary]} !important;
+    }}
+    
+    /* 8-bit style divider */
+    .pixel-divider {{
+        height: 8px;
+        background-image: repeating-linear-gradient(
+            to right,
+            {colors[primary]},
+            {colors[primary]} 8px,
+            {colors[background]} 8px,
+            {colors[background]} 16px
+        );
+        margin: 20px 0;
+    }}
+</style>
+"""
+
+
+def font_faces(fonts_path: str = FONTS_PATH) -> str:
+    """
+    Build ``@font-face`` rules pointing at the local font files.
+
+    Fonts under the static directory are loaded from Streamlit's static
+    route, so the browser fetches them once and caches them instead of
+    receiving them with every stylesheet. A family with missing files is
+    imported from Google Fonts instead, as before local fonts were
+    supported, so the theme never silently degrades to monospace.
+
+    Args:
+        fonts_path: Directory holding the font files, inside STATIC_PATH
+
+    Returns:
+        str: CSS ``@import`` rules (first, as CSS requires) and ``@font-face`` rules
+    """
+    url_path = 'app/static/' + os.path.relpath(fonts_path, STATIC_PATH).replace(os.sep, '/')
+    imports, rules = [], []
+    for family in sorted({FONTS['heading'], FONTS['body']}):
+        files = FONT_FILES.get(family, [])
+        if not all(os.path.exists(os.path.join(fonts_path, file_name)) for file_name, _ in files):
+            if family in FONT_FALLBACK_URLS:
+                imports.append(f"    @import url('{FONT_FALLBACK_URLS[family]}');")
+                continue
+        for file_name, weight in files:
+            if os.path.exists(os.path.join(fonts_path, file_name)):
+                extension = os.path.splitext(file_name)[1].lower()
+                source = f"url({url_path}/{file_name}) format('{FONT_FORMATS[extension]}'), local('{family}')"
+            else:
+                source = f"local('{family}')"
+            rules.append(
+                f"    @font-face {{ font-family: '{family}'; font-weight: {weight}; "
+                f"font-display: swap; src: {source}; }}"
+            )
+    return '\n'.join(imports + sorted(rules))
+
+
+@functools.lru_cache(maxsize=8)
+def _build_theme_css(colors: Tuple[Tuple[str, str], ...], fonts: Tuple[Tuple[str, str], ...]) -> str:
+    return THEME_TEMPLATE.format(font_faces=font_faces(), colors=dict(colors), fonts=dict(fonts))
+
+
+def build_theme_css(colors: Dict[str, str] = COLORS, fonts: Dict[str, str] = FONTS) -> str:
+    """
+    Build the retro theme stylesheet from the configured colors and fonts.
+
+    The stylesheet is built once per process and reused on every rerun.
+
+    Args:
+        colors: Color scheme (defaults to config COLORS)
+        fonts: Typography (defaults to config FONTS)
+
+    Returns:
+        str: ``<style>`` block for ``st.markdown(..., unsafe_allow_html=True)``
+    """
+    return _build_theme_css(tuple(sorted(colors.items())), tuple(sorted(fonts.items())))
@@ -0,0 +1,655 @@
+"""
+View models for the ESG Quest dashboard
+
+Pure functions turning a dataset plus the sidebar selection into the data
+each dashboard section renders. Nothing here touches Streamlit.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.settings import CHART_CONFIG, ROLLUP_CONFIG
+from esg_quest.dataset import Dataset, load_time_series
+from utils.cache import TTLCache
+from utils.classification import classify
+from utils.data_generator import PORTFOLIO_SCHEMA, generate_time_series_panel
+from utils.downsampling import downsample_indices, target_points
+from utils.instrumentation import timed
+from utils.rolling import ROLLING_WINDOWS, rolling_panel
+from utils.rollup import RollupCube
+from utils.schema import decode_days
+from utils.similarity import PeerIndex
+from utils.simulation import ScenarioModel, simulate_scenarios
+
+
+RADAR_CATEGORIES = [
+    'Environmental Score', 'Social Score', 'Governance Score',
+    'Profit Margin (%)', 'Renewable Energy (%)'
+]
+
+# Every numeric portfolio metric except the total, which is derived from the pillar scores
+PEER_FEATURES = [
+    column for column in PORTFOLIO_SCHEMA if column not in ('Company', 'Sector', 'ESG Total Score')
+]
+
+# Live ticks of this portfolio metric extend the ESG score history
+LIVE_HISTORY_METRIC = 'ESG Total Score'
+
+
+@dataclass(frozen=True)
+class Selection:
+    """Sidebar selection state."""
+
+    company: str
+    sector: str = 'All'
+    focus: str = 'ESG Overview'
+
+
+@dataclass(frozen=True)
+class DatasetView:
+    """A session's selection over a shared dataset; holds positions, never copies."""
+
+    dataset: Dataset
+    selection: Selection
+    positions: np.ndarray
+    company_position: int
+
+    @property
+    def companies(self) -> np.ndarray:
+        """Company names of the sector filter."""
+        return self.dataset.df['Company'].take(self.positions).to_numpy()
+
+    def values(self, metrics: Sequence[str]) -> np.ndarray:
+        """
+        Gather metric values of the sector filter from the shared metric matrix.
+
+        Args:
+            metrics: Metric columns
+
+        Returns:
+            np.ndarray: Matrix of shape (companies, metrics)
+        """
+        return self.dataset.portfolio.category_matrix(metrics, self.positions)
+
+
+def dataset_view(dataset: Dataset, selection: Selection) -> DatasetView:
+    """
+    Select a sector and company of a dataset without copying it.
+
+    Args:
+        dataset: Shared dataset
+        selection: Sidebar selection
+
+    Returns:
+        DatasetView: Position-based view
+    """
+    return DatasetView(
+        dataset=dataset,
+        selection=selection,
+        positions=dataset.portfolio.sector_positions(selection.sector),
+        company_position=dataset.portfolio.position(selection.company)
+    )
+
+
+@dataclass(frozen=True)
+class StatsCards:
+    """COMPANY STATS cards."""
+
+    company: str
+    sector: str
+    market_cap: float
+    sector_rank: float
+    esg_score: float
+    esg_tier: str
+    health_score: float
+
+
+@dataclass(frozen=True)
+class BreakdownColumn:
+    """One column of the stats breakdown: optional title and score bar, then metrics."""
+
+    title: Optional[str]
+    score: Optional[float]
+    metrics: List[Tuple[str, str]] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class Breakdown:
+    """ESG or financial stats breakdown for the analysis focus."""
+
+    title: str
+    columns: List[BreakdownColumn]
+
+
+@dataclass(frozen=True)
+class RadarTrace:
+    """Closed radar polygon of one company."""
+
+    name: str
+    values: List[float]
+    highlighted: bool
+
+
+@dataclass(frozen=True)
+class RadarView:
+    """PORTFOLIO COMPARISON radar chart."""
+
+    categories: List[str]
+    traces: List[RadarTrace]
+    peers: List[Tuple[str, float]] = field(default_factory=list)
+    # Aggregated mode: quantile label ('P10', ...) -> closed envelope, lowest first
+    bands: Dict[str, List[float]] = field(default_factory=dict)
+    n_companies: int = 0
+
+
+@dataclass(frozen=True)
+class ScoreHistory:
+    """SCORE HISTORY chart."""
+
+    company: str
+    metric: str
+    dates: pd.DatetimeIndex
+    values: np.ndarray
+    raw_points: int = 0
+    full_range: Optional[Tuple[pd.Timestamp, pd.Timestamp]] = None
+    rolling_means: Dict[int, np.ndarray] = field(default_factory=dict)
+    latest: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def title(self) -> str:
+        return f"ARDIAN PORTFOLIO: {self.company} ESG Score Evolution"
+
+    @property
+    def downsampled(self) -> bool:
+        return len(self.values) < self.raw_points
+
+
+@dataclass(frozen=True)
+class ScenarioFan:
+    """ESG OUTLOOK fan chart of the projected score distribution."""
+
+    company: str
+    threshold: float
+    dates: pd.DatetimeIndex
+    quantiles: Tuple[float, ...]
+    bands: np.ndarray
+    crossing_probability: float
+    median_crossing_days: float
+    start: float
+
+    @property
+    def title(self) -> str:
+        return f"ARDIAN PORTFOLIO: {self.company} ESG Score Outlook"
+
+    @property
+    def already_above(self) -> bool:
+        """Whether the current score already meets the threshold."""
+        return self.start >= self.threshold
+
+
+@dataclass(frozen=True)
+class RollupTable:
+    """PORTFOLIO ROLLUP table of the sector filter."""
+
+    by: Tuple[str, ...]
+    rows: pd.DataFrame
+    months: Tuple[pd.Period, pd.Period]
+
+
+@dataclass(frozen=True)
+class DashboardView:
+    """Every section of the dashboard for one selection."""
+
+    stats: StatsCards
+    breakdown: Optional[Breakdown]
+    radar: RadarView
+    history: ScoreHistory
+
+
+@timed('views.build_stats_cards')
+def build_stats_cards(dataset: Dataset, selection: Selection) -> StatsCards:
+    """
+    Build the COMPANY STATS cards.
+
+    Args:
+        dataset: Indexed dataset
+        selection: Sidebar selection
+
+    Returns:
+        StatsCards: Stats card view model
+    """
+    company_data = dataset.portfolio.row(selection.company)
+    esg_score = float(company_data['ESG Total Score'])
+    return StatsCards(
+        company=selection.company,
+        sector=company_data['Sector'],
+        market_cap=float(company_data['Market Cap (B)']),
+        sector_rank=dataset.sectors.company_percentile(selection.company, 'ESG Total Score'),
+        esg_score=esg_score,
+        esg_tier=classify([esg_score], 'esg')[0],
+        health_score=min(100, float(company_data['Profit Margin (%)']) * 3)
+    )
+
+
+@timed('views.build_breakdown')
+def build_breakdown(dataset: Dataset, selection: Selection) -> Optional[Breakdown]:
+    """
+    Build the stats breakdown for the analysis focus.
+
+    Args:
+        dataset: Indexed dataset
+        selection: Sidebar selection
+
+    Returns:
+        Breakdown: Breakdown view model, or None when the focus has no breakdown
+    """
+    company_data = dataset.portfolio.row(selection.company)
+
+    if selection.focus == 'ESG Overview':
+        return Breakdown('ESG STATS BREAKDOWN', [
+            BreakdownColumn('ENVIRONMENTAL', float(company_data['Environmental Score']), [
+                ("Carbon Emissions", f"{company_data['Carbon Emissions (MT)']:,.0f} MT"),
+                ("Renewable Energy", f"{company_data['Renewable Energy (%)']:.0f}%")
+            ]),
+            BreakdownColumn('SOCIAL', float(company_data['Social Score']), [
+                ("Employee Diversity", f"{company_data['Employee Diversity (%)']:.0f}%"),
+                ("Safety Incidents", f"{company_data['Safety Incidents']}")
+            ]),
+            BreakdownColumn('GOVERNANCE', float(company_data['Governance Score']), [
+                ("Board Independence", f"{company_data['Board Independence (%)']:.0f}%")
+            ])
+        ])
+
+    if selection.focus == 'Financial':
+        return Breakdown('FINANCIAL STATS', [
+            BreakdownColumn(None, None, [
+                ("Revenue", f"${company_data['Revenue (B)']:.1f}B"),
+                ("P/E Ratio", f"{company_data['P/E Ratio']:.1f}")
+            ]),
+            BreakdownColumn(None, None, [
+                ("Profit Margin", f"{company_data['Profit Margin (%)']:.1f}%"),
+                ("Debt to Equity", f"{company_data['Debt to Equity']:.2f}")
+            ]),
+            BreakdownColumn(None, None, [
+                ("Market Cap", f"${company_data['Market Cap (B)']:.1f}B")
+            ])
+        ])
+
+    return None
+
+
+_PEER_INDEXES = TTLCache('peer_index', max_entries=4)
+# Latest index and the raw feature matrix it was built from, to derive the next version
+_latest_peers: Optional[Tuple[PeerIndex, np.ndarray]] = None
+_PEER_LOCK = threading.Lock()
+
+
+def _derive_peer_index(
+    previous: PeerIndex,
+    previous_features: np.ndarray,
+    names: List[str],
+    features: np.ndarray
+) -> Optional[PeerIndex]:
+    # Companies must keep their rows; new ones can only be appended
+    if len(names) < len(previous) or names[:len(previous)] != previous.names:
+        return None
+    kept = features[:len(previous)]
+    same = (kept == previous_features) | (np.isnan(kept) & np.isnan(previous_features))
+    rows = np.concatenate([np.flatnonzero(~same.all(axis=1)), np.arange(len(previous), len(names))])
+    index = previous.copy()
+    if len(rows):
+        index.insert([names[i] for i in rows], features[rows])
+    return index
+
+
+def peer_index(dataset: Dataset) -> PeerIndex:
+    """
+    Get the nearest-peer index of a dataset, keyed by the version of its comparison inputs.
+
+    A new version is derived from the latest index by re-inserting only the
+    companies whose features changed or that were added; the index is built
+    from scratch when companies were removed or reordered.
+
+    Args:
+        dataset: Indexed dataset
+
+    Returns:
+        PeerIndex: Index over PEER_FEATURES of every company
+    """
+    global _latest_peers
+    key = dataset.section_version('comparison')
+    index = _PEER_INDEXES.get(key)
+    if index is not None:
+        return index
+
+    with _PEER_LOCK:
+        # Another session may have built it while this one waited
+        index = _PEER_INDEXES.get(key, count=False)
+        if index is not None:
+            return index
+        names = dataset.portfolio.companies
+        features = dataset.portfolio.category_matrix(PEER_FEATURES)
+        if _latest_peers is not None:
+            index = _derive_peer_index(*_latest_peers, names, features)
+        if index is None:
+            index = PeerIndex(names, features, PEER_FEATURES)
+        _PEER_INDEXES.set(key, index)
+        _latest_peers = (index, features)
+    return index
+
+
+@dataclass(frozen=True)
+class SectorRadarAggregate:
+    """Quantile envelopes and top companies of a sector filter over RADAR_CATEGORIES."""
+
+    bands: Dict[str, np.ndarray]
+    top_positions: np.ndarray
+
+
+_RADAR_AGGREGATES = TTLCache('radar_aggregates')
+
+
+def sector_radar_aggregate(dataset: Dataset, sector: str) -> SectorRadarAggregate:
+    """
+    Get the radar quantile bands and top companies of a sector filter.
+
+    Computed once per (sector, comparison section version) with one
+    vectorized percentile call, whatever the number of companies, so live
+    updates to metrics outside the comparison reuse it.
+
+    Args:
+        dataset: Indexed dataset
+        sector: Sector name, or 'All' for the whole portfolio
+
+    Returns:
+        SectorRadarAggregate: Quantile bands and top-N positions by ESG Total Score
+    """
+    key = (dataset.section_version('comparison'), sector)
+    aggregate = _RADAR_AGGREGATES.get(key)
+    if aggregate is None:
+        positions = dataset.portfolio.sector_positions(sector)
+        values = dataset.portfolio.category_matrix(RADAR_CATEGORIES, positions)
+        quantiles = CHART_CONFIG['radar_quantiles']
+        envelopes = np.nanpercentile(values, quantiles, axis=0)
+        scores = dataset.portfolio.category_matrix(['ESG Total Score'], positions)[:, 0]
+        top_n = min(CHART_CONFIG['radar_top_n'], len(positions))
+        top = np.argpartition(-scores, top_n - 1)[:top_n] if top_n else np.empty(0, dtype=np.int64)
+        top = top[np.argsort(-scores[top], kind='stable')]
+        aggregate = SectorRadarAggregate(
+            bands={f"P{q}": envelope for q, envelope in zip(quantiles, envelopes)},
+            top_positions=positions[top]
+        )
+        _RADAR_AGGREGATES.set(key, aggregate)
+    return aggregate
+
+
+def _close(values: np.ndarray) -> List[float]:
+    # Close every polygon in one go
+    return np.concatenate([values, values[..., :1]], axis=-1).tolist()
+
+
+@timed('views.build_radar')
+def build_radar(dataset: Dataset, selection: Selection, peers: int = 0) -> RadarView:
+    """
+    Build the PORTFOLIO COMPARISON radar traces.
+
+    Compares the selected company with its sector filter or, when ``peers``
+    is set, with its nearest peers across the whole portfolio. Sector
+    filters above CHART_CONFIG['radar_max_companies'] are aggregated into
+    quantile bands plus the top companies, so the number of traces stays
+    fixed however large the selection is.
+
+    Args:
+        dataset: Indexed dataset
+        selection: Sidebar selection
+        peers: Number of nearest peers to compare with (0 compares with the sector filter)
+
+    Returns:
+        RadarView: Radar view model
+    """
+    categories = RADAR_CATEGORIES + RADAR_CATEGORIES[:1]
+    nearest: List[Tuple[str, float]] = []
+    if peers:
+        nearest = peer_index(dataset).query(selection.company, peers)
+        names = np.array([selection.company] + [name for name, _ in nearest], dtype=object)
+        values = dataset.portfolio.category_matrix(
+            RADAR_CATEGORIES, np.array([dataset.portfolio.position(name) for name in names])
+        )
+    else:
+        view = dataset_view(dataset, selection)
+        if len(view.positions) > CHART_CONFIG['radar_max_companies']:
+            aggregate = sector_radar_aggregate(dataset, selection.sector)
+            # The selected company first, then the top companies it is not one of
+            top = aggregate.top_positions[aggregate.top_positions != view.company_position]
+            positions = np.concatenate([[view.company_position], top])
+            values = dataset.portfolio.category_matrix(RADAR_CATEGORIES, positions)
+            names = dataset.df['Company'].take(positions).to_numpy()
+            return RadarView(
+                categories=categories,
+                traces=[
+                    RadarTrace(name, trace_values, name == selection.company)
+                    for name, trace_values in zip(names, _close(values))
+                ],
+                bands={label: _close(envelope) for label, envelope in aggregate.bands.items()},
+                n_companies=len(view.positions)
+            )
+        values = view.values(RADAR_CATEGORIES)
+        names = view.companies
+
+    return RadarView(
+        categories=categories,
+        traces=[
+            RadarTrace(name, trace_values, name == selection.company)
+            for name, trace_values in zip(names, _close(values))
+        ],
+        peers=nearest,
+        n_companies=len(names)
+    )
+
+
+@timed('views.build_score_history')
+def build_score_history(
+    dataset: Dataset,
+    selection: Selection,
+    days: int = 365,
+    date_range: Optional[Tuple[pd.Timestamp, pd.Timestamp]] = None,
+    max_points: Optional[int] = None,
+    raw: bool = False
+) -> ScoreHistory:
+    """
+    Build the SCORE HISTORY series of the selected company.
+
+    The series is cut to ``date_range`` and, unless ``raw`` is set,
+    downsampled to ``max_points`` so the figure stays small however long
+    the history is.
+
+    Args:
+        dataset: Indexed dataset
+        selection: Sidebar selection
+        days: Number of days of history
+        date_range: Inclusive (start, end) zoom range
+        max_points: Point budget (defaults to the configured chart width)
+        raw: Send every point in the range
+
+    Returns:
+        ScoreHistory: Score history view model
+    """
+    time_series_data = load_time_series(selection.company, 'ESG Score', days)
+    dates = decode_days(time_series_data['Day'].to_numpy())
+    values = time_series_data['ESG Score'].to_numpy()
+    windows = [w for w in ROLLING_WINDOWS if w <= days]
+    stats = rolling_panel(values, windows)
+    if dataset.live_series is not None and len(values):
+        # Live points continue the daily statistics incrementally, one point per step
+        live_dates, live_values, live_stats = dataset.live_series.rolling_series(
+            selection.company, LIVE_HISTORY_METRIC, values, windows
+        )
+        if len(live_dates):
+            newer = live_dates > dates[-1]
+            dates = np.concatenate([dates, live_dates[newer].astype(dates.dtype)])
+            values = np.concatenate([values, live_values[newer]])
+            stats = {name: np.concatenate([stat, live_stats[name][newer]]) for name, stat in stats.items()}
+    stats = {name: np.pad(stat, (0, len(values) - len(stat)), constant_values=np.nan) for name, stat in stats.items()}
+    full_range = (pd.Timestamp(dates[0]), pd.Timestamp(dates[-1])) if len(dates) else None
+
+    selected = slice(None)
+    if date_range is not None:
+        bounds = np.array(date_range, dtype=dates.dtype)
+        start = np.searchsorted(dates, bounds[0], side='left')
+        stop = np.searchsorted(dates, bounds[1], side='right')
+        selected = slice(start, stop)
+    dates, values = dates[selected], values[selected]
+    stats = {name: stat[selected] for name, stat in stats.items()}
+    # Latest daily statistics of the visible range
+    daily = np.flatnonzero(np.isfinite(stats['drawdown'])) if len(values) else []
+    latest = {name: float(stat[daily[-1]]) for name, stat in stats.items()} if len(daily) else {}
+
+    raw_points = len(values)
+    if not raw:
+        indices = downsample_indices(dates, values, max_points or target_points(), CHART_CONFIG['downsampling'])
+        dates, values = dates[indices], values[indices]
+        stats = {name: stat[indices] for name, stat in stats.items()}
+
+    return ScoreHistory(
+        company=selection.company,
+        metric='ESG Score',
+        dates=pd.DatetimeIndex(dates),
+        values=values,
+        raw_points=raw_points,
+        full_range=full_range,
+        rolling_means={int(name[5:]): stat for name, stat in stats.items() if name.startswith('mean_')},
+        latest=latest
+    )
+
+
+@timed('views.build_scenario_fan')
+def build_scenario_fan(
+    dataset: Dataset,
+    selection: Selection,
+    model: ScenarioModel = ScenarioModel()
+) -> ScenarioFan:
+    """
+    Build the ESG OUTLOOK fan bands of the selected company.
+
+    Args:
+        dataset: Indexed dataset
+        selection: Sidebar selection
+        model: Scenario parameters
+
+    Returns:
+        ScenarioFan: Scenario fan view model
+    """
+    start = float(dataset.portfolio.row(selection.company)['ESG Total Score'])
+    result = simulate_scenarios(pd.Series([start], index=[selection.company]), model)
+
+    return ScenarioFan(
+        company=selection.company,
+        threshold=model.threshold,
+        dates=result.dates,
+        quantiles=model.quantiles,
+        bands=result.bands[0],
+        crossing_probability=float(result.crossing_probability.iloc[0]),
+        median_crossing_days=float(result.median_crossing_days.iloc[0]),
+        start=start
+    )
+
+
+# Daily histories rolled up by the PORTFOLIO ROLLUP cube
+ROLLUP_METRICS = ['ESG Total Score', 'Carbon Emissions (MT)']
+
+_ROLLUPS = TTLCache('rollups', max_entries=4)
+_latest_rollup: Optional[RollupCube] = None
+# Serializes deriving a cube from _latest_rollup and publishing it
+_ROLLUP_LOCK = threading.Lock()
+
+
+def _rollup_history(companies: Sequence[str], days: int, end: Optional[pd.Timestamp] = None):
+    dates, panel = generate_time_series_panel(companies, ROLLUP_METRICS, days, end=end, dtype=np.float32)
+    return dates, panel[:, 0], panel[:, 1]
+
+
+def portfolio_rollup(dataset: Dataset) -> RollupCube:
+    """
+    Get the rollup cube of a dataset, keyed by the version of its rollup inputs.
+
+    Live updates that leave ROLLUP attribute columns alone reuse the cube.
+    A new version is derived from the latest cube when it only adds
+    companies or changes their metrics (ingest, live updates): a copy of
+    that cube refreshes just the affected company-months. Otherwise the
+    cube is built from scratch over ROLLUP_CONFIG['history_days'].
+
+    Args:
+        dataset: Indexed dataset
+
+    Returns:
+        RollupCube: Shared, read-only cube
+    """
+    global _latest_rollup
+    key = dataset.section_version('rollup')
+    cube = _ROLLUPS.get(key)
+    if cube is not None:
+        return cube
+
+    with _ROLLUP_LOCK:
+        # Another session may have built it while this one waited
+        cube = _ROLLUPS.get(key, count=False)
+        if cube is not None:
+            return cube
+        latest = _latest_rollup
+        if latest is not None:
+            cube = latest.copy()
+            try:
+                cube.sync(dataset.df, lambda companies: _rollup_history(companies, cube.n_days, cube.last_date)[1:])
+            except ValueError:
+                cube = None
+        if cube is None:
+            dates, esg, carbon = _rollup_history(dataset.portfolio.companies, ROLLUP_CONFIG['history_days'])
+            cube = RollupCube.build(dataset.df, dates, esg, carbon)
+        _ROLLUPS.set(key, cube)
+        _latest_rollup = cube
+    return cube
+
+
+@timed('views.build_rollup')
+def build_rollup(dataset: Dataset, selection: Selection, by: Tuple[str, ...] = ('sector',)) -> RollupTable:
+    """
+    Build the PORTFOLIO ROLLUP table of the sector filter.
+
+    Args:
+        dataset: Indexed dataset
+        selection: Sidebar selection
+        by: Cube dimensions to break down by ('sector', 'band', 'month')
+
+    Returns:
+        RollupTable: Rollup view model
+    """
+    cube = portfolio_rollup(dataset)
+    sectors = None if selection.sector == 'All' else [selection.sector]
+    rows = cube.query(by=by, sectors=sectors)
+    if 'month' in rows.columns:
+        rows['month'] = rows['month'].astype(str)
+    return RollupTable(by=tuple(by), rows=rows, months=(cube.months[0], cube.months[-1]))
+
+
+def build_dashboard(dataset: Dataset, selection: Selection, **history_options) -> DashboardView:
+    """
+    Build every dashboard section for a selection.
+
+    Args:
+        dataset: Indexed dataset
+        selection: Sidebar selection
+        **history_options: Keyword arguments for :func:`build_score_history`
+
+    Returns:
+        DashboardView: All section view models
+    """
+    return DashboardView(
+        stats=build_stats_cards(dataset, selection),
+        breakdown=build_breakdown(dataset, selection),
+        radar=build_radar(dataset, selection),
+        history=build_score_history(dataset, selection, **history_options)
+    )
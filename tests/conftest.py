@@ -0,0 +1,20 @@
+"""
+Shared fixtures for the Ardian ESG Dashboard test suite
+"""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from esg_quest import build_dataset  # noqa: E402
+from utils.data_generator import generate_portfolio  # noqa: E402
+
+
+@pytest.fixture
+def dataset():
+    """Small indexed portfolio, rebuilt for every test."""
+    return build_dataset(generate_portfolio(20, seed=7))
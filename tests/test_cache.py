@@ -0,0 +1,29 @@
+"""
+Tests for the cache size estimates and byte budget
+"""
+
+import numpy as np
+import plotly.graph_objects as go
+
+from utils.cache import TTLCache, estimate_size
+
+
+def test_figure_size_follows_its_trace_arrays():
+    x = np.arange(50_000, dtype=float)
+    small = go.Figure(go.Scatter(x=x[:10], y=x[:10]))
+    large = go.Figure(go.Scatter(x=x, y=x, marker=dict(color=x)))
+    assert estimate_size(large) - estimate_size(small) >= 3 * x.nbytes - 2 * x[:10].nbytes
+    assert estimate_size(go.Figure(go.Bar(x=['a', 'b'], y=[1, 2]))) > 0
+
+
+def test_zero_byte_budget_disables_size_eviction():
+    cache = TTLCache('test', max_bytes=0)
+    for key in range(5):
+        cache.set(key, np.zeros(1_000_000))
+    assert cache.max_bytes == 0
+    assert all(cache.get(key) is not None for key in range(5))
+
+    bounded = TTLCache('test', max_bytes=10_000_000)
+    for key in range(5):
+        bounded.set(key, np.zeros(1_000_000))
+    assert bounded.get(0) is None and bounded.get(4) is not None
@@ -0,0 +1,23 @@
+"""
+Tests for seeded mock data generation
+"""
+
+import numpy as np
+import pandas as pd
+
+from utils.data_generator import generate_portfolio, generate_time_series_panel
+
+
+def test_same_seed_gives_the_same_portfolio():
+    pd.testing.assert_frame_equal(generate_portfolio(50, seed=3), generate_portfolio(50, seed=3))
+    assert not generate_portfolio(50, seed=3).equals(generate_portfolio(50, seed=4))
+
+
+def test_same_seed_gives_the_same_time_series_panel():
+    companies, metrics = ['A', 'B', 'C'], ['ESG Score', 'Carbon Emissions']
+    end = pd.Timestamp('2026-06-30')
+    dates, values = generate_time_series_panel(companies, metrics, days=90, seed=11, end=end)
+    again_dates, again = generate_time_series_panel(companies, metrics, days=90, seed=11, end=end)
+    assert dates.equals(again_dates)
+    np.testing.assert_array_equal(values, again)
+    assert values.shape == (3, 2, 90)
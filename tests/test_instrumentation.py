@@ -0,0 +1,37 @@
+"""
+Tests for the profiling session lock
+"""
+
+import threading
+
+from utils.instrumentation import Profiler
+
+
+def test_second_profiler_is_busy_until_the_first_stops():
+    first = Profiler('memory').start()
+    second = Profiler('cpu').start()
+    assert not first.busy and second.busy
+    assert second.stop() == ''
+    assert first.stop().startswith('current')
+
+    third = Profiler('cpu').start()
+    assert not third.busy
+    assert 'cumulative' in third.stop()
+
+
+def test_concurrent_starts_allow_one_capture():
+    barrier = threading.Barrier(4)
+    profilers = []
+
+    def run():
+        barrier.wait()
+        profilers.append(Profiler('memory').start())
+
+    threads = [threading.Thread(target=run) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sum(not profiler.busy for profiler in profilers) == 1
+    for profiler in profilers:
+        profiler.stop()
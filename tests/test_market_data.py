@@ -0,0 +1,64 @@
+"""
+Tests for the market data client against the mock provider server
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from utils.market_data import MarketDataClient, MarketDataError
+from utils.mock_market_server import MockMarketServer, mock_quote
+
+
+@pytest.fixture
+def server():
+    with MockMarketServer() as server:
+        yield server
+
+
+def run(server, work, **options):
+    async def main():
+        async with MarketDataClient(server.providers(cache_ttl=0), cache_path=':memory:', backoff=0.01, **options) as client:
+            return await work(client), client.stats
+    return asyncio.run(main())
+
+
+@pytest.mark.parametrize('provider', ['finnhub', 'alpha_vantage'])
+def test_quotes_match_the_mock_provider(server, provider):
+    quotes, _ = run(server, lambda client: client.quotes(['AAPL', 'MSFT', 'AAPL'], provider))
+    assert list(quotes.index) == ['AAPL', 'MSFT']
+    for symbol in quotes.index:
+        expected = mock_quote(symbol)
+        assert quotes.loc[symbol, 'Price'] == pytest.approx(expected['c'])
+        assert quotes.loc[symbol, 'Previous Close'] == pytest.approx(expected['pc'])
+
+
+def test_concurrent_requests_are_coalesced(server):
+    async def work(client):
+        return await asyncio.gather(*(client.quote('NVDA') for _ in range(5)))
+
+    results, stats = run(server, work)
+    assert all(result == results[0] for result in results)
+    assert stats['coalesced'] == 4
+    assert server.requests == 1
+
+
+def test_stale_responses_are_revalidated_with_etags(server):
+    async def work(client):
+        first = await client.quote('AAPL')
+        second = await client.quote('AAPL')
+        return first, second
+
+    (first, second), stats = run(server, work)
+    assert first == second
+    assert stats['revalidated'] == 1
+    assert server.not_modified == 1
+
+
+def test_malformed_json_raises_after_retries(server):
+    server.malformed.add('BAD')
+    with pytest.raises(MarketDataError, match='malformed JSON'):
+        run(server, lambda client: client.quote('BAD'), max_retries=1)
+    quotes, _ = run(server, lambda client: client.quotes(['BAD', 'AAPL']))
+    assert np.isnan(quotes.loc['BAD', 'Price']) and not np.isnan(quotes.loc['AAPL', 'Price'])
@@ -0,0 +1,76 @@
+"""
+Tests for the live update store
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from esg_quest.realtime import LiveStore, MetricUpdate, TimeSeriesStore
+from utils.rolling import rolling_panel
+
+
+START = pd.Timestamp('2026-01-05 09:00')
+
+
+def tick(company, metric, value, minute, delta=False):
+    return MetricUpdate(company, metric, value, START + pd.Timedelta(minutes=minute), delta=delta)
+
+
+def test_batch_history_keeps_each_tick_value(dataset):
+    store = LiveStore(dataset)
+    company = dataset.portfolio.companies[0]
+    incidents = float(dataset.df.loc[dataset.portfolio.position(company), 'Safety Incidents'])
+
+    store.apply([
+        tick(company, 'Social Score', 50.0, 0),
+        tick(company, 'Social Score', 51.0, 1),
+        tick(company, 'Social Score', 52.0, 2),
+        tick(company, 'Safety Incidents', 1.0, 3, delta=True),
+        tick(company, 'Safety Incidents', 1.0, 4, delta=True)
+    ])
+
+    _, social = store.time_series.series(company, 'Social Score')
+    assert social.tolist() == [50.0, 51.0, 52.0]
+    _, counts = store.time_series.series(company, 'Safety Incidents')
+    assert counts.tolist() == [incidents + 1, incidents + 2]
+    assert store.dataset.df.loc[dataset.portfolio.position(company), 'Social Score'] == pytest.approx(52.0)
+
+
+def test_explicit_total_wins_over_rescore(dataset):
+    store = LiveStore(dataset)
+    company = dataset.portfolio.companies[1]
+
+    store.apply([tick(company, 'Social Score', 10.0, 0), tick(company, 'ESG Total Score', 77.0, 1)])
+
+    row = store.dataset.portfolio.position(company)
+    assert store.dataset.df['ESG Total Score'].iloc[row] == pytest.approx(77.0)
+    assert store.time_series.series(company, 'ESG Total Score')[1].tolist() == [77.0]
+
+
+def test_non_numeric_columns_are_rejected(dataset):
+    store = LiveStore(dataset)
+    company = dataset.portfolio.companies[2]
+
+    assert store.apply([tick(company, 'Sector', 1.0, 0), tick(company, 'Company', 2.0, 1)]) is None
+    assert store.rejected == 2
+
+
+def test_live_rolling_statistics_match_a_full_recompute():
+    rng = np.random.default_rng(0)
+    history = 50 + np.cumsum(rng.normal(size=400))
+    live = 50 + rng.normal(size=20)
+    store = TimeSeriesStore()
+    for i, value in enumerate(live[:10]):
+        store.append('A', 'ESG Total Score', START + pd.Timedelta(minutes=i), value)
+    # Seeds the statistics and replays the buffered points; later appends are incremental
+    store.rolling_series('A', 'ESG Total Score', history)
+    for i, value in enumerate(live[10:], start=10):
+        store.append('A', 'ESG Total Score', START + pd.Timedelta(minutes=i), value)
+
+    _, values, stats = store.rolling_series('A', 'ESG Total Score', history)
+
+    expected = rolling_panel(np.concatenate([history, live]))
+    assert values.tolist() == live.tolist()
+    for name, column in stats.items():
+        np.testing.assert_allclose(column, expected[name][len(history):], equal_nan=True)
@@ -0,0 +1,34 @@
+"""
+Tests for incremental sector benchmark updates
+"""
+
+import numpy as np
+
+from utils.portfolio import PortfolioIndex
+from utils.sector_index import SectorBenchmarkIndex
+
+
+def test_updates_match_a_rebuilt_index(dataset):
+    portfolio = dataset.portfolio
+    metrics = ['ESG Total Score', 'Carbon Emissions (MT)']
+    index = SectorBenchmarkIndex(portfolio, metrics)
+    updated = index.copy()
+
+    df = portfolio.df.copy()
+    changes = {
+        portfolio.companies[0]: {'ESG Total Score': 99.0, 'Carbon Emissions (MT)': 0.5},
+        portfolio.companies[5]: {'ESG Total Score': 1.0},
+        portfolio.companies[9]: {'Carbon Emissions (MT)': 1e6},
+    }
+    for company, values in changes.items():
+        updated.update_company(company, values)
+        for metric, value in values.items():
+            df.loc[df['Company'] == company, metric] = value
+
+    rebuilt = SectorBenchmarkIndex(PortfolioIndex(df), metrics)
+    for sector in rebuilt.sectors:
+        for metric in metrics:
+            np.testing.assert_allclose(updated.sorted_values(sector, metric), rebuilt.sorted_values(sector, metric))
+            np.testing.assert_allclose(updated.mean(sector, metric), rebuilt.mean(sector, metric))
+    # The original index is untouched by updates to its copy
+    np.testing.assert_allclose(index.summary().to_numpy(), SectorBenchmarkIndex(portfolio, metrics).summary().to_numpy())
@@ -0,0 +1,16 @@
+"""
+Tests for the dashboard view models
+"""
+
+from esg_quest.views import Selection, build_scenario_fan
+from utils.simulation import ScenarioModel
+
+
+def test_scenario_fan_flags_a_score_already_above_the_threshold(dataset):
+    company = dataset.portfolio.companies[0]
+    score = float(dataset.portfolio.row(company)['ESG Total Score'])
+
+    above = build_scenario_fan(dataset, Selection(company), ScenarioModel(threshold=score - 1, n_paths=200))
+    below = build_scenario_fan(dataset, Selection(company), ScenarioModel(threshold=score + 20, n_paths=200))
+    assert above.already_above
+    assert not below.already_above
@@ -0,0 +1,318 @@
+"""
+Caching utilities for Ardian ESG Dashboard
+"""
+
+import dataclasses
+import functools
+import sys
+import threading
+import time
+import types
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Set
+
+import numpy as np
+import pandas as pd
+
+from config.settings import CACHE_CONFIG
+
+
+_MISSING = object()
+
+# Every live cache in this process, for the diagnostics counters. Weak, so
+# a cache created in a Streamlit script body is released with its rerun
+# instead of accumulating here.
+_REGISTRY: 'weakref.WeakSet[TTLCache]' = weakref.WeakSet()
+_REGISTRY_LOCK = threading.Lock()
+
+
+# Layout and template of a figure, which are small next to its trace data
+_FIGURE_OVERHEAD = 16 * 1024
+
+
+def _trace_size(props: Dict[str, Any]) -> int:
+    """Bytes of the data arrays set on a Plotly trace, nested properties included."""
+    size = 0
+    for item in props.values():
+        if isinstance(item, dict):
+            size += _trace_size(item)
+        elif isinstance(item, np.ndarray):
+            size += int(item.nbytes)
+        elif isinstance(item, (list, tuple)):
+            try:
+                size += int(np.asarray(item).nbytes)
+            except ValueError:
+                # Ragged nested lists
+                size += sys.getsizeof(item)
+        else:
+            size += sys.getsizeof(item)
+    return size
+
+
+def estimate_size(value: Any, _seen: Optional[Set[int]] = None) -> int:
+    """
+    Estimate the memory footprint of a cached value in bytes.
+
+    Frames and arrays report their buffers; containers, dataclasses and
+    plain objects are walked recursively, counting shared members once;
+    Plotly figures are measured by the arrays of their traces. Values this
+    cannot see into can pass an explicit size to :meth:`TTLCache.set`.
+
+    Args:
+        value: Cached value
+
+    Returns:
+        int: Approximate size in bytes
+    """
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True, index=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        # Views report their base's buffer once
+        return int(value.nbytes) if value.base is None else estimate_size(value.base, _seen)
+    if isinstance(value, (str, bytes, int, float, bool, type(None))):
+        return sys.getsizeof(value)
+    if type(value).__module__.startswith('plotly.') and hasattr(value, 'data'):
+        return _FIGURE_OVERHEAD + sum(_trace_size(getattr(trace, '_props', None) or {}) for trace in value.data)
+    if isinstance(value, (tuple, list, set, frozenset)):
+        return sys.getsizeof(value) + sum(estimate_size(item, _seen) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(
+            estimate_size(k, _seen) + estimate_size(v, _seen) for k, v in value.items()
+        )
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return sys.getsizeof(value) + sum(
+            estimate_size(getattr(value, f.name), _seen) for f in dataclasses.fields(value)
+        )
+    if hasattr(value, '__dict__') and not isinstance(value, (type, types.ModuleType)) and not callable(value):
+        return sys.getsizeof(value) + estimate_size(vars(value), _seen)
+    return sys.getsizeof(value)
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with time-to-live, entry and byte budgets.
+
+    Entries older than ``ttl`` seconds are treated as misses. When the
+    entry or byte budget is exceeded, the least recently used entries are
+    evicted first.
+    """
+
+    def __init__(
+        self,
+        name: str = 'cache',
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        timer: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            name: Name reported in the cache statistics
+            ttl: Seconds before an entry expires (defaults to CACHE_CONFIG['ttl'])
+            max_entries: Maximum number of entries (defaults to CACHE_CONFIG['max_entries'])
+            max_bytes: Budget in bytes on the estimated size of all entries, 0 to
+                disable it (defaults to CACHE_CONFIG['max_bytes'])
+            timer: Monotonic clock, injectable for tests
+        """
+        self.name = name
+        self.ttl = CACHE_CONFIG['ttl'] if ttl is None else ttl
+        self.max_entries = CACHE_CONFIG['max_entries'] if max_entries is None else max_entries
+        # None means the default budget, so 0 is what switches it off
+        self.max_bytes = (CACHE_CONFIG.get('max_bytes') if max_bytes is None else max_bytes) or 0
+        self._timer = timer
+        self._lock = threading.RLock()
+        # key -> (value, expires_at, size)
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        with _REGISTRY_LOCK:
+            _REGISTRY.add(self)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING, count=False) is not _MISSING
+
+    def get(self, key: Hashable, default: Any = None, count: bool = True) -> Any:
+        """
+        Look up a key, refreshing its LRU position on a hit.
+
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+            count: Whether to update the hit/miss counters
+
+        Returns:
+            Any: Cached value or ``default``
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= self._timer():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                if count:
+                    self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            if count:
+                self.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any, size: Optional[int] = None) -> None:
+        """
+        Store a value and evict entries until the budgets are met.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            size: Size of the value in bytes (estimated with :func:`estimate_size` if omitted)
+        """
+        if size is None:
+            size = estimate_size(value) if self.max_bytes else 0
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, self._timer() + self.ttl, size)
+            self._bytes += size
+            self._evict()
+
+    def clear(self) -> None:
+        """Remove all entries, keeping the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the cache counters.
+
+        Returns:
+            Dict: Entry count, byte usage, hits, misses, evictions and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
+
+    def _evict(self) -> None:
+        # Drop expired entries first, then least recently used ones
+        now = self._timer()
+        for key in [k for k, entry in self._entries.items() if entry[1] <= now]:
+            self._remove(key)
+            self.expirations += 1
+        while self._entries and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes and self._bytes > self.max_bytes and len(self._entries) > 1)
+        ):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+
+def make_key(args: tuple, kwargs: Dict[str, Any]) -> Hashable:
+    """
+    Build a hashable cache key from call arguments.
+
+    Args:
+        args: Positional arguments
+        kwargs: Keyword arguments
+
+    Returns:
+        Hashable: Cache key
+
+    Raises:
+        TypeError: If an argument cannot be turned into a hashable key
+    """
+    def freeze(value: Any) -> Hashable:
+        if isinstance(value, (list, tuple)):
+            return tuple(freeze(item) for item in value)
+        if isinstance(value, dict):
+            return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+        if isinstance(value, (set, frozenset)):
+            return frozenset(freeze(item) for item in value)
+        hash(value)
+        return value
+
+    return freeze(args), freeze(kwargs)
+
+
+def cached(
+    ttl: Optional[float] = None,
+    max_entries: Optional[int] = None,
+    max_bytes: Optional[int] = None,
+    name: Optional[str] = None
+) -> Callable:
+    """
+    Decorator memoizing a function in a bounded :class:`TTLCache`.
+
+    Cached values are shared, not copied, so callers must treat them as
+    read-only. The cache is available as ``wrapper.cache``. Decorate
+    functions in imported modules, not in the Streamlit script: the script
+    body re-executes on every rerun, which would create a new, empty cache
+    each time.
+
+    Args:
+        ttl: Seconds before an entry expires (defaults to CACHE_CONFIG['ttl'])
+        max_entries: Maximum number of entries (defaults to CACHE_CONFIG['max_entries'])
+        max_bytes: Budget in bytes on the estimated size of all entries, 0 to
+            disable it (defaults to CACHE_CONFIG['max_bytes'])
+        name: Name reported in the cache statistics (defaults to the function name)
+
+    Returns:
+        Callable: Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        cache = TTLCache(name or func.__qualname__, ttl, max_entries, max_bytes)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = make_key(args, kwargs)
+            value = cache.get(key, _MISSING)
+            if value is _MISSING:
+                value = func(*args, **kwargs)
+                cache.set(key, value)
+            return value
+
+        wrapper.cache = cache
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    return decorator
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    """
+    Get the counters of every cache in the process.
+
+    Returns:
+        Dict: Cache statistics keyed by cache name
+    """
+    with _REGISTRY_LOCK:
+        caches = list(_REGISTRY)
+    return {cache.name: cache.stats() for cache in caches}
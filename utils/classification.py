@@ -0,0 +1,149 @@
+"""
+Threshold classification utilities for Ardian ESG Dashboard
+"""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from config.settings import THRESHOLDS
+
+
+# Band definitions built from config THRESHOLDS. ``side='right'`` puts a value
+# equal to an edge in the upper band (scores), ``'left'`` in the lower one (emissions).
+BANDS = {
+    'esg': {
+        'edges': [THRESHOLDS['esg_fair'], THRESHOLDS['esg_good'], THRESHOLDS['esg_excellent']],
+        'labels': ['Poor', 'Fair', 'Good', 'Excellent'],
+        'side': 'right'
+    },
+    'carbon': {
+        'edges': [THRESHOLDS['carbon_low'], THRESHOLDS['carbon_medium'], THRESHOLDS['carbon_high']],
+        'labels': ['Low', 'Medium', 'High', 'Very High'],
+        'side': 'left'
+    },
+    'diversity': {
+        'edges': [THRESHOLDS['diversity_low'], THRESHOLDS['diversity_medium'], THRESHOLDS['diversity_high']],
+        'labels': ['Very Low', 'Low', 'Medium', 'High'],
+        'side': 'right'
+    }
+}
+
+# Portfolio column -> (band, band column)
+BAND_COLUMNS = {
+    'ESG Total Score': ('esg', 'ESG Band'),
+    'Carbon Emissions (MT)': ('carbon', 'Carbon Band'),
+    'Employee Diversity (%)': ('diversity', 'Diversity Band')
+}
+
+
+def band_codes(values: np.ndarray, band: str) -> np.ndarray:
+    """
+    Map values of any shape to integer band codes in one vectorized call.
+
+    Args:
+        values: Metric values
+        band: Band name in BANDS
+
+    Returns:
+        np.ndarray: int8 band codes, -1 for missing values
+    """
+    spec = BANDS[band]
+    values = np.asarray(values, dtype=float)
+    codes = np.searchsorted(np.asarray(spec['edges'], dtype=float), values, side=spec['side']).astype(np.int8)
+    codes[np.isnan(values)] = -1
+    return codes
+
+
+def band_dtype(band: str) -> pd.CategoricalDtype:
+    """
+    Get the ordered categorical dtype of a band.
+
+    Args:
+        band: Band name in BANDS
+
+    Returns:
+        pd.CategoricalDtype: Ordered band labels
+    """
+    return pd.CategoricalDtype(BANDS[band]['labels'], ordered=True)
+
+
+def classify(values: np.ndarray, band: str) -> pd.Categorical:
+    """
+    Classify a column of values into ordered band labels.
+
+    Args:
+        values: 1-D metric values
+        band: Band name in BANDS
+
+    Returns:
+        pd.Categorical: Band of each value
+    """
+    return pd.Categorical.from_codes(band_codes(values, band), dtype=band_dtype(band))
+
+
+def classify_portfolio(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add ESG, carbon and diversity band columns to a portfolio.
+
+    Args:
+        df: Portfolio DataFrame
+
+    Returns:
+        pd.DataFrame: Copy of the portfolio with categorical band columns
+    """
+    return df.assign(**{
+        band_column: classify(df[column].to_numpy(), band)
+        for column, (band, band_column) in BAND_COLUMNS.items() if column in df
+    })
+
+
+def band_counts(
+    bands: pd.Series,
+    groups: Optional[pd.Series] = None
+) -> pd.DataFrame:
+    """
+    Count band members, optionally per group (e.g. sector).
+
+    Args:
+        bands: Categorical band column
+        groups: Grouping column aligned with ``bands``
+
+    Returns:
+        pd.DataFrame: Group x band counts
+    """
+    bands = pd.Categorical(bands)
+    band_labels = bands.categories
+    if groups is None:
+        counts = np.bincount(bands.codes[bands.codes >= 0], minlength=len(band_labels))
+        return pd.DataFrame([counts], index=['All'], columns=band_labels)
+
+    group_codes, group_labels = pd.factorize(np.asarray(groups, dtype=object), sort=False)
+    valid = (bands.codes >= 0) & (group_codes >= 0)
+    flat = group_codes[valid].astype(np.int64) * len(band_labels) + bands.codes[valid]
+    counts = np.bincount(flat, minlength=len(group_labels) * len(band_labels))
+    return pd.DataFrame(
+        counts.reshape(len(group_labels), len(band_labels)),
+        index=pd.Index(group_labels, name=getattr(groups, 'name', None)),
+        columns=band_labels
+    )
+
+
+def band_code_counts(codes: np.ndarray, band: str, axis: Optional[int] = None) -> np.ndarray:
+    """
+    Count band codes of a panel (e.g. company-days) along an axis.
+
+    Args:
+        codes: Band codes from :func:`band_codes`
+        band: Band name in BANDS
+        axis: Axis to count along (all values if None)
+
+    Returns:
+        np.ndarray: Counts with the band axis last
+    """
+    n_bands = len(BANDS[band]['labels'])
+    if axis is None:
+        return np.bincount(codes[codes >= 0].ravel(), minlength=n_bands)
+    one_hot = codes[..., None] == np.arange(n_bands, dtype=codes.dtype)
+    return one_hot.sum(axis=axis % codes.ndim)
@@ -4,111 +4,295 @@ Data generation utilities for Ardian ESG Dashboard
 
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
-import random
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 
+from config.settings import SECTORS
+from utils.instrumentation import timed
+from utils.portfolio import PortfolioIndex
+from utils.scoring import score_esg
+from utils.sector_index import SectorBenchmarkIndex
 
-def generate_mock_data() -> pd.DataFrame:
+
+PORTFOLIO_COMPANIES = [
+    'TechVenture SA', 
+    'WindPower Europe', 
+    'RetailNext Group', 
+    'MedTech Solutions', 
+    'LogiTrans International'
+]
+
+# Column spec for the portfolio generator:
+# (column, low, high, base_performance exponent, scale, cap at 100)
+PORTFOLIO_COLUMNS = [
+    ('Market Cap (B)', 10, 500, 1, 1.0, False),
+    ('Revenue (B)', 5, 200, 1, 1.0, False),
+    ('P/E Ratio', 10, 40, 0, 1.0, False),
+    ('Profit Margin (%)', 5, 30, 1, 1.0, False),
+    ('Debt to Equity', 0.3, 2.5, -1, 1.0, False),
+    
+    # ESG pillar scores with some correlation to financial performance
+    ('Environmental Score', 30, 95, 1, 1.0, True),
+    ('Social Score', 35, 90, 1, 1.05, True),
+    ('Governance Score', 40, 95, 1, 1.1, True),
+    
+    # Specific ESG metrics
+    ('Carbon Emissions (MT)', 1000, 50000, -1, 1.0, False),
+    ('Renewable Energy (%)', 10, 80, 1, 1.0, False),
+    ('Employee Diversity (%)', 20, 60, 1, 1.0, False),
+    ('Board Independence (%)', 30, 90, 1, 1.0, False),
+    
+    # Additional metrics
+    ('Employee Satisfaction', 60, 95, 1, 1.0, False),
+    ('Community Investment (M)', 1, 50, 1, 1.0, False),
+    ('Waste Recycled (%)', 20, 90, 1, 1.0, False),
+    ('Water Usage (M Liters)', 100, 5000, -1, 1.0, False),
+    ('Innovation Score', 40, 90, 1, 1.0, False)
+]
+
+PORTFOLIO_SCHEMA = [
+    'Company', 'Sector', 'Market Cap (B)', 'Revenue (B)', 'P/E Ratio', 'Profit Margin (%)',
+    'Debt to Equity', 'ESG Total Score', 'Environmental Score', 'Social Score', 'Governance Score',
+    'Carbon Emissions (MT)', 'Renewable Energy (%)', 'Employee Diversity (%)', 'Board Independence (%)',
+    'Safety Incidents', 'Employee Satisfaction', 'Community Investment (M)', 'Waste Recycled (%)',
+    'Water Usage (M Liters)', 'Innovation Score'
+]
+
+
+def generate_company_names(n_companies: int) -> np.ndarray:
     """
-    Generate mock ESG and financial data for portfolio companies.
+    Generate company names for a portfolio of the given size.
     
+    The first names are the hand-picked portfolio companies; larger
+    portfolios are padded with numbered synthetic holdings.
+    
+    Args:
+        n_companies: Number of companies
+        
     Returns:
-        pd.DataFrame: DataFrame containing company data with ESG and financial metrics
+        np.ndarray: Array of company names
     """
-    companies = [
-        'TechVenture SA', 
-        'WindPower Europe', 
-        'RetailNext Group', 
-        'MedTech Solutions', 
-        'LogiTrans International'
-    ]
-    sectors = [
-        'Technology', 
-        'Renewable Energy', 
-        'Retail', 
-        'Healthcare', 
-        'Transportation'
-    ]
-    
-    data = []
-    for i, company in enumerate(companies):
-        # Generate correlated metrics for more realistic data
-        base_performance = np.random.uniform(0.4, 0.9)
-        
-        financial_data = {
-            'Company': company,
-            'Sector': sectors[i],
-            'Market Cap (B)': np.random.uniform(10, 500) * base_performance,
-            'Revenue (B)': np.random.uniform(5, 200) * base_performance,
-            'P/E Ratio': np.random.uniform(10, 40),
-            'Profit Margin (%)': np.random.uniform(5, 30) * base_performance,
-            'Debt to Equity': np.random.uniform(0.3, 2.5) / base_performance,
-            
-            # ESG scores with some correlation to financial performance
-            'ESG Total Score': min(100, np.random.uniform(40, 90) * base_performance * 1.1),
-            'Environmental Score': min(100, np.random.uniform(30, 95) * base_performance),
-            'Social Score': min(100, np.random.uniform(35, 90) * base_performance * 1.05),
-            'Governance Score': min(100, np.random.uniform(40, 95) * base_performance * 1.1),
-            
-            # Specific ESG metrics
-            'Carbon Emissions (MT)': np.random.uniform(1000, 50000) / base_performance,
-            'Renewable Energy (%)': np.random.uniform(10, 80) * base_performance,
-            'Employee Diversity (%)': np.random.uniform(20, 60) * base_performance,
-            'Board Independence (%)': np.random.uniform(30, 90) * base_performance,
-            'Safety Incidents': max(0, int(np.random.normal(10, 5) / base_performance)),
-            
-            # Additional metrics
-            'Employee Satisfaction': np.random.uniform(60, 95) * base_performance,
-            'Community Investment (M)': np.random.uniform(1, 50) * base_performance,
-            'Waste Recycled (%)': np.random.uniform(20, 90) * base_performance,
-            'Water Usage (M Liters)': np.random.uniform(100, 5000) / base_performance,
-            'Innovation Score': np.random.uniform(40, 90) * base_performance
-        }
-        data.append(financial_data)
+    names = np.array(PORTFOLIO_COMPANIES[:n_companies], dtype=object)
+    if n_companies <= len(PORTFOLIO_COMPANIES):
+        return names
     
-    return pd.DataFrame(data)
+    width = len(str(n_companies))
+    synthetic = [f'Holding {i:0{width}d}' for i in range(len(PORTFOLIO_COMPANIES) + 1, n_companies + 1)]
+    return np.concatenate([names, np.array(synthetic, dtype=object)])
 
 
-def generate_time_series(company: str, metric: str, days: int = 365) -> pd.DataFrame:
+@timed('data.generate_portfolio')
+def generate_portfolio(
+    n_companies: int = 5,
+    sectors: Optional[List[str]] = None,
+    seed: Union[None, int, np.random.Generator] = None
+) -> pd.DataFrame:
     """
-    Generate time series data for a specific metric.
+    Generate a columnar mock portfolio of arbitrary size.
+    
+    Every metric column is drawn in a single batched call and scaled by a
+    per-company ``base_performance`` factor, so financial and ESG metrics
+    stay correlated the same way as in :func:`generate_mock_data`. The ESG
+    total score is computed from the pillar scores with the config weights.
     
     Args:
-        company: Company name
-        metric: Metric to generate time series for
-        days: Number of days to generate data for
+        n_companies: Number of companies to generate
+        sectors: Sectors assigned round-robin to companies (defaults to config SECTORS)
+        seed: Seed or ``numpy.random.Generator`` for reproducible output
         
     Returns:
-        pd.DataFrame: Time series data with Date and metric columns
+        pd.DataFrame: DataFrame containing company data with ESG and financial metrics
     """
-    dates = [datetime.now() - timedelta(days=x) for x in range(days, 0, -1)]
+    if sectors is None:
+        sectors = SECTORS
+    rng = np.random.default_rng(seed)
+    
+    base_performance = rng.uniform(0.4, 0.9, n_companies)
     
+    lows = np.array([spec[1] for spec in PORTFOLIO_COLUMNS], dtype=float)
+    highs = np.array([spec[2] for spec in PORTFOLIO_COLUMNS], dtype=float)
+    exponents = np.array([spec[3] for spec in PORTFOLIO_COLUMNS], dtype=float)
+    scales = np.array([spec[4] for spec in PORTFOLIO_COLUMNS], dtype=float)
+    capped = np.array([spec[5] for spec in PORTFOLIO_COLUMNS])
+    
+    # One (n_companies, n_columns) draw for all uniform metrics
+    values = rng.uniform(lows, highs, size=(n_companies, len(PORTFOLIO_COLUMNS)))
+    values *= base_performance[:, None] ** exponents * scales
+    values[:, capped] = np.minimum(values[:, capped], 100)
+    
+    incidents = rng.normal(10, 5, n_companies) / base_performance
+    
+    data = {
+        'Company': generate_company_names(n_companies),
+        'Sector': np.asarray(sectors, dtype=object)[np.arange(n_companies) % len(sectors)]
+    }
+    for i, spec in enumerate(PORTFOLIO_COLUMNS):
+        data[spec[0]] = values[:, i]
+    data['Safety Incidents'] = np.maximum(0, incidents.astype(np.int64))
+    data['ESG Total Score'] = score_esg(
+        data['Environmental Score'], data['Social Score'], data['Governance Score'],
+        sectors=data['Sector']
+    )
+    
+    return pd.DataFrame(data, columns=PORTFOLIO_SCHEMA)
+
+
+def generate_mock_data(
+    n_companies: int = 5,
+    seed: Union[None, int, np.random.Generator] = None
+) -> pd.DataFrame:
+    """
+    Generate mock ESG and financial data for portfolio companies.
+    
+    Args:
+        n_companies: Number of companies to generate
+        seed: Seed or ``numpy.random.Generator`` for reproducible output
+    
+    Returns:
+        pd.DataFrame: DataFrame containing company data with ESG and financial metrics
+    """
+    return generate_portfolio(n_companies, seed=seed)
+
+
+def get_metric_rules(metric: str) -> Dict[str, float]:
+    """
+    Get the time series generation rules for a metric.
+    
+    Args:
+        metric: Metric name
+        
+    Returns:
+        Dict: Base value range, trend range and value bounds for the metric
+    """
     # Create realistic trends based on metric type
     if 'Score' in metric or 'ESG' in metric:
-        base_value = np.random.uniform(50, 70)
-        trend = np.random.uniform(0.01, 0.05)  # Positive trend for scores
+        rules = {'base_low': 50, 'base_high': 70, 'trend_low': 0.01, 'trend_high': 0.05}  # Positive trend for scores
     elif 'Emissions' in metric:
-        base_value = np.random.uniform(30000, 50000)
-        trend = np.random.uniform(-0.02, 0.01)  # Slight negative trend
+        rules = {'base_low': 30000, 'base_high': 50000, 'trend_low': -0.02, 'trend_high': 0.01}  # Slight negative trend
     else:
-        base_value = np.random.uniform(30, 80)
-        trend = np.random.uniform(-0.01, 0.03)
-    
-    # Add seasonality and noise
-    seasonal_factor = np.sin(np.linspace(0, 4*np.pi, days)) * 5
-    noise = np.random.normal(0, 3, days)
-    values = base_value + trend * np.arange(days) + seasonal_factor + noise
+        rules = {'base_low': 30, 'base_high': 80, 'trend_low': -0.01, 'trend_high': 0.03}
     
     # Ensure values stay within reasonable bounds
     if 'Score' in metric or '%' in metric:
-        values = np.clip(values, 0, 100)
+        rules.update(lower=0, upper=100)
     elif 'Emissions' in metric:
-        values = np.maximum(values, 1000)
+        rules.update(lower=1000, upper=np.inf)
+    else:
+        rules.update(lower=-np.inf, upper=np.inf)
+    return rules
+
+
+@timed('data.generate_time_series_panel')
+def generate_time_series_panel(
+    companies: Sequence[str],
+    metrics: Sequence[str],
+    days: int = 365,
+    seed: Union[None, int, np.random.Generator] = None,
+    end: Optional[pd.Timestamp] = None,
+    dtype: type = np.float64
+) -> Tuple[pd.DatetimeIndex, np.ndarray]:
+    """
+    Generate time series for every company and metric in one vectorized pass.
+    
+    Base values and trends are drawn per (company, metric) and broadcast over
+    the shared day axis together with seasonality and Gaussian noise. Use
+    ``dtype=np.float32`` to halve memory for portfolio-wide histories.
+    
+    Args:
+        companies: Company names (N)
+        metrics: Metric names (M)
+        days: Number of days to generate data for (D)
+        seed: Seed or ``numpy.random.Generator`` for reproducible output
+        end: Last date of the series (defaults to yesterday)
+        dtype: Floating point dtype of the returned values
+        
+    Returns:
+        Tuple: Dates of length D and values with shape (N, M, D)
+    """
+    rng = np.random.default_rng(seed)
+    if end is None:
+        end = pd.Timestamp.now().normalize() - pd.Timedelta(days=1)
+    dates = pd.date_range(end=end, periods=days, freq='D')
+    
+    rules = [get_metric_rules(metric) for metric in metrics]
+    n_companies, n_metrics = len(companies), len(metrics)
+    
+    def rule_array(key: str) -> np.ndarray:
+        return np.array([rule[key] for rule in rules], dtype=float)
+    
+    base_value = rng.uniform(rule_array('base_low'), rule_array('base_high'), size=(n_companies, n_metrics))
+    trend = rng.uniform(rule_array('trend_low'), rule_array('trend_high'), size=(n_companies, n_metrics))
+    lower, upper = rule_array('lower'), rule_array('upper')
+    
+    # Noise is drawn straight into the output buffer, everything else is added in place
+    values = rng.standard_normal((n_companies, n_metrics, days), dtype=dtype)
+    values *= 3
+    values += (np.sin(np.linspace(0, 4*np.pi, days)) * 5).astype(dtype)
+    values += base_value[..., None].astype(dtype)
+    
+    steps = np.arange(days, dtype=dtype)
+    for j in range(n_metrics):
+        block = values[:, j, :]
+        block += trend[:, j, None].astype(dtype) * steps
+        if np.isfinite(lower[j]) or np.isfinite(upper[j]):
+            np.clip(block, lower[j], upper[j], out=block)
+    
+    return dates, values
+
+
+def panel_to_long(
+    dates: pd.DatetimeIndex,
+    companies: Sequence[str],
+    metrics: Sequence[str],
+    values: np.ndarray
+) -> pd.DataFrame:
+    """
+    Convert a (companies, metrics, days) panel into a long-format DataFrame.
+    
+    Args:
+        dates: Dates of the day axis
+        companies: Company names of the first axis
+        metrics: Metric names of the second axis
+        values: Panel values with shape (N, M, D)
+        
+    Returns:
+        pd.DataFrame: Long-format data with Company, Metric, Date and Value columns
+    """
+    n_companies, n_metrics, days = values.shape
+    return pd.DataFrame({
+        'Company': pd.Categorical.from_codes(
+            np.repeat(np.arange(n_companies), n_metrics * days), categories=pd.Index(companies)
+        ),
+        'Metric': pd.Categorical.from_codes(
+            np.tile(np.repeat(np.arange(n_metrics), days), n_companies), categories=pd.Index(metrics)
+        ),
+        'Date': np.tile(dates.values, n_companies * n_metrics),
+        'Value': values.reshape(-1)
+    })
+
+
+def generate_time_series(
+    company: str,
+    metric: str,
+    days: int = 365,
+    seed: Union[None, int, np.random.Generator] = None
+) -> pd.DataFrame:
+    """
+    Generate time series data for a specific metric.
+    
+    Args:
+        company: Company name
+        metric: Metric to generate time series for
+        days: Number of days to generate data for
+        seed: Seed or ``numpy.random.Generator`` for reproducible output
+        
+    Returns:
+        pd.DataFrame: Time series data with Date and metric columns
+    """
+    dates, values = generate_time_series_panel([company], [metric], days, seed=seed)
     
     return pd.DataFrame({
         'Date': dates,
-        metric: values
+        metric: values[0, 0]
     })
 
 
@@ -116,6 +300,8 @@ def calculate_esg_score(environmental: float, social: float, governance: float)
     """
     Calculate weighted ESG score from component scores.
     
+    Uses config ESG_WEIGHTS; see :func:`utils.scoring.score_esg` for whole columns.
+    
     Args:
         environmental: Environmental score (0-100)
         social: Social score (0-100)
@@ -124,29 +310,32 @@ def calculate_esg_score(environmental: float, social: float, governance: float)
     Returns:
         float: Weighted ESG score
     """
-    weights = {'E': 0.35, 'S': 0.35, 'G': 0.30}
-    return (environmental * weights['E'] + 
-            social * weights['S'] + 
-            governance * weights['G'])
+    return float(score_esg(environmental, social, governance))
 
 
-def generate_sector_benchmarks() -> Dict[str, Dict[str, float]]:
+def generate_sector_benchmarks(df: Optional[pd.DataFrame] = None) -> Dict[str, Dict[str, float]]:
     """
     Generate sector benchmark data for comparison.
     
+    Args:
+        df: Portfolio DataFrame (defaults to a freshly generated mock portfolio)
+    
     Returns:
         Dict: Sector benchmarks for various metrics
     """
-    sectors = ['Technology', 'Renewable Energy', 'Retail', 'Healthcare', 'Transportation']
+    if df is None:
+        df = generate_mock_data()
+    index = SectorBenchmarkIndex(PortfolioIndex(df))
     benchmarks = {}
     
-    for sector in sectors:
+    for sector in index.sectors:
         benchmarks[sector] = {
-            'ESG Average': np.random.uniform(50, 75),
-            'Carbon Intensity': np.random.uniform(10, 100),
-            'Diversity Average': np.random.uniform(30, 60),
-            'Governance Average': np.random.uniform(60, 85),
-            'Innovation Index': np.random.uniform(40, 80)
+            'ESG Average': index.mean(sector, 'ESG Total Score'),
+            # Metric tons of CO2 per $B of revenue
+            'Carbon Intensity': index.mean(sector, 'Carbon Emissions (MT)') / index.mean(sector, 'Revenue (B)'),
+            'Diversity Average': index.mean(sector, 'Employee Diversity (%)'),
+            'Governance Average': index.mean(sector, 'Governance Score'),
+            'Innovation Index': index.mean(sector, 'Innovation Score')
         }
     
     return benchmarks
@@ -0,0 +1,157 @@
+"""
+Series downsampling utilities for Ardian ESG Dashboard
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+from config.settings import CHART_CONFIG
+
+
+def target_points(width_px: int = None, method: str = None) -> int:
+    """
+    Number of points worth sending for a chart of the given width.
+
+    LTTB picks one representative point per bucket, so one point per pixel
+    column is enough; min/max keeps both extremes of each column, so it
+    needs two. The width is an assumed layout width from the settings, not
+    the width the browser actually renders.
+
+    Args:
+        width_px: Assumed chart width in pixels (defaults to CHART_CONFIG['width_px'])
+        method: 'lttb' or 'minmax' (defaults to CHART_CONFIG['downsampling'])
+
+    Returns:
+        int: Target point count
+    """
+    width = int(width_px or CHART_CONFIG['width_px'])
+    return 2 * width if (method or CHART_CONFIG['downsampling']) == 'minmax' else width
+
+
+def _as_float(x: np.ndarray) -> np.ndarray:
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype(np.int64).astype(float)
+    return x.astype(float)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Select points with Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last point and, for each of ``n_out - 2`` buckets,
+    the point forming the largest triangle with the previously selected
+    point and the mean of the next bucket, which preserves peaks and troughs.
+
+    Args:
+        x: Sorted x values (numeric or datetime64)
+        y: Values
+        n_out: Number of points to keep
+
+    Returns:
+        np.ndarray: Sorted indices of the selected points
+    """
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1], dtype=np.int64)[:max(n_out, 0)]
+
+    x, y = _as_float(x), np.asarray(y, dtype=float)
+    # Bucket edges over the interior points
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # Averages of every bucket at once, plus the last point as the final "next bucket"
+    sums_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    avg_x = np.append(sums_x / counts, x[-1])
+    avg_y = np.append(sums_y / counts, y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        # Twice the triangle area; the constant factor does not change the argmax
+        area = np.abs(
+            (x[a] - avg_x[i + 1]) * (y[start:stop] - y[a])
+            - (x[a] - x[start:stop]) * (avg_y[i + 1] - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(y: np.ndarray, n_buckets: int) -> np.ndarray:
+    """
+    Select the minimum and maximum of each of ``n_buckets`` equal-size buckets.
+
+    Fully vectorized: one stable sort by (bucket, value) puts every
+    bucket's minimum first and maximum last.
+
+    Args:
+        y: Values
+        n_buckets: Number of buckets (about the chart width in pixels)
+
+    Returns:
+        np.ndarray: Sorted indices of the selected points, including both ends
+    """
+    n = len(y)
+    if 2 * n_buckets >= n:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype=float)
+    bucket = np.arange(n) * n_buckets // n
+    order = np.lexsort((y, bucket))
+    bounds = np.searchsorted(bucket[order], np.arange(n_buckets + 1))
+    picks = np.concatenate([order[bounds[:-1]], order[bounds[1:] - 1], [0, n - 1]])
+    return np.unique(picks)
+
+
+def downsample_indices(
+    x: np.ndarray,
+    y: np.ndarray,
+    n_out: int,
+    method: str = 'lttb'
+) -> np.ndarray:
+    """
+    Select about ``n_out`` points of a series for plotting.
+
+    Args:
+        x: Sorted x values (numeric or datetime64)
+        y: Values
+        n_out: Target number of points
+        method: 'lttb' or 'minmax'
+
+    Returns:
+        np.ndarray: Sorted indices of the selected points
+    """
+    if method == 'lttb':
+        return lttb_indices(x, y, n_out)
+    if method == 'minmax':
+        return minmax_indices(y, max(n_out // 2, 1))
+    raise ValueError(f"Unknown downsampling method: {method}")
+
+
+def downsample(
+    x: np.ndarray,
+    y: np.ndarray,
+    n_out: int,
+    method: str = 'lttb'
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce a series to about ``n_out`` points for plotting.
+
+    Args:
+        x: Sorted x values (numeric or datetime64)
+        y: Values
+        n_out: Target number of points
+        method: 'lttb' or 'minmax'
+
+    Returns:
+        Tuple: Selected x and y values
+    """
+    x, y = np.asarray(x), np.asarray(y)
+    indices = downsample_indices(x, y, n_out, method)
+    return x[indices], y[indices]
@@ -0,0 +1,285 @@
+"""
+Portfolio file ingest utilities for Ardian ESG Dashboard
+
+Streams CSV or Excel extracts with the generated portfolio columns in
+fixed-size chunks. The reader only parses; conversion of malformed cells,
+range validation against ``config.settings`` and dtype compaction run on
+a thread pool, with a bounded number of chunks in flight so memory stays
+flat however large the file is. Rejected rows are appended to a CSV
+report as they are found.
+"""
+
+import collections
+import logging
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Iterator, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.settings import INGEST_CONFIG, SECTORS, VALUE_RANGES
+from utils.data_generator import PORTFOLIO_SCHEMA
+from utils.instrumentation import span
+from utils.schema import INTEGER_COLUMNS, compact_frame
+from utils.scoring import score_esg
+
+
+logger = logging.getLogger(__name__)
+
+NUMERIC_COLUMNS = [column for column in PORTFOLIO_SCHEMA if column not in ('Company', 'Sector')]
+# The total is recomputed from the pillar scores when a file leaves it out
+REQUIRED_COLUMNS = [column for column in PORTFOLIO_SCHEMA if column != 'ESG Total Score']
+EXCEL_EXTENSIONS = ('.xlsx', '.xlsm')
+
+
+@dataclass
+class IngestReport:
+    """Outcome of ingesting one file."""
+
+    path: str
+    rows_read: int = 0
+    rows_accepted: int = 0
+    rows_rejected: int = 0
+    reasons: Dict[str, int] = field(default_factory=dict)
+    report_path: Optional[str] = None
+    seconds: float = 0.0
+
+    def summary(self) -> str:
+        """One-line summary for logs and the dashboard."""
+        return (
+            f"{os.path.basename(self.path)}: {self.rows_accepted:,} of {self.rows_read:,} rows accepted, "
+            f"{self.rows_rejected:,} rejected in {self.seconds:.1f} s"
+        )
+
+
+def list_extracts(directory: str = INGEST_CONFIG['import_dir']) -> List[str]:
+    """
+    List the CSV and Excel extracts available for import.
+
+    Args:
+        directory: Import directory
+
+    Returns:
+        List: Sorted file names (not paths) directly inside ``directory``
+    """
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        entry.name for entry in os.scandir(directory)
+        if entry.is_file() and entry.name.lower().endswith(('.csv', '.csv.gz') + EXCEL_EXTENSIONS)
+    )
+
+
+def read_chunks(path: str, chunk_rows: int = INGEST_CONFIG['chunk_rows']) -> Iterator[pd.DataFrame]:
+    """
+    Read a CSV or Excel file in chunks of parsed cells.
+
+    Clean numeric columns are parsed as floats; a column with malformed
+    cells in a chunk stays as text for :func:`validate_chunk` to report.
+
+    Args:
+        path: CSV (optionally compressed) or .xlsx file
+        chunk_rows: Rows per chunk
+
+    Yields:
+        pd.DataFrame: Chunk of the portfolio columns present in the file, as read
+
+    Raises:
+        ValueError: If a required column is missing
+    """
+    if path.lower().endswith(EXCEL_EXTENSIONS):
+        chunks = _read_excel_chunks(path, chunk_rows)
+    else:
+        chunks = pd.read_csv(
+            path, chunksize=chunk_rows, dtype={'Company': str, 'Sector': str},
+            keep_default_na=False, na_values=[''], usecols=lambda column: column in PORTFOLIO_SCHEMA,
+            # Chunks are already bounded; parse each in one pass so a column gets one type
+            low_memory=False
+        )
+    for i, chunk in enumerate(chunks):
+        if i == 0:
+            missing = [column for column in REQUIRED_COLUMNS if column not in chunk.columns]
+            if missing:
+                raise ValueError(f"{path} is missing columns: {', '.join(missing)}")
+        yield chunk
+
+
+def _read_excel_chunks(path: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    # openpyxl's read-only mode streams rows instead of loading the workbook
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(cell) if cell is not None else '' for cell in next(rows, ())]
+        keep = [i for i, column in enumerate(header) if column in PORTFOLIO_SCHEMA]
+        columns = [header[i] for i in keep]
+        batch: List[tuple] = []
+        for row in rows:
+            batch.append(tuple(row[i] if i < len(row) else None for i in keep))
+            if len(batch) == chunk_rows:
+                yield pd.DataFrame(batch, columns=columns, dtype=object)
+                batch = []
+        if batch:
+            yield pd.DataFrame(batch, columns=columns, dtype=object)
+    finally:
+        workbook.close()
+
+
+def validate_chunk(raw: pd.DataFrame, first_row: int = 0) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Convert and validate a raw chunk.
+
+    Rows are rejected for a missing company, an unknown sector, a missing
+    or non-numeric value, or a value outside VALUE_RANGES; each rejected
+    row reports the first rule it breaks.
+
+    Args:
+        raw: Chunk as read by :func:`read_chunks`
+        first_row: File row number of the chunk's first data row
+
+    Returns:
+        Tuple: (accepted rows in compact dtypes, rejected raw rows with Row and Reason columns)
+    """
+    reasons = np.empty(len(raw), dtype=object)
+    rejected_mask = np.zeros(len(raw), dtype=bool)
+
+    def reject(mask: np.ndarray, reason: str) -> None:
+        # Keep the first reason of each row
+        new = mask & ~rejected_mask
+        reasons[new] = reason
+        rejected_mask[new] = True
+
+    company = raw['Company'].fillna('').astype(str).str.strip()
+    reject((company == '').to_numpy(), 'missing company')
+    sector = raw['Sector'].fillna('').astype(str).str.strip()
+    reject(~sector.isin(SECTORS).to_numpy(), 'unknown sector')
+
+    numeric: Dict[str, np.ndarray] = {}
+    for column in NUMERIC_COLUMNS:
+        if column not in raw.columns:
+            continue
+        cells = raw[column]
+        if pd.api.types.is_numeric_dtype(cells.dtype):
+            values = cells.to_numpy(dtype=float)
+            blank = np.isnan(values)
+        else:
+            values = pd.to_numeric(cells, errors='coerce').to_numpy(dtype=float)
+            blank = cells.isna().to_numpy() | (cells.astype(str).str.strip() == '').to_numpy()
+        reject(blank, f"missing {column}")
+        reject(~blank & ~np.isfinite(values), f"non-numeric {column}")
+        low, high = VALUE_RANGES.get(column, (None, None))
+        with np.errstate(invalid='ignore'):
+            if low is not None:
+                reject(values < low, f"{column} below {low}")
+            if high is not None:
+                reject(values > high, f"{column} above {high}")
+            if column in INTEGER_COLUMNS:
+                reject(np.isfinite(values) & (values != np.round(values)), f"non-integer {column}")
+                reject(values > np.iinfo(INTEGER_COLUMNS[column]).max, f"{column} out of range")
+        numeric[column] = values
+
+    accepted = ~rejected_mask
+    # Fixed categories, so chunks concatenate without falling back to strings
+    data = {
+        'Company': company[accepted].to_numpy(),
+        'Sector': pd.Categorical(sector[accepted].to_numpy(), categories=SECTORS)
+    }
+    for column in NUMERIC_COLUMNS:
+        if column in numeric:
+            data[column] = numeric[column][accepted]
+    if 'ESG Total Score' not in numeric:
+        data['ESG Total Score'] = score_esg(
+            data['Environmental Score'], data['Social Score'], data['Governance Score'], sectors=data['Sector']
+        )
+    for column in INTEGER_COLUMNS:
+        data[column] = data[column].astype(np.int64)
+    # Header is file row 1, so data rows start at 2
+    rows = np.arange(len(raw)) + first_row + 2
+    valid = compact_frame(pd.DataFrame(data, columns=PORTFOLIO_SCHEMA, index=pd.Index(rows[accepted], name='Row')))
+
+    rejected = raw[rejected_mask].copy()
+    rejected.insert(0, 'Row', rows[rejected_mask])
+    rejected['Reason'] = reasons[rejected_mask]
+    return valid, rejected
+
+
+def ingest_file(
+    path: str,
+    chunk_rows: int = INGEST_CONFIG['chunk_rows'],
+    workers: int = INGEST_CONFIG['workers'],
+    max_pending: int = INGEST_CONFIG['max_pending_chunks'],
+    report_path: Optional[str] = None
+) -> Tuple[pd.DataFrame, IngestReport]:
+    """
+    Read, validate and compact a portfolio file chunk by chunk.
+
+    At most ``max_pending`` chunks are read ahead of validation. Chunks are
+    collected in file order, so a company appearing twice keeps its first
+    row and later ones are rejected as duplicates.
+
+    Args:
+        path: CSV or Excel file
+        chunk_rows: Rows per chunk
+        workers: Threads validating chunks
+        max_pending: Chunks read ahead of validation
+        report_path: Rejected-rows CSV (defaults to INGEST_CONFIG['report_dir']/<file>.rejected.csv)
+
+    Returns:
+        Tuple: (accepted rows in compact dtypes, report)
+    """
+    if report_path is None:
+        report_path = os.path.join(INGEST_CONFIG['report_dir'], f"{os.path.basename(path)}.rejected.csv")
+    report = IngestReport(path, report_path=report_path)
+    start = time.perf_counter()
+    seen: Set[str] = set()
+    parts: List[pd.DataFrame] = []
+    pending: Deque[Tuple[Future, pd.DataFrame, int]] = collections.deque()
+    # Every report line has the columns of the file's first chunk
+    report_columns: List[str] = []
+    if os.path.exists(report_path):
+        os.remove(report_path)
+
+    def collect(future: Future, raw: pd.DataFrame, first_row: int) -> None:
+        valid, rejected = future.result()
+        duplicated = valid['Company'].duplicated().to_numpy() | valid['Company'].isin(seen).to_numpy()
+        if duplicated.any():
+            # Report duplicates as read, like every other rejected row
+            rows = valid.index[duplicated].to_numpy()
+            duplicates = raw.iloc[rows - first_row - 2].copy()
+            duplicates.insert(0, 'Row', rows)
+            duplicates['Reason'] = 'duplicate company'
+            rejected = pd.concat([rejected, duplicates], ignore_index=True)
+            valid = valid[~duplicated]
+        seen.update(valid['Company'])
+        parts.append(valid)
+        report.rows_accepted += len(valid)
+        report.rows_rejected += len(rejected)
+        if len(rejected):
+            for reason, count in rejected['Reason'].value_counts().items():
+                report.reasons[reason] = report.reasons.get(reason, 0) + int(count)
+            os.makedirs(os.path.dirname(report_path) or '.', exist_ok=True)
+            rejected.reindex(columns=report_columns).to_csv(
+                report_path, mode='a', header=not os.path.exists(report_path), index=False
+            )
+
+    with span('ingest.ingest_file', path=os.path.basename(path)), ThreadPoolExecutor(workers) as pool:
+        for chunk in read_chunks(path, chunk_rows):
+            if not report_columns:
+                report_columns = ['Row', *chunk.columns, 'Reason']
+            pending.append((pool.submit(validate_chunk, chunk, report.rows_read), chunk, report.rows_read))
+            report.rows_read += len(chunk)
+            if len(pending) >= max_pending:
+                collect(*pending.popleft())
+        while pending:
+            collect(*pending.popleft())
+
+    report.seconds = time.perf_counter() - start
+    if not report.rows_rejected:
+        report.report_path = None
+    logger.info("ingested %s", report.summary())
+    frame = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=PORTFOLIO_SCHEMA)
+    return frame, report
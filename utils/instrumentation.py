@@ -0,0 +1,252 @@
+"""
+Instrumentation utilities for Ardian ESG Dashboard
+
+Timing spans for the hot paths (data generation, filtering, scoring,
+figure construction), per-rerun span trees, and optional cProfile or
+tracemalloc capture. Everything is reported through the logging setup of
+``config.settings.LOGGING``.
+"""
+
+import collections
+import contextlib
+import contextvars
+import cProfile
+import functools
+import io
+import logging
+import logging.handlers
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+from config.settings import LOGGING
+
+
+logger = logging.getLogger(__name__)
+
+_configured = False
+_configure_lock = threading.Lock()
+
+
+def configure_logging(config: Dict[str, Any] = LOGGING) -> None:
+    """
+    Send the dashboard loggers to the LOGGING file and level, once per process.
+
+    Args:
+        config: Logging settings with 'level', 'format' and 'file'
+    """
+    global _configured
+    with _configure_lock:
+        if _configured:
+            return
+        formatter = logging.Formatter(config['format'])
+        handlers: List[logging.Handler] = [logging.StreamHandler()]
+        if config.get('file'):
+            os.makedirs(os.path.dirname(config['file']) or '.', exist_ok=True)
+            handlers.append(logging.handlers.RotatingFileHandler(
+                config['file'], maxBytes=10 * 1024 * 1024, backupCount=3
+            ))
+        for name in ('esg_quest', 'utils'):
+            package_logger = logging.getLogger(name)
+            package_logger.setLevel(config['level'])
+            for handler in handlers:
+                handler.setFormatter(formatter)
+                package_logger.addHandler(handler)
+        _configured = True
+
+
+@dataclass
+class Span:
+    """One timed operation and the operations nested inside it."""
+
+    name: str
+    attributes: Dict[str, Any] = field(default_factory=dict)
+    start: float = 0.0
+    duration_ms: float = 0.0
+    children: List['Span'] = field(default_factory=list)
+    _token: Any = field(default=None, repr=False)
+
+    def render(self, indent: int = 0) -> str:
+        """
+        Format the span tree, one span per line.
+
+        Args:
+            indent: Nesting level of this span
+
+        Returns:
+            str: Indented tree with durations
+        """
+        attributes = ''.join(f" {key}={value}" for key, value in self.attributes.items())
+        lines = [f"{'  ' * indent}{self.name} {self.duration_ms:.1f} ms{attributes}"]
+        lines.extend(child.render(indent + 1) for child in self.children)
+        return '\n'.join(lines)
+
+
+_current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar('current_span', default=None)
+_recent_traces: Deque[Span] = collections.deque(maxlen=20)
+
+
+@contextlib.contextmanager
+def span(name: str, **attributes) -> Iterator[Span]:
+    """
+    Time a block, nested under the enclosing span if there is one.
+
+    Args:
+        name: Operation name, e.g. 'data.generate_portfolio'
+        **attributes: Values logged with the span (sizes, keys, ...)
+
+    Yields:
+        Span: The running span
+    """
+    current = Span(name, attributes, time.perf_counter())
+    parent = _current.get()
+    if parent is not None:
+        parent.children.append(current)
+    token = _current.set(current)
+    try:
+        yield current
+    finally:
+        current.duration_ms = (time.perf_counter() - current.start) * 1000
+        _current.reset(token)
+        logger.debug(
+            "span name=%s duration_ms=%.2f parent=%s%s",
+            name, current.duration_ms, parent.name if parent else '-',
+            ''.join(f" {key}={value}" for key, value in attributes.items())
+        )
+
+
+def timed(name: Optional[str] = None) -> Callable:
+    """
+    Decorator running a function in a :func:`span`.
+
+    Args:
+        name: Span name (defaults to the function's module and name)
+
+    Returns:
+        Callable: Decorator
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def start_trace(name: str, **attributes) -> Span:
+    """
+    Start a root span collecting every span of this thread until :func:`finish_trace`.
+
+    Args:
+        name: Trace name, e.g. 'rerun'
+        **attributes: Values logged with the trace
+
+    Returns:
+        Span: Root span
+    """
+    root = Span(name, attributes, time.perf_counter())
+    root._token = _current.set(root)
+    return root
+
+
+def finish_trace(root: Span) -> Span:
+    """
+    Finish a trace and log its span tree.
+
+    Args:
+        root: Root span returned by :func:`start_trace`
+
+    Returns:
+        Span: The finished root span
+    """
+    root.duration_ms = (time.perf_counter() - root.start) * 1000
+    with contextlib.suppress(ValueError):
+        _current.reset(root._token)
+    _recent_traces.append(root)
+    logger.info("trace %s %.1f ms\n%s", root.name, root.duration_ms, root.render())
+    return root
+
+
+def recent_traces() -> List[Span]:
+    """Get the last finished traces, most recent last."""
+    return list(_recent_traces)
+
+
+# cProfile and tracemalloc are process-wide, so only one capture runs at a time
+_profile_lock = threading.Lock()
+
+
+class Profiler:
+    """
+    cProfile or tracemalloc capture around a block of work.
+
+    Only one profiler is active per process. A profiler started while
+    another one is capturing stays idle and reports itself as busy.
+    """
+
+    MODES = ('cpu', 'memory')
+
+    def __init__(self, mode: str, top: int = 25):
+        """
+        Args:
+            mode: 'cpu' (cProfile) or 'memory' (tracemalloc)
+            top: Number of entries in the report
+
+        Raises:
+            ValueError: If the mode is unknown
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown profiling mode: {mode}")
+        self.mode = mode
+        self.top = top
+        self.report = ''
+        self.busy = False
+        self._profile: Optional[cProfile.Profile] = None
+
+    def start(self) -> 'Profiler':
+        if not _profile_lock.acquire(blocking=False):
+            self.busy = True
+            return self
+        if self.mode == 'cpu':
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            tracemalloc.start()
+        return self
+
+    def stop(self) -> str:
+        """
+        Stop capturing and log the report.
+
+        Returns:
+            str: Top functions by cumulative time, or top allocation sites,
+                or an empty string if another profiler was busy
+        """
+        if self.busy:
+            return self.report
+        try:
+            if self.mode == 'cpu':
+                self._profile.disable()
+                output = io.StringIO()
+                pstats.Stats(self._profile, stream=output).sort_stats('cumulative').print_stats(self.top)
+                self.report = output.getvalue()
+            else:
+                snapshot = tracemalloc.take_snapshot()
+                current, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                lines = [f"current {current / 1e6:.1f} MB, peak {peak / 1e6:.1f} MB"]
+                lines.extend(str(stat) for stat in snapshot.statistics('lineno')[:self.top])
+                self.report = '\n'.join(lines)
+        finally:
+            _profile_lock.release()
+        logger.info("profile %s\n%s", self.mode, self.report)
+        return self.report
@@ -0,0 +1,428 @@
+"""
+Market data client utilities for Ardian ESG Dashboard
+
+Async client for the API_CONFIG providers. Connections are pooled and
+reused across requests, each provider has its own concurrency limit and
+token-bucket rate limit, concurrent requests for the same resource share
+one in-flight call, and responses are kept in a persistent cache that is
+revalidated with ETags once their TTL has passed.
+"""
+
+import asyncio
+import hashlib
+import http.client
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlencode, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from config.settings import API_CONFIG, MARKET_DATA_CACHE
+
+
+logger = logging.getLogger(__name__)
+
+QUOTE_COLUMNS = ['Price', 'Change', 'Change (%)', 'Previous Close']
+
+
+class MarketDataError(Exception):
+    """A provider request failed or returned an unusable response."""
+
+
+class RateLimiter:
+    """Async token bucket: ``rate`` requests per minute with bursts up to ``burst``."""
+
+    def __init__(self, requests_per_minute: float, burst: Optional[int] = None):
+        """
+        Args:
+            requests_per_minute: Sustained request rate
+            burst: Bucket size (defaults to one second of requests, at least 1)
+        """
+        self.rate = requests_per_minute / 60
+        self.burst = burst or max(1, int(self.rate))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait for a request token."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections shared by every provider, per host."""
+
+    def __init__(self, max_idle_per_host: int = 16):
+        """
+        Args:
+            max_idle_per_host: Idle connections kept open per host
+        """
+        self.max_idle_per_host = max_idle_per_host
+        self._idle: Dict[Tuple[str, str, Optional[int]], List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+        self.created = 0
+
+    def request(
+        self,
+        url: str,
+        headers: Dict[str, str],
+        timeout: float
+    ) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Send a GET request on a pooled connection (blocking).
+
+        Args:
+            url: Absolute URL
+            headers: Request headers
+            timeout: Socket timeout in seconds
+
+        Returns:
+            Tuple: Status code, response headers and body
+        """
+        parts = urlsplit(url)
+        host = (parts.scheme, parts.hostname, parts.port)
+        with self._lock:
+            idle = self._idle.get(host)
+            connection = idle.pop() if idle else None
+        if connection is None:
+            connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+            connection = connection_class(parts.hostname, parts.port, timeout=timeout)
+            self.created += 1
+        target = parts.path or '/'
+        if parts.query:
+            target += '?' + parts.query
+
+        try:
+            connection.request('GET', target, headers=headers)
+            response = connection.getresponse()
+            body = response.read()
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            raise
+
+        if response.will_close:
+            connection.close()
+        else:
+            with self._lock:
+                idle = self._idle.setdefault(host, [])
+                if len(idle) < self.max_idle_per_host:
+                    idle.append(connection)
+                else:
+                    connection.close()
+        return response.status, {key.lower(): value for key, value in response.getheaders()}, body
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        with self._lock:
+            connections = [c for idle in self._idle.values() for c in idle]
+            self._idle.clear()
+        for connection in connections:
+            connection.close()
+
+
+class ResponseCache:
+    """Persistent SQLite cache of response bodies with their ETag and fetch time."""
+
+    def __init__(self, path: str = MARKET_DATA_CACHE):
+        """
+        Args:
+            path: SQLite file, or ':memory:'
+        """
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses "
+            "(key TEXT PRIMARY KEY, etag TEXT, body BLOB, fetched_at REAL)"
+        )
+        self._connection.commit()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[Optional[str], bytes, float]]:
+        """
+        Get a cached response.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple: ETag, body and fetch time, or None if not cached
+        """
+        with self._lock:
+            return self._connection.execute(
+                "SELECT etag, body, fetched_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+    def set(self, key: str, etag: Optional[str], body: bytes, fetched_at: Optional[float] = None) -> None:
+        """
+        Store a response.
+
+        Args:
+            key: Cache key
+            etag: ETag header of the response
+            body: Response body
+            fetched_at: Fetch (or revalidation) time, defaults to now
+        """
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (key, etag, body, fetched_at or time.time())
+            )
+            self._connection.commit()
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class MarketDataClient:
+    """
+    Async client for the market data providers of API_CONFIG.
+
+    Use as an async context manager::
+
+        async with MarketDataClient() as client:
+            quotes = await client.quotes(['AAPL', 'MSFT'])
+    """
+
+    def __init__(
+        self,
+        providers: Dict[str, Dict] = API_CONFIG,
+        cache_path: str = MARKET_DATA_CACHE,
+        api_keys: Optional[Dict[str, str]] = None,
+        max_retries: int = 3,
+        backoff: float = 1.0
+    ):
+        """
+        Args:
+            providers: Provider settings, as in API_CONFIG (``base_url`` can point to a mock server)
+            cache_path: Persistent response cache file, or ':memory:'
+            api_keys: Provider -> API key (defaults to each provider's ``api_key_env`` variable)
+            max_retries: Retries of rate-limited, failed or 5xx requests
+            backoff: Base delay in seconds of the exponential retry backoff
+        """
+        self.providers = providers
+        self.api_keys = api_keys if api_keys is not None else {
+            name: os.environ.get(config.get('api_key_env', ''))
+            for name, config in providers.items()
+        }
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.pool = ConnectionPool()
+        # One blocking request per thread, so size the executor to the total concurrency
+        self._executor = ThreadPoolExecutor(
+            max_workers=sum(config.get('max_concurrency', 4) for config in providers.values()),
+            thread_name_prefix='market-data'
+        )
+        self.cache = ResponseCache(cache_path)
+        self._limiters = {
+            name: RateLimiter(config.get('requests_per_minute', 60)) for name, config in providers.items()
+        }
+        self._semaphores = {
+            name: asyncio.Semaphore(config.get('max_concurrency', 4)) for name, config in providers.items()
+        }
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {'requests': 0, 'cache_hits': 0, 'revalidated': 0, 'coalesced': 0, 'retries': 0}
+
+    async def __aenter__(self) -> 'MarketDataClient':
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close pooled connections and the response cache."""
+        self._executor.shutdown(wait=False)
+        self.pool.close()
+        self.cache.close()
+
+    async def get_json(self, provider: str, path: str = '', params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Get a JSON resource, from the cache while it is fresh.
+
+        Concurrent calls for the same resource share one request.
+
+        Args:
+            provider: Provider name in API_CONFIG
+            path: Path appended to the provider base URL
+            params: Query parameters (credentials are added automatically)
+
+        Returns:
+            Any: Decoded JSON body
+
+        Raises:
+            MarketDataError: If the request failed after retries
+        """
+        config = self.providers[provider]
+        params = dict(params or {})
+        key = provider + ':' + path + '?' + urlencode(sorted(params.items()))
+        key = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.stats['coalesced'] += 1
+            return await asyncio.shield(inflight)
+
+        cached = self.cache.get(key)
+        if cached is not None and time.time() - cached[2] < config.get('cache_ttl', 0):
+            self.stats['cache_hits'] += 1
+            return json.loads(cached[1])
+
+        future = asyncio.ensure_future(self._fetch(provider, key, path, params, cached))
+        self._inflight[key] = future
+        future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(future)
+
+    async def _fetch(
+        self,
+        provider: str,
+        key: str,
+        path: str,
+        params: Dict[str, Any],
+        cached: Optional[Tuple[Optional[str], bytes, float]]
+    ) -> Any:
+        config = self.providers[provider]
+        api_key = self.api_keys.get(provider)
+        if api_key:
+            params['apikey' if provider == 'alpha_vantage' else 'token'] = api_key
+        url = config['base_url'].rstrip('/') + ('/' + path.lstrip('/') if path else '')
+        if params:
+            url += '?' + urlencode(params)
+        headers = {'Accept': 'application/json'}
+        if cached is not None and cached[0]:
+            headers['If-None-Match'] = cached[0]
+
+        for attempt in range(self.max_retries + 1):
+            delay = self.backoff * 2 ** attempt
+            async with self._semaphores[provider]:
+                await self._limiters[provider].acquire()
+                self.stats['requests'] += 1
+                try:
+                    status, response_headers, body = await asyncio.get_running_loop().run_in_executor(
+                        self._executor, self.pool.request, url, headers, config.get('timeout', 30)
+                    )
+                except (OSError, http.client.HTTPException) as e:
+                    error = MarketDataError(f"{provider} request failed: {e}")
+                    status = None
+
+            if status == 304 and cached is not None:
+                self.stats['revalidated'] += 1
+                self.cache.set(key, cached[0], cached[1])
+                return json.loads(cached[1])
+            if status == 200:
+                try:
+                    data = json.loads(body)
+                except ValueError as e:
+                    # Truncated or non-JSON bodies (e.g. proxy error pages) are retried, never cached
+                    error = MarketDataError(f"{provider} returned malformed JSON: {e}")
+                else:
+                    # Alpha Vantage reports exhausted quotas in a 200 response
+                    if isinstance(data, dict) and ('Note' in data or 'Information' in data):
+                        error = MarketDataError(f"{provider} rate limited: {data.get('Note') or data.get('Information')}")
+                    else:
+                        self.cache.set(key, response_headers.get('etag'), body)
+                        return data
+            elif status == 429:
+                error = MarketDataError(f"{provider} rate limited")
+                retry_after = response_headers.get('retry-after', '')
+                if retry_after.isdigit():
+                    delay = max(delay, int(retry_after))
+            elif status is not None and status < 500:
+                raise MarketDataError(f"{provider} returned HTTP {status} for {path or '/'}")
+            elif status is not None:
+                error = MarketDataError(f"{provider} returned HTTP {status}")
+
+            if attempt < self.max_retries:
+                self.stats['retries'] += 1
+                logger.debug("%s; retrying in %.1f s", error, delay)
+                await asyncio.sleep(delay)
+        raise error
+
+    async def quote(self, symbol: str, provider: str = 'finnhub') -> Dict[str, float]:
+        """
+        Get the latest quote of a symbol.
+
+        Args:
+            symbol: Ticker symbol
+            provider: Provider name in API_CONFIG
+
+        Returns:
+            Dict: Quote values keyed by QUOTE_COLUMNS
+        """
+        if provider == 'finnhub':
+            data = await self.get_json(provider, 'quote', {'symbol': symbol})
+            if not data or not data.get('pc'):
+                raise MarketDataError(f"finnhub has no quote for {symbol}")
+            return {
+                'Price': float(data['c']),
+                'Change': float(data['d'] or 0),
+                'Change (%)': float(data['dp'] or 0),
+                'Previous Close': float(data['pc'])
+            }
+        if provider == 'alpha_vantage':
+            data = await self.get_json(provider, '', {'function': 'GLOBAL_QUOTE', 'symbol': symbol})
+            quote = data.get('Global Quote') if isinstance(data, dict) else None
+            if not quote:
+                raise MarketDataError(f"alpha_vantage has no quote for {symbol}")
+            return {
+                'Price': float(quote['05. price']),
+                'Change': float(quote['09. change']),
+                'Change (%)': float(quote['10. change percent'].rstrip('%')),
+                'Previous Close': float(quote['08. previous close'])
+            }
+        raise ValueError(f"Unknown market data provider: {provider}")
+
+    async def quotes(self, symbols: Sequence[str], provider: str = 'finnhub') -> pd.DataFrame:
+        """
+        Get the latest quotes of many symbols concurrently, within the provider limits.
+
+        Args:
+            symbols: Ticker symbols
+            provider: Provider name in API_CONFIG
+
+        Returns:
+            pd.DataFrame: Quotes indexed by symbol; failed symbols have NaN values
+        """
+        symbols = list(dict.fromkeys(symbols))
+        results = await asyncio.gather(*(self.quote(s, provider) for s in symbols), return_exceptions=True)
+        failed = [s for s, result in zip(symbols, results) if isinstance(result, Exception)]
+        if failed:
+            logger.warning("%d of %d %s quotes failed, e.g. %s", len(failed), len(symbols), provider, failed[0])
+        rows = [
+            [np.nan] * len(QUOTE_COLUMNS) if isinstance(result, Exception) else [result[c] for c in QUOTE_COLUMNS]
+            for result in results
+        ]
+        return pd.DataFrame(rows, index=pd.Index(symbols, name='Symbol'), columns=QUOTE_COLUMNS)
+
+
+def fetch_quotes(symbols: Sequence[str], provider: str = 'finnhub', **client_options) -> pd.DataFrame:
+    """
+    Fetch quotes from synchronous code (e.g. the Streamlit script).
+
+    Args:
+        symbols: Ticker symbols
+        provider: Provider name in API_CONFIG
+        **client_options: Keyword arguments for :class:`MarketDataClient`
+
+    Returns:
+        pd.DataFrame: Quotes indexed by symbol
+    """
+    async def run():
+        async with MarketDataClient(**client_options) as client:
+            return await client.quotes(symbols, provider)
+    return asyncio.run(run())
@@ -0,0 +1,178 @@
+"""
+Mock market data server utilities for Ardian ESG Dashboard
+
+Local HTTP server speaking the Finnhub quote and Alpha Vantage
+GLOBAL_QUOTE formats, for exercising :class:`utils.market_data.MarketDataClient`
+without network access or API quotas. Quotes are deterministic per symbol,
+responses carry ETags, and rate limiting or malformed bodies can be
+injected.
+"""
+
+import copy
+import hashlib
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterable, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from config.settings import API_CONFIG
+
+
+def mock_quote(symbol: str) -> Dict[str, float]:
+    """
+    Deterministic quote of a symbol.
+
+    Args:
+        symbol: Ticker symbol
+
+    Returns:
+        Dict: Finnhub quote fields (c, d, dp, pc)
+    """
+    seed = int.from_bytes(hashlib.blake2b(symbol.encode(), digest_size=4).digest(), 'little')
+    previous = 10 + seed % 49000 / 100
+    change = (seed >> 16) % 2001 / 100 - 10
+    return {'c': round(previous + change, 2), 'd': change, 'dp': round(change / previous * 100, 4), 'pc': previous}
+
+
+class MockMarketServer:
+    """
+    Threaded mock provider server on a free localhost port.
+
+    Use as a context manager and point the client at it::
+
+        with MockMarketServer() as server:
+            async with MarketDataClient(server.providers(), cache_path=':memory:') as client:
+                quotes = await client.quotes(['AAPL', 'MSFT'])
+    """
+
+    def __init__(
+        self,
+        rate_limit_every: int = 0,
+        malformed: Iterable[str] = (),
+        latency: float = 0.0
+    ):
+        """
+        Args:
+            rate_limit_every: Answer every n-th request with HTTP 429 (0 never does)
+            malformed: Symbols whose quote body is not valid JSON
+            latency: Seconds each response is delayed, to simulate a remote provider
+        """
+        self.rate_limit_every = rate_limit_every
+        self.malformed = set(malformed)
+        self.latency = latency
+        self.requests = 0
+        self.not_modified = 0
+        self.rate_limited = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def providers(self, **overrides) -> Dict[str, Dict]:
+        """
+        Get API_CONFIG with every provider pointed at this server.
+
+        Args:
+            **overrides: Settings applied to every provider (e.g. requests_per_minute)
+
+        Returns:
+            Dict: Provider settings for MarketDataClient
+        """
+        providers = copy.deepcopy(API_CONFIG)
+        providers['finnhub']['base_url'] = f"{self.url}/finnhub"
+        providers['alpha_vantage']['base_url'] = f"{self.url}/alpha_vantage"
+        for config in providers.values():
+            config.update(overrides)
+        return providers
+
+    def start(self) -> 'MockMarketServer':
+        # A short poll interval keeps shutdown fast
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={'poll_interval': 0.05}, name='mock-market-server', daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> 'MockMarketServer':
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _count(self) -> bool:
+        # Returns whether this request is rate limited
+        with self._lock:
+            self.requests += 1
+            limited = bool(self.rate_limit_every) and self.requests % self.rate_limit_every == 0
+            self.rate_limited += limited
+            return limited
+
+    def _body(self, path: str, query: Dict[str, str]) -> Optional[bytes]:
+        symbol = query.get('symbol', '')
+        if symbol in self.malformed:
+            return b'{"c": '
+        quote = mock_quote(symbol)
+        if path == '/finnhub/quote':
+            return json.dumps(quote).encode()
+        if path == '/alpha_vantage' and query.get('function') == 'GLOBAL_QUOTE':
+            return json.dumps({'Global Quote': {
+                '01. symbol': symbol,
+                '05. price': str(quote['c']),
+                '08. previous close': str(quote['pc']),
+                '09. change': str(quote['d']),
+                '10. change percent': f"{quote['dp']}%"
+            }}).encode()
+        return None
+
+    def _handler(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body go out as separate writes; don't let Nagle hold the body back
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                if server.latency:
+                    threading.Event().wait(server.latency)
+                parts = urlsplit(self.path)
+                query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+                if server._count():
+                    self._send(429, b'{}', {'Retry-After': '0'})
+                    return
+                body = server._body(parts.path, query)
+                if body is None:
+                    self._send(404, b'{}')
+                    return
+                etag = '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+                if self.headers.get('If-None-Match') == etag:
+                    with server._lock:
+                        server.not_modified += 1
+                    self._send(304, b'', {'ETag': etag})
+                else:
+                    self._send(200, body, {'ETag': etag, 'Content-Type': 'application/json'})
+
+            def _send(self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None):
+                self.send_response(status)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
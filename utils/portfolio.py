@@ -0,0 +1,168 @@
+"""
+Portfolio data access utilities for Ardian ESG Dashboard
+"""
+
+import copy
+import hashlib
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def dataset_version(df: pd.DataFrame) -> str:
+    """
+    Compute a content hash identifying a portfolio dataset version.
+
+    Args:
+        df: Portfolio DataFrame
+
+    Returns:
+        str: Hex digest of the DataFrame contents
+    """
+    row_hashes = pd.util.hash_pandas_object(df, index=True).to_numpy()
+    digest = hashlib.blake2b(row_hashes.tobytes(), digest_size=8)
+    digest.update(','.join(map(str, df.columns)).encode())
+    return digest.hexdigest()
+
+
+class PortfolioIndex:
+    """
+    Read-only access object over a portfolio DataFrame.
+
+    The company and sector indexes are built once per dataset version, so
+    row lookups are O(1) and sector slices are O(k) in the sector size
+    instead of a boolean-mask scan over the whole portfolio.
+    """
+
+    def __init__(self, df: pd.DataFrame, version: Optional[str] = None):
+        """
+        Args:
+            df: Portfolio DataFrame with unique ``Company`` values
+            version: Dataset version (computed from the contents if omitted)
+
+        Raises:
+            ValueError: If company names are not unique
+        """
+        self.df = df
+        self.version = version or dataset_version(df)
+
+        self._company_index = pd.Index(df['Company'])
+        if not self._company_index.is_unique:
+            raise ValueError("Portfolio companies must be unique to be indexed")
+
+        codes, sectors = pd.factorize(df['Sector'], sort=False)
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(sectors) + 1))
+        # Shared by every session, so handed out read-only
+        order.setflags(write=False)
+        self._sector_positions: Dict[str, np.ndarray] = {
+            sector: order[bounds[i]:bounds[i + 1]] for i, sector in enumerate(sectors)
+        }
+        self._all_positions = np.arange(len(df))
+        self._all_positions.setflags(write=False)
+        self._matrices: Dict[tuple, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def __contains__(self, company: str) -> bool:
+        return company in self._company_index
+
+    def with_frame(self, df: pd.DataFrame, version: str) -> 'PortfolioIndex':
+        """
+        Index a new version of the same companies, reusing the company and sector indexes.
+
+        Args:
+            df: Portfolio DataFrame with the same Company and Sector columns, in the same order
+            version: Version of the new DataFrame
+
+        Returns:
+            PortfolioIndex: Index over ``df``
+        """
+        index = copy.copy(self)
+        index.df = df
+        index.version = version
+        index._matrices = {}
+        return index
+
+    @property
+    def companies(self) -> List[str]:
+        """Company names in portfolio order."""
+        return self._company_index.tolist()
+
+    @property
+    def sectors(self) -> List[str]:
+        """Sectors in order of first appearance."""
+        return list(self._sector_positions)
+
+    def position(self, company: str) -> int:
+        """
+        Get the row position of a company.
+
+        Args:
+            company: Company name
+
+        Returns:
+            int: Row position in the portfolio DataFrame
+        """
+        return self._company_index.get_loc(company)
+
+    def row(self, company: str) -> pd.Series:
+        """
+        Get the portfolio row of a company.
+
+        Args:
+            company: Company name
+
+        Returns:
+            pd.Series: Company metrics
+        """
+        return self.df.iloc[self.position(company)]
+
+    def sector_positions(self, sector: str = 'All') -> np.ndarray:
+        """
+        Get the row positions of the companies in a sector.
+
+        Args:
+            sector: Sector name, or 'All' for the whole portfolio
+
+        Returns:
+            np.ndarray: Row positions in portfolio order
+        """
+        if sector == 'All':
+            return self._all_positions
+        return self._sector_positions.get(sector, self._all_positions[:0])
+
+    def sector_frame(self, sector: str = 'All') -> pd.DataFrame:
+        """
+        Get the portfolio rows of the companies in a sector.
+
+        Args:
+            sector: Sector name, or 'All' for the whole portfolio
+
+        Returns:
+            pd.DataFrame: Sector slice of the portfolio
+        """
+        if sector == 'All':
+            return self.df
+        return self.df.iloc[self.sector_positions(sector)]
+
+    def category_matrix(self, categories: Sequence[str], positions: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Gather metric values for many companies in one vectorized selection.
+
+        Args:
+            categories: Metric columns to gather
+            positions: Row positions to select (defaults to all companies)
+
+        Returns:
+            np.ndarray: Matrix of shape (companies, categories)
+        """
+        key = tuple(categories)
+        matrix = self._matrices.get(key)
+        if matrix is None:
+            matrix = self.df.loc[:, list(categories)].to_numpy(dtype=float)
+            matrix.setflags(write=False)
+            self._matrices[key] = matrix
+        return matrix if positions is None else matrix[positions]
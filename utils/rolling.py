@@ -0,0 +1,202 @@
+"""
+Rolling statistics utilities for Ardian ESG Dashboard
+
+Rolling means, volatility (standard deviation of daily changes), drawdown
+from the running peak and year-over-year deltas over daily series. Full
+histories are computed with cumulative sums vectorized over every company
+and metric; :class:`RollingStats` then keeps the latest values up to date
+as days are appended, in O(windows) per series and day, without rescanning
+the history.
+"""
+
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+
+ROLLING_WINDOWS = (30, 90, 365)
+YOY_LAG = 365
+
+# Leading rows processed at once by rolling_panel, bounding its float64 temporaries
+_CHUNK_ROWS = 4096
+
+
+def stat_names(windows: Sequence[int] = ROLLING_WINDOWS) -> Tuple[str, ...]:
+    """
+    Get the statistic names computed for the windows.
+
+    Args:
+        windows: Window lengths in days
+
+    Returns:
+        Tuple: 'mean_<w>' and 'vol_<w>' per window, then 'drawdown' and 'yoy'
+    """
+    return tuple(f"{stat}_{w}" for w in windows for stat in ('mean', 'vol')) + ('drawdown', 'yoy')
+
+
+def _window_sums(cumulative: np.ndarray, w: int) -> np.ndarray:
+    # cumulative has a leading zero column; sums of the w values ending at each day
+    return cumulative[:, w:] - cumulative[:, :-w]
+
+
+def rolling_panel(values: np.ndarray, windows: Sequence[int] = ROLLING_WINDOWS) -> Dict[str, np.ndarray]:
+    """
+    Compute the rolling statistics of every series over its whole history.
+
+    Matches pandas ``rolling(w).mean()``, ``diff().rolling(w).std()``,
+    ``x / cummax(x) - 1`` and ``diff(365)``; days without a full window are NaN.
+
+    Args:
+        values: Daily values along the last axis, e.g. a (companies, metrics, days) panel
+        windows: Window lengths in days
+
+    Returns:
+        Dict: Statistic name -> array shaped like ``values`` (in its floating dtype)
+    """
+    values = np.asarray(values)
+    dtype = values.dtype if np.issubdtype(values.dtype, np.floating) else np.float64
+    shape, days = values.shape, values.shape[-1]
+    rows = values.reshape(-1, days)
+    out = {name: np.full((len(rows), days), np.nan, dtype=dtype) for name in stat_names(windows)}
+
+    for start in range(0, len(rows), _CHUNK_ROWS):
+        block = rows[start:start + _CHUNK_ROWS].astype(np.float64)
+        chunk = slice(start, start + len(block))
+        # Centre on the first value so the sums do not lose precision on large levels
+        centred = block - block[:, :1]
+        zeros = np.zeros((len(block), 1))
+        level_sums = np.concatenate([zeros, np.cumsum(centred, axis=1)], axis=1)
+        changes = np.diff(block, axis=1)
+        change_sums = np.concatenate([zeros, np.cumsum(changes, axis=1)], axis=1)
+        change_squares = np.concatenate([zeros, np.cumsum(changes ** 2, axis=1)], axis=1)
+
+        for w in windows:
+            if w <= days:
+                out[f"mean_{w}"][chunk, w - 1:] = _window_sums(level_sums, w) / w + block[:, :1]
+            if 1 < w < days:
+                s1, s2 = _window_sums(change_sums, w), _window_sums(change_squares, w)
+                out[f"vol_{w}"][chunk, w:] = np.sqrt(np.maximum(s2 - s1 ** 2 / w, 0) / (w - 1))
+
+        peak = np.maximum.accumulate(block, axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out['drawdown'][chunk] = np.where(peak > 0, block / peak - 1, np.nan)
+        if days > YOY_LAG:
+            out['yoy'][chunk, YOY_LAG:] = block[:, YOY_LAG:] - block[:, :-YOY_LAG]
+
+    return {name: array.reshape(shape) for name, array in out.items()}
+
+
+class RollingStats:
+    """
+    Latest rolling statistics of many series, updated incrementally.
+
+    Keeps the running window sums, the running peak and a ring buffer of
+    the last ``max(windows) + 2`` days, so appending a day never touches
+    older history.
+    """
+
+    def __init__(
+        self,
+        history: np.ndarray,
+        windows: Sequence[int] = ROLLING_WINDOWS,
+        resync_every: int = 1000
+    ):
+        """
+        Args:
+            history: Daily values along the last axis (at least one day)
+            windows: Window lengths in days
+            resync_every: Appends between exact recomputations of the sums from
+                the buffer, bounding floating point drift
+
+        Raises:
+            ValueError: If the history is empty
+        """
+        history = np.asarray(history, dtype=np.float64)
+        if history.shape[-1] == 0:
+            raise ValueError("Rolling statistics need at least one day of history")
+        self.windows = tuple(windows)
+        self.resync_every = resync_every
+        self.shape = history.shape[:-1]
+        self.length = max(max(self.windows) + 2, YOY_LAG + 1)
+
+        rows = history.reshape(-1, history.shape[-1])
+        self._reference = rows[:, 0].copy()
+        self._peak = rows.max(axis=1)
+        self.n_days = rows.shape[1]
+        self._since_resync = 0
+
+        # Ring buffer slot of day t is t % length
+        tail = rows[:, -self.length:]
+        self._buffer = np.empty((len(rows), self.length))
+        first = self.n_days - tail.shape[1]
+        self._buffer[:, np.arange(first, self.n_days) % self.length] = tail
+        self._resync()
+
+    def _day(self, t: int) -> np.ndarray:
+        return self._buffer[:, t % self.length]
+
+    def _resync(self) -> None:
+        # Exact window sums from the buffered days
+        last = self.n_days - 1
+        self._level_sums, self._change_sums, self._change_squares = {}, {}, {}
+        for w in self.windows:
+            days = np.arange(max(last - w + 1, 0), last + 1)
+            self._level_sums[w] = (self._buffer[:, days % self.length] - self._reference[:, None]).sum(axis=1)
+            days = np.arange(max(last - w, 0), last + 1)
+            changes = np.diff(self._buffer[:, days % self.length], axis=1)
+            self._change_sums[w] = changes.sum(axis=1)
+            self._change_squares[w] = (changes ** 2).sum(axis=1)
+        self._since_resync = 0
+
+    def append(self, values: np.ndarray) -> None:
+        """
+        Append one or more new days.
+
+        Args:
+            values: New values shaped like the series, with an optional trailing day axis
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if values.shape == self.shape:
+            values = values[..., None]
+        for day in values.reshape(-1, values.shape[-1]).T:
+            t = self.n_days
+            change = day - self._day(t - 1)
+            for w in self.windows:
+                self._level_sums[w] += day - self._reference
+                self._change_sums[w] += change
+                self._change_squares[w] += change ** 2
+                if t >= w:
+                    self._level_sums[w] -= self._day(t - w) - self._reference
+                if t - w >= 1:
+                    old_change = self._day(t - w) - self._day(t - w - 1)
+                    self._change_sums[w] -= old_change
+                    self._change_squares[w] -= old_change ** 2
+            self._buffer[:, t % self.length] = day
+            np.maximum(self._peak, day, out=self._peak)
+            self.n_days += 1
+            self._since_resync += 1
+            if self._since_resync >= self.resync_every:
+                self._resync()
+
+    def latest(self) -> Dict[str, np.ndarray]:
+        """
+        Get the statistics of the last day.
+
+        Returns:
+            Dict: Statistic name -> array shaped like one day of the series
+        """
+        stats = {}
+        current = self._day(self.n_days - 1)
+        for w in self.windows:
+            mean = self._level_sums[w] / w + self._reference
+            stats[f"mean_{w}"] = mean if self.n_days >= w else np.full_like(mean, np.nan)
+            if 1 < w < self.n_days:
+                variance = self._change_squares[w] - self._change_sums[w] ** 2 / w
+                stats[f"vol_{w}"] = np.sqrt(np.maximum(variance, 0) / (w - 1))
+            else:
+                stats[f"vol_{w}"] = np.full_like(mean, np.nan)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            stats['drawdown'] = np.where(self._peak > 0, current / self._peak - 1, np.nan)
+        stats['yoy'] = current - self._day(self.n_days - 1 - YOY_LAG) if self.n_days > YOY_LAG \
+            else np.full_like(current, np.nan)
+        return {name: value.reshape(self.shape) for name, value in stats.items()}
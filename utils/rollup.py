@@ -0,0 +1,419 @@
+"""
+Portfolio rollup utilities for Ardian ESG Dashboard
+
+A materialized cube of additive partial aggregates over sector, ESG band
+and month. Each company-month contributes its monthly mean ESG score and
+emissions to one cell, so any slice or drill-down is a sum over cube
+axes. Appending days, adding companies or updating their snapshot
+metrics subtracts and re-adds only the affected company-months.
+"""
+
+import copy
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.settings import ROLLUP_CONFIG, SECTORS
+from utils.classification import BANDS, band_codes
+
+
+DIMENSIONS = ('sector', 'band', 'month')
+# Snapshot columns read per company
+ATTRIBUTE_COLUMNS = ['Sector', 'Market Cap (B)', 'Revenue (B)', 'Carbon Emissions (MT)', 'Safety Incidents']
+
+
+def incident_labels(bins: Sequence[int] = ROLLUP_CONFIG['incident_bins']) -> List[str]:
+    """
+    Get the column labels of the Safety Incidents distribution.
+
+    Args:
+        bins: Lower edges of the bins, ascending
+
+    Returns:
+        List: 'Incidents <low>-<high>' per bin, the last one open-ended
+    """
+    labels = [f"Incidents {low}-{high - 1}" for low, high in zip(bins[:-1], bins[1:])]
+    return labels + [f"Incidents {bins[-1]}+"]
+
+
+class RollupCube:
+    """
+    Sector x ESG band x month cube of portfolio aggregates.
+
+    Cells hold sums (holdings, market cap, market-cap-weighted ESG,
+    emissions, revenue, incidents and an incident histogram); ratios are
+    taken at query time, after summing. Emissions and revenue are annual
+    rates, so a month contributes its covered days / 365 of them.
+    """
+
+    def __init__(
+        self,
+        dates: pd.DatetimeIndex,
+        sectors: Sequence[str] = SECTORS,
+        incident_bins: Sequence[int] = ROLLUP_CONFIG['incident_bins']
+    ):
+        """
+        Args:
+            dates: Daily dates of the histories added with :meth:`add_companies`
+            sectors: Sector names of the sector axis
+            incident_bins: Lower edges of the Safety Incidents bins
+        """
+        self.sectors = list(sectors)
+        self.bands = list(BANDS['esg']['labels'])
+        self.incident_bins = np.asarray(incident_bins, dtype=float)
+        self._sector_codes = {sector: i for i, sector in enumerate(self.sectors)}
+
+        self.months: List[pd.Period] = []
+        self.n_days = 0
+        self.last_date: Optional[pd.Timestamp] = None
+        self._month_days = np.zeros(0)
+        self._day_months = np.zeros(0, dtype=np.int64)
+        self._cells: Dict[str, np.ndarray] = {}
+
+        self._names: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._attributes = np.zeros((0, 5))  # sector code, cap, revenue, carbon, incidents
+        self._esg_sums = np.zeros((0, 0))
+        self._carbon_sums: Optional[np.ndarray] = None
+        self._band = np.zeros((0, 0), dtype=np.int8)
+        self._extend_days(pd.DatetimeIndex(dates))
+
+    @classmethod
+    def build(
+        cls,
+        portfolio: pd.DataFrame,
+        dates: pd.DatetimeIndex,
+        esg: np.ndarray,
+        carbon: Optional[np.ndarray] = None,
+        **kwargs
+    ) -> 'RollupCube':
+        """
+        Build a cube from the portfolio and its daily histories.
+
+        Args:
+            portfolio: Portfolio DataFrame
+            dates: Daily dates of the histories
+            esg: Daily ESG Total Score per company, shape (companies, days)
+            carbon: Daily Carbon Emissions (MT) per company (defaults to the snapshot value)
+            **kwargs: Keyword arguments for the constructor
+
+        Returns:
+            RollupCube: Cube over every company and month
+        """
+        cube = cls(dates, **kwargs)
+        cube.add_companies(portfolio, esg, carbon)
+        return cube
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def __contains__(self, company: str) -> bool:
+        return company in self._rows
+
+    def copy(self) -> 'RollupCube':
+        """Copy the cube, so updates do not affect readers of this one."""
+        cube = copy.copy(self)
+        cube.months = list(self.months)
+        cube._cells = {name: cells.copy() for name, cells in self._cells.items()}
+        cube._names = list(self._names)
+        cube._rows = dict(self._rows)
+        for name in ('_month_days', '_day_months', '_attributes', '_esg_sums', '_band'):
+            setattr(cube, name, getattr(self, name).copy())
+        if self._carbon_sums is not None:
+            cube._carbon_sums = self._carbon_sums.copy()
+        return cube
+
+    # -- cube maintenance ---------------------------------------------------
+
+    def _extend_days(self, dates: pd.DatetimeIndex) -> np.ndarray:
+        # Map new days to month positions, growing the month axis; returns the month of each day
+        periods = dates.to_period('M')
+        positions = {month: i for i, month in enumerate(self.months)}
+        for month in periods.unique():
+            if month not in positions:
+                positions[month] = len(self.months)
+                self.months.append(month)
+        day_months = np.array([positions[month] for month in periods], dtype=np.int64)
+
+        grow = len(self.months) - len(self._month_days)
+        if grow:
+            self._month_days = np.concatenate([self._month_days, np.zeros(grow)])
+            self._esg_sums = np.pad(self._esg_sums, ((0, 0), (0, grow)))
+            self._band = np.pad(self._band, ((0, 0), (0, grow)))
+            if self._carbon_sums is not None:
+                self._carbon_sums = np.pad(self._carbon_sums, ((0, 0), (0, grow)))
+            n_bins = len(self.incident_bins)
+            for name in ('holdings', 'cap', 'cap_esg', 'carbon', 'revenue', 'incidents', 'incident_hist'):
+                shape = (len(self.sectors), len(self.bands), len(self.months)) + ((n_bins,) if name == 'incident_hist' else ())
+                cells = np.zeros(shape)
+                old = self._cells.get(name)
+                if old is not None:
+                    cells[:, :, :old.shape[2]] = old
+                self._cells[name] = cells
+        np.add.at(self._month_days, day_months, 1)
+        self._day_months = np.concatenate([self._day_months, day_months])
+        self.n_days += len(dates)
+        if len(dates):
+            self.last_date = dates[-1]
+        return day_months
+
+    def _contribute(self, rows: np.ndarray, months: np.ndarray, sign: float) -> None:
+        # Add (sign=1) or remove (sign=-1) the company-months rows x months from their cells
+        if not len(rows) or not len(months):
+            return
+        days = self._month_days[months]
+        sector = self._attributes[rows, 0].astype(np.int64)
+        cap, revenue, carbon, incidents = self._attributes[rows, 1:].T
+        esg = self._esg_sums[np.ix_(rows, months)] / days
+        if self._carbon_sums is not None:
+            carbon = self._carbon_sums[np.ix_(rows, months)] / days
+        else:
+            carbon = np.broadcast_to(carbon[:, None], esg.shape)
+        share = days / 365
+        band = self._band[np.ix_(rows, months)].astype(np.int64)
+        incident_bin = np.maximum(np.searchsorted(self.incident_bins, incidents, side='right') - 1, 0)
+
+        n_months = len(self.months)
+        cell = ((sector[:, None] * len(self.bands) + band) * n_months + months[None, :]).ravel()
+        n_cells = len(self.sectors) * len(self.bands) * n_months
+        ones = np.ones(esg.shape)
+        measures = {
+            'holdings': ones,
+            'cap': cap[:, None] * ones,
+            'cap_esg': cap[:, None] * esg,
+            'carbon': carbon * share,
+            'revenue': revenue[:, None] * share,
+            'incidents': incidents[:, None] * ones
+        }
+        for name, weights in measures.items():
+            self._cells[name].reshape(-1)[:] += sign * np.bincount(cell, weights.ravel(), minlength=n_cells)
+        n_bins = len(self.incident_bins)
+        hist_cell = cell * n_bins + np.repeat(incident_bin, len(months))
+        self._cells['incident_hist'].reshape(-1)[:] += sign * np.bincount(hist_cell, minlength=n_cells * n_bins)
+
+    def _company_rows(self, portfolio: pd.DataFrame) -> np.ndarray:
+        sectors = portfolio['Sector'].astype(str).to_numpy()
+        unknown = set(sectors) - set(self._sector_codes)
+        if unknown:
+            raise ValueError(f"Unknown sectors: {', '.join(sorted(unknown))}")
+        attributes = portfolio.loc[:, ATTRIBUTE_COLUMNS[1:]].to_numpy(dtype=float)
+        codes = np.array([self._sector_codes[sector] for sector in sectors], dtype=float)
+        return np.column_stack([codes, attributes])
+
+    def add_companies(
+        self,
+        portfolio: pd.DataFrame,
+        esg: np.ndarray,
+        carbon: Optional[np.ndarray] = None
+    ) -> None:
+        """
+        Add companies with their full histories, replacing companies already in the cube.
+
+        Args:
+            portfolio: Portfolio rows of the companies
+            esg: Daily ESG Total Score, shape (companies, cube days)
+            carbon: Daily Carbon Emissions (MT), required if the cube was built with them
+
+        Raises:
+            ValueError: If a history does not cover the cube's days or a sector is unknown
+        """
+        esg = np.asarray(esg, dtype=float).reshape(len(portfolio), -1)
+        if esg.shape[1] != self.n_days:
+            raise ValueError(f"Histories must cover the cube's {self.n_days} days")
+        if len(self) == 0 and carbon is not None:
+            self._carbon_sums = np.zeros((0, len(self.months)))
+        if (carbon is None) != (self._carbon_sums is None):
+            raise ValueError("Carbon histories must be given for every company or none")
+
+        attributes = self._company_rows(portfolio)
+        names = portfolio['Company'].astype(str).tolist()
+        existing = np.array([self._rows.get(name, -1) for name in names], dtype=np.int64)
+        all_months = np.arange(len(self.months))
+        self._contribute(existing[existing >= 0], all_months, -1)
+
+        new = existing < 0
+        new_names = [name for name, is_new in zip(names, new) if is_new]
+        start = len(self._names)
+        for i, name in enumerate(new_names):
+            self._rows[name] = start + i
+        self._names.extend(new_names)
+        rows = existing.copy()
+        rows[new] = np.arange(start, start + len(new_names))
+
+        def grow(array: np.ndarray) -> np.ndarray:
+            return np.concatenate([array, np.zeros((len(new_names),) + array.shape[1:], dtype=array.dtype)])
+
+        self._attributes, self._esg_sums, self._band = (
+            grow(self._attributes), grow(self._esg_sums), grow(self._band)
+        )
+        self._attributes[rows] = attributes
+        self._esg_sums[rows] = self._monthly_sums(esg)
+        if carbon is not None:
+            self._carbon_sums = grow(self._carbon_sums)
+            self._carbon_sums[rows] = self._monthly_sums(np.asarray(carbon, dtype=float).reshape(esg.shape))
+        self._band[rows] = band_codes(self._esg_sums[rows] / self._month_days, 'esg')
+        self._contribute(rows, all_months, 1)
+
+    def update_companies(self, portfolio: pd.DataFrame) -> None:
+        """
+        Update the snapshot metrics (sector, market cap, revenue, emissions, incidents) of companies in the cube.
+
+        Args:
+            portfolio: New portfolio rows of the companies
+
+        Raises:
+            KeyError: If a company is not in the cube
+        """
+        rows = np.array([self._rows[name] for name in portfolio['Company'].astype(str)], dtype=np.int64)
+        all_months = np.arange(len(self.months))
+        self._contribute(rows, all_months, -1)
+        self._attributes[rows] = self._company_rows(portfolio)
+        self._contribute(rows, all_months, 1)
+
+    def sync(
+        self,
+        portfolio: pd.DataFrame,
+        history: Callable[[List[str]], Tuple[np.ndarray, Optional[np.ndarray]]]
+    ) -> int:
+        """
+        Bring the cube up to date with a new portfolio version.
+
+        Companies new to the cube are added with histories from ``history``;
+        companies whose snapshot metrics changed are updated. Untouched
+        companies and their cells are left as they are.
+
+        Args:
+            portfolio: New portfolio DataFrame
+            history: Returns (ESG, carbon or None) daily histories over the cube's days for company names
+
+        Returns:
+            int: Number of companies added or updated
+
+        Raises:
+            ValueError: If companies of the cube are missing from the portfolio
+        """
+        names = portfolio['Company'].astype(str)
+        rows = names.map(self._rows)
+        if rows.notna().sum() != len(self):
+            raise ValueError("Companies were removed; rebuild the cube")
+        new = rows.isna().to_numpy()
+        existing = portfolio[~new]
+        changed = np.zeros(len(existing), dtype=bool)
+        if len(existing):
+            current = self._attributes[rows[~new].to_numpy(dtype=np.int64)]
+            changed = (self._company_rows(existing) != current).any(axis=1)
+        if changed.any():
+            self.update_companies(existing[changed])
+        if new.any():
+            added = portfolio[new]
+            esg, carbon = history(added['Company'].astype(str).tolist())
+            self.add_companies(added, esg, carbon)
+        return int(new.sum() + changed.sum())
+
+    def _monthly_sums(self, daily: np.ndarray, day_months: Optional[np.ndarray] = None) -> np.ndarray:
+        # Sum daily values of shape (companies, days) into (companies, months); days are in date order
+        day_months = self._day_months if day_months is None else day_months
+        sums = np.zeros((len(daily), len(self.months)))
+        if len(day_months):
+            starts = np.flatnonzero(np.r_[True, np.diff(day_months) != 0])
+            sums[:, day_months[starts]] = np.add.reduceat(daily, starts, axis=1)
+        return sums
+
+    def append_days(self, dates: pd.DatetimeIndex, esg: np.ndarray, carbon: Optional[np.ndarray] = None) -> None:
+        """
+        Append days for every company, refreshing only the months they fall in.
+
+        Args:
+            dates: New dates, after the cube's last day
+            esg: ESG Total Score per company (in cube order) and new day, shape (companies, new days)
+            carbon: Carbon Emissions (MT) per company and new day, if the cube tracks them
+
+        Raises:
+            ValueError: If the shapes do not match the cube's companies
+        """
+        dates = pd.DatetimeIndex(dates)
+        esg = np.asarray(esg, dtype=float).reshape(len(self), len(dates))
+        if (carbon is None) != (self._carbon_sums is None):
+            raise ValueError("Carbon values must be given exactly when the cube tracks them")
+        if not dates.is_monotonic_increasing or (self.last_date is not None and dates[0] <= self.last_date):
+            raise ValueError("Appended days must be in order and after the cube's last day")
+
+        rows = np.arange(len(self))
+        # Months that already exist lose their old contribution first
+        touched = set(dates.to_period('M'))
+        existing = np.array([i for i, month in enumerate(self.months) if month in touched], dtype=np.int64)
+        self._contribute(rows, existing, -1)
+
+        day_months = self._extend_days(dates)
+        self._esg_sums += self._monthly_sums(esg, day_months)
+        if carbon is not None:
+            self._carbon_sums += self._monthly_sums(np.asarray(carbon, dtype=float).reshape(esg.shape), day_months)
+        touched = np.unique(day_months)
+        self._band[:, touched] = band_codes(self._esg_sums[:, touched] / self._month_days[touched], 'esg')
+        self._contribute(rows, touched, 1)
+
+    # -- queries ------------------------------------------------------------
+
+    def query(
+        self,
+        by: Iterable[str] = ('sector',),
+        sectors: Optional[Sequence[str]] = None,
+        bands: Optional[Sequence[str]] = None,
+        months: Optional[Sequence] = None
+    ) -> pd.DataFrame:
+        """
+        Slice the cube and aggregate it to the ``by`` dimensions.
+
+        Args:
+            by: Dimensions kept as rows, in output column order, from 'sector', 'band' and 'month'
+            sectors: Sectors to keep (defaults to all)
+            bands: ESG bands to keep (defaults to all)
+            months: Months to keep, as periods or 'YYYY-MM' strings (defaults to all)
+
+        Returns:
+            pd.DataFrame: One row per non-empty combination of ``by`` with
+                Holdings (company-months above month level), Weighted ESG,
+                Carbon Emissions (MT), Revenue (B), Carbon Intensity,
+                Mean Safety Incidents and the incident distribution
+        """
+        by = list(dict.fromkeys(by))
+        unknown = set(by) - set(DIMENSIONS)
+        if unknown:
+            raise ValueError(f"Unknown dimensions: {', '.join(sorted(unknown))}")
+        labels = {'sector': self.sectors, 'band': self.bands, 'month': self.months}
+        selected = {
+            'sector': self._select(self.sectors, sectors),
+            'band': self._select(self.bands, bands),
+            'month': self._select(self.months, None if months is None else [pd.Period(m, 'M') for m in months])
+        }
+        index = np.ix_(selected['sector'], selected['band'], selected['month'])
+        dropped = tuple(axis for axis, name in enumerate(DIMENSIONS) if name not in by)
+        sums = {name: cells[index].sum(axis=dropped) for name, cells in self._cells.items()}
+
+        holdings = sums['holdings'].ravel()
+        # Sums keep the cube's axis order; levels are put in the order of ``by`` below
+        kept = [name for name in DIMENSIONS if name in by]
+        keys = pd.MultiIndex.from_product(
+            [[labels[name][i] for i in selected[name]] for name in kept], names=kept
+        ) if by else pd.RangeIndex(1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            frame = pd.DataFrame({
+                'Holdings': holdings,
+                'Weighted ESG': (sums['cap_esg'] / sums['cap']).ravel(),
+                'Carbon Emissions (MT)': sums['carbon'].ravel(),
+                'Revenue (B)': sums['revenue'].ravel(),
+                'Carbon Intensity': (sums['carbon'] / sums['revenue']).ravel(),
+                'Mean Safety Incidents': (sums['incidents'] / sums['holdings']).ravel()
+            }, index=keys)
+        histogram = sums['incident_hist'].reshape(len(holdings), -1)
+        for i, label in enumerate(incident_labels(self.incident_bins.astype(int).tolist())):
+            frame[label] = histogram[:, i]
+        return frame[holdings > 0].reorder_levels(by).reset_index() if by else frame
+
+    @staticmethod
+    def _select(labels: Sequence, keep: Optional[Sequence]) -> np.ndarray:
+        if keep is None:
+            return np.arange(len(labels))
+        keep = set(keep)
+        return np.array([i for i, label in enumerate(labels) if label in keep], dtype=np.int64)
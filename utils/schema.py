@@ -0,0 +1,149 @@
+"""
+Compact schema utilities for Ardian ESG Dashboard
+
+Converts portfolio and time series frames to compact dtypes at load time:
+categorical strings, float32 metrics, small integer counts and int32 day
+offsets from a fixed epoch instead of datetime columns.
+"""
+
+import logging
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+logger = logging.getLogger(__name__)
+
+# Day offsets count days since this date
+EPOCH = np.datetime64('2000-01-01', 'D')
+
+CATEGORICAL_COLUMNS = ('Company', 'Sector', 'Metric')
+INTEGER_COLUMNS = {'Safety Incidents': np.int16}
+# Columns kept in float64 even when float32 would be within tolerance
+FLOAT64_COLUMNS: Sequence[str] = ()
+FLOAT32_RTOL = 1e-6
+
+
+def encode_days(dates) -> np.ndarray:
+    """
+    Encode dates as int32 day offsets from EPOCH.
+
+    Args:
+        dates: Dates (DatetimeIndex, Series or datetime64 array)
+
+    Returns:
+        np.ndarray: int32 day offsets
+    """
+    days = np.asarray(dates, dtype='datetime64[D]') - EPOCH
+    return days.astype(np.int32)
+
+
+def decode_days(days: np.ndarray) -> np.ndarray:
+    """
+    Decode int32 day offsets into dates.
+
+    Args:
+        days: Day offsets from EPOCH
+
+    Returns:
+        np.ndarray: datetime64[ns] dates
+    """
+    return (EPOCH + np.asarray(days).astype('timedelta64[D]')).astype('datetime64[ns]')
+
+
+def _float32_allowed(values: np.ndarray) -> bool:
+    narrowed = values.astype(np.float32)
+    finite = np.isfinite(values)
+    if not np.array_equal(finite, np.isfinite(narrowed)):
+        return False
+    return np.allclose(narrowed[finite], values[finite], rtol=FLOAT32_RTOL, atol=0)
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert a frame to compact dtypes.
+
+    String columns named in CATEGORICAL_COLUMNS become categoricals when
+    that is smaller, INTEGER_COLUMNS get their small integer type, ``Date``
+    becomes an int32 ``Day`` offset and other float64 columns become
+    float32 when every value is within FLOAT32_RTOL.
+
+    Args:
+        df: Portfolio or time series DataFrame
+
+    Returns:
+        pd.DataFrame: Compact copy (columns in the same order)
+    """
+    columns: Dict[str, object] = {}
+    for name in df.columns:
+        series = df[name]
+        if name in CATEGORICAL_COLUMNS and not isinstance(series.dtype, pd.CategoricalDtype):
+            categorical = series.astype('category')
+            # Unique names (e.g. one row per company) are smaller as plain strings
+            smaller = categorical.memory_usage(index=False, deep=True) < series.memory_usage(index=False, deep=True)
+            columns[name] = categorical if smaller else series
+        elif name in INTEGER_COLUMNS:
+            dtype = INTEGER_COLUMNS[name]
+            info = np.iinfo(dtype)
+            if series.min() < info.min or series.max() > info.max:
+                raise ValueError(f"{name} does not fit in {np.dtype(dtype).name}")
+            columns[name] = series.astype(dtype)
+        elif name == 'Date':
+            columns['Day'] = encode_days(series)
+        elif (series.dtype == np.float64 and name not in FLOAT64_COLUMNS
+              and _float32_allowed(series.to_numpy())):
+            columns[name] = series.astype(np.float32)
+        else:
+            columns[name] = series
+    return pd.DataFrame(columns, index=df.index)
+
+
+def memory_report(before: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
+    """
+    Compare the memory of a frame before and after compaction.
+
+    Args:
+        before: Original DataFrame
+        after: Compact DataFrame
+
+    Returns:
+        pd.DataFrame: Bytes and dtype per column before and after, plus a Total row
+    """
+    rows = []
+    for name in before.columns:
+        compact_name = name if name in after.columns else {'Date': 'Day'}[name]
+        rows.append({
+            'Column': name,
+            'Before (B)': int(before[name].memory_usage(index=False, deep=True)),
+            'After (B)': int(after[compact_name].memory_usage(index=False, deep=True)),
+            'Before dtype': str(before[name].dtype),
+            'After dtype': str(after[compact_name].dtype)
+        })
+    report = pd.DataFrame(rows)
+    total = {'Column': 'Total', 'Before (B)': report['Before (B)'].sum(), 'After (B)': report['After (B)'].sum()}
+    return pd.concat([report, pd.DataFrame([total])], ignore_index=True)
+
+
+def compact(df: pd.DataFrame, name: Optional[str] = None, level: int = logging.INFO) -> pd.DataFrame:
+    """
+    Convert a frame to compact dtypes and log its memory before and after.
+
+    Args:
+        df: Portfolio or time series DataFrame
+        name: Frame name in the log message
+        level: Log level of the memory report
+
+    Returns:
+        pd.DataFrame: Compact copy
+    """
+    result = compact_frame(df)
+    if logger.isEnabledFor(level):
+        before = df.memory_usage(index=False, deep=True).sum()
+        after = result.memory_usage(index=False, deep=True).sum()
+        logger.log(
+            level,
+            "compacted %s: %.2f MB -> %.2f MB (%.0f%% saved)",
+            name or 'frame', before / 1e6, after / 1e6, 100 * (1 - after / max(before, 1))
+        )
+    return result
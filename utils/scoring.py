@@ -0,0 +1,154 @@
+"""
+ESG scoring utilities for Ardian ESG Dashboard
+"""
+
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from config.settings import ESG_WEIGHTS, SECTOR_ESG_WEIGHTS
+from utils.instrumentation import timed
+
+
+# ESG pillar -> score column in the portfolio schema
+ESG_COMPONENTS = {
+    'Environmental': 'Environmental Score',
+    'Social': 'Social Score',
+    'Governance': 'Governance Score'
+}
+
+ArrayLike = Union[float, np.ndarray, pd.Series]
+
+
+def _weight_vector(weights: Dict[str, float]) -> np.ndarray:
+    missing = [pillar for pillar in ESG_COMPONENTS if pillar not in weights]
+    if missing:
+        raise ValueError(f"ESG weights missing pillars: {missing}")
+    return np.array([weights[pillar] for pillar in ESG_COMPONENTS], dtype=float)
+
+
+def sector_weight_matrix(
+    sectors: Sequence[str],
+    weights: Optional[Dict[str, float]] = None,
+    sector_weights: Optional[Dict[str, Dict[str, float]]] = None
+) -> np.ndarray:
+    """
+    Build the (sectors, pillars) weight matrix with per-sector overrides applied.
+
+    Args:
+        sectors: Sector names, one row each
+        weights: Default pillar weights (defaults to config ESG_WEIGHTS)
+        sector_weights: Per-sector weight overrides (defaults to config SECTOR_ESG_WEIGHTS)
+
+    Returns:
+        np.ndarray: Weight matrix of shape (len(sectors), 3)
+    """
+    weights = ESG_WEIGHTS if weights is None else weights
+    sector_weights = SECTOR_ESG_WEIGHTS if sector_weights is None else sector_weights
+    default = _weight_vector(weights)
+    return np.array([
+        _weight_vector({**weights, **sector_weights[sector]}) if sector in sector_weights else default
+        for sector in sectors
+    ]).reshape(len(sectors), len(ESG_COMPONENTS))
+
+
+@timed('scoring.score_esg')
+def score_esg(
+    environmental: ArrayLike,
+    social: ArrayLike,
+    governance: ArrayLike,
+    weights: Optional[Dict[str, float]] = None,
+    sectors: Optional[Sequence[str]] = None,
+    sector_weights: Optional[Dict[str, Dict[str, float]]] = None
+) -> np.ndarray:
+    """
+    Calculate weighted ESG scores for whole columns or arrays at once.
+
+    Pillar arrays may carry extra trailing axes (e.g. days); ``sectors``
+    then labels the first axis and its weights are broadcast over the rest.
+
+    Args:
+        environmental: Environmental scores (0-100)
+        social: Social scores (0-100)
+        governance: Governance scores (0-100)
+        weights: Default pillar weights (defaults to config ESG_WEIGHTS)
+        sectors: Sector of each company along the first axis, for per-sector weights
+        sector_weights: Per-sector weight overrides (defaults to config SECTOR_ESG_WEIGHTS)
+
+    Returns:
+        np.ndarray: Weighted ESG scores
+    """
+    pillars = [np.asarray(environmental), np.asarray(social), np.asarray(governance)]
+    sector_weights = SECTOR_ESG_WEIGHTS if sector_weights is None else sector_weights
+
+    if sectors is None or not sector_weights:
+        w = _weight_vector(ESG_WEIGHTS if weights is None else weights)
+        return pillars[0] * w[0] + pillars[1] * w[1] + pillars[2] * w[2]
+
+    codes, uniques = pd.factorize(np.asarray(sectors, dtype=object))
+    w = sector_weight_matrix(uniques, weights, sector_weights)[codes]
+    trailing = (1,) * (pillars[0].ndim - 1)
+    score = pillars[0] * w[:, 0].reshape(-1, *trailing)
+    score += pillars[1] * w[:, 1].reshape(-1, *trailing)
+    score += pillars[2] * w[:, 2].reshape(-1, *trailing)
+    return score
+
+
+@timed('scoring.rescore_portfolio')
+def rescore_portfolio(
+    df: pd.DataFrame,
+    weights: Optional[Dict[str, float]] = None,
+    sector_weights: Optional[Dict[str, Dict[str, float]]] = None
+) -> pd.Series:
+    """
+    Recompute the ESG total score of every company in a portfolio.
+
+    Args:
+        df: Portfolio DataFrame with pillar score and Sector columns
+        weights: Default pillar weights (defaults to config ESG_WEIGHTS)
+        sector_weights: Per-sector weight overrides (defaults to config SECTOR_ESG_WEIGHTS)
+
+    Returns:
+        pd.Series: ESG total scores aligned with the portfolio index
+    """
+    scores = score_esg(
+        *(df[column].to_numpy(dtype=float) for column in ESG_COMPONENTS.values()),
+        weights=weights,
+        sectors=df['Sector'].to_numpy(),
+        sector_weights=sector_weights
+    )
+    return pd.Series(scores, index=df.index, name='ESG Total Score')
+
+
+@timed('scoring.rescore_time_series')
+def rescore_time_series(
+    values: np.ndarray,
+    metrics: Sequence[str],
+    sectors: Optional[Sequence[str]] = None,
+    weights: Optional[Dict[str, float]] = None,
+    sector_weights: Optional[Dict[str, Dict[str, float]]] = None
+) -> np.ndarray:
+    """
+    Recompute daily ESG total scores from a (companies, metrics, days) panel.
+
+    Args:
+        values: Panel values with shape (N, M, D)
+        metrics: Metric names of the second axis, including the three pillar scores
+        sectors: Sector of each company, for per-sector weights
+        weights: Default pillar weights (defaults to config ESG_WEIGHTS)
+        sector_weights: Per-sector weight overrides (defaults to config SECTOR_ESG_WEIGHTS)
+
+    Returns:
+        np.ndarray: ESG total scores with shape (N, D)
+    """
+    metrics = list(metrics)
+    missing = [column for column in ESG_COMPONENTS.values() if column not in metrics]
+    if missing:
+        raise ValueError(f"Panel is missing pillar scores: {missing}")
+    return score_esg(
+        *(values[:, metrics.index(column)] for column in ESG_COMPONENTS.values()),
+        weights=weights,
+        sectors=sectors,
+        sector_weights=sector_weights
+    )
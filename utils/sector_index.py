@@ -0,0 +1,230 @@
+"""
+Sector benchmark utilities for Ardian ESG Dashboard
+"""
+
+import copy
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from utils.portfolio import PortfolioIndex
+
+
+BENCHMARK_QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+
+def sorted_quantiles(sorted_values: np.ndarray, quantiles: Sequence[float]) -> np.ndarray:
+    """
+    Linearly interpolated quantiles of already sorted values.
+
+    Equivalent to ``np.quantile`` on the unsorted data, without the
+    O(n) partition: each quantile is two lookups.
+
+    Args:
+        sorted_values: Values sorted ascending along the first axis
+        quantiles: Quantiles in [0, 1]
+
+    Returns:
+        np.ndarray: One row per quantile
+    """
+    n = len(sorted_values)
+    if n == 0:
+        return np.full((len(quantiles),) + sorted_values.shape[1:], np.nan)
+    pos = np.asarray(quantiles, dtype=float) * (n - 1)
+    lo = np.floor(pos).astype(int)
+    hi = np.minimum(lo + 1, n - 1)
+    frac = (pos - lo).reshape(-1, *([1] * (sorted_values.ndim - 1)))
+    return sorted_values[lo] * (1 - frac) + sorted_values[hi] * frac
+
+
+class SectorBenchmarkIndex:
+    """
+    Per-sector means, quantiles and sorted metric arrays.
+
+    Built once per dataset version; sector percentiles are a binary search
+    in the sorted arrays, and :meth:`update_company` moves a single value
+    in place instead of regrouping the portfolio.
+    """
+
+    def __init__(self, portfolio: PortfolioIndex, metrics: Optional[Sequence[str]] = None):
+        """
+        Args:
+            portfolio: Indexed portfolio
+            metrics: Metric columns to index (defaults to every numeric column)
+        """
+        df = portfolio.df
+        if metrics is None:
+            metrics = [column for column in df.columns if pd.api.types.is_numeric_dtype(df[column].dtype)]
+        self.version = portfolio.version
+        self.metrics: List[str] = list(metrics)
+        self._metric_index = {metric: j for j, metric in enumerate(self.metrics)}
+        self._portfolio = portfolio
+
+        # Current values by company position, used to find the old value on update
+        self._values = portfolio.category_matrix(self.metrics).copy()
+        self._sectors = df['Sector'].to_numpy()
+        self._sorted: Dict[str, np.ndarray] = {}
+        self._sums: Dict[str, np.ndarray] = {}
+        for sector in portfolio.sectors:
+            block = self._values[portfolio.sector_positions(sector)]
+            # Fortran order keeps each metric's sorted column contiguous
+            self._sorted[sector] = np.asfortranarray(np.sort(block, axis=0))
+            self._sums[sector] = block.sum(axis=0)
+
+    def copy(self, portfolio: Optional[PortfolioIndex] = None) -> 'SectorBenchmarkIndex':
+        """
+        Copy the index so it can be updated without affecting readers of this one.
+
+        Args:
+            portfolio: Portfolio the copy refers to (same companies, in the same order)
+
+        Returns:
+            SectorBenchmarkIndex: Independent copy
+        """
+        index = copy.copy(self)
+        if portfolio is not None:
+            index._portfolio = portfolio
+            index.version = portfolio.version
+        index._values = self._values.copy()
+        index._sorted = {sector: values.copy(order='F') for sector, values in self._sorted.items()}
+        index._sums = {sector: sums.copy() for sector, sums in self._sums.items()}
+        return index
+
+    @property
+    def sectors(self) -> List[str]:
+        """Indexed sectors."""
+        return list(self._sorted)
+
+    def count(self, sector: str) -> int:
+        """Number of companies in a sector."""
+        return len(self._sorted[sector])
+
+    def mean(self, sector: str, metric: str) -> float:
+        """
+        Get the sector mean of a metric.
+
+        Args:
+            sector: Sector name
+            metric: Metric column
+
+        Returns:
+            float: Sector mean
+        """
+        count = self.count(sector)
+        return float(self._sums[sector][self._metric_index[metric]] / count) if count else np.nan
+
+    def sorted_values(self, sector: str, metric: str) -> np.ndarray:
+        """
+        Get the sorted values of a metric within a sector (read-only view).
+
+        Args:
+            sector: Sector name
+            metric: Metric column
+
+        Returns:
+            np.ndarray: Sorted sector values
+        """
+        view = self._sorted[sector][:, self._metric_index[metric]]
+        view.flags.writeable = False
+        return view
+
+    def quantiles(
+        self,
+        sector: str,
+        metric: str,
+        quantiles: Sequence[float] = BENCHMARK_QUANTILES
+    ) -> Dict[float, float]:
+        """
+        Get sector quantiles of a metric.
+
+        Args:
+            sector: Sector name
+            metric: Metric column
+            quantiles: Quantiles in [0, 1]
+
+        Returns:
+            Dict: Quantile -> value
+        """
+        values = sorted_quantiles(self._sorted[sector][:, self._metric_index[metric]], quantiles)
+        return dict(zip(quantiles, values.tolist()))
+
+    def percentile(self, sector: str, metric: str, value: float) -> float:
+        """
+        Get the percentile rank of a value within a sector.
+
+        Ties count half, matching ``scipy.stats.percentileofscore(kind='mean')``.
+
+        Args:
+            sector: Sector name
+            metric: Metric column
+            value: Metric value
+
+        Returns:
+            float: Percentile rank in [0, 100]
+        """
+        column = self._sorted[sector][:, self._metric_index[metric]]
+        if not len(column):
+            return np.nan
+        left = np.searchsorted(column, value, side='left')
+        right = np.searchsorted(column, value, side='right')
+        return float(100.0 * (left + right) / (2 * len(column)))
+
+    def company_percentile(self, company: str, metric: str) -> float:
+        """
+        Get the percentile rank of a company within its sector.
+
+        Args:
+            company: Company name
+            metric: Metric column
+
+        Returns:
+            float: Percentile rank in [0, 100]
+        """
+        position = self._portfolio.position(company)
+        return self.percentile(self._sectors[position], metric, self._values[position, self._metric_index[metric]])
+
+    def summary(self) -> pd.DataFrame:
+        """
+        Get the sector means of every indexed metric.
+
+        Returns:
+            pd.DataFrame: Sector x metric means
+        """
+        return pd.DataFrame(
+            [self._sums[sector] / max(self.count(sector), 1) for sector in self.sectors],
+            index=pd.Index(self.sectors, name='Sector'),
+            columns=self.metrics
+        )
+
+    def update_company(self, company: str, values: Dict[str, float]) -> None:
+        """
+        Apply new metric values for one company incrementally.
+
+        Each changed value is moved to its new sorted position by shifting
+        the values between the old and new position, O(k) per metric.
+
+        Args:
+            company: Company name
+            values: Metric -> new value
+        """
+        position = self._portfolio.position(company)
+        sector = self._sectors[position]
+        block = self._sorted[sector]
+        for metric, new in values.items():
+            j = self._metric_index[metric]
+            old = self._values[position, j]
+            if new == old:
+                continue
+            column = block[:, j]
+            i = np.searchsorted(column, old, side='left')
+            k = np.searchsorted(column, new, side='left')
+            if k > i:
+                column[i:k - 1] = column[i + 1:k]
+                column[k - 1] = new
+            else:
+                column[k + 1:i + 1] = column[k:i]
+                column[k] = new
+            self._sums[sector][j] += new - old
+            self._values[position, j] = new
+
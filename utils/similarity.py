@@ -0,0 +1,237 @@
+"""
+Peer similarity utilities for Ardian ESG Dashboard
+
+Nearest-neighbour search over normalized ESG and financial feature
+vectors. Distances to every holding come from one matrix-vector product
+against precomputed squared norms, blocked for batches of queries, and
+``argpartition`` picks the k nearest without sorting the whole portfolio.
+"""
+
+import copy
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.settings import SIMILARITY_CONFIG
+
+
+class PeerIndex:
+    """
+    Nearest-peer index over z-scored feature vectors.
+
+    Features are normalized with the mean and standard deviation of the
+    holdings the index was built from; inserted and updated holdings reuse
+    those statistics so existing distances stay comparable.
+    """
+
+    def __init__(
+        self,
+        names: Sequence[str],
+        features: np.ndarray,
+        feature_names: Optional[Sequence[str]] = None,
+        block_size: int = SIMILARITY_CONFIG['block_size']
+    ):
+        """
+        Args:
+            names: Holding names, one per row
+            features: Raw feature matrix of shape (holdings, features)
+            feature_names: Column names of the features
+            block_size: Query rows per distance block in :meth:`query_many`
+
+        Raises:
+            ValueError: If names are not unique or do not match the feature rows
+        """
+        features = np.asarray(features, dtype=np.float64)
+        if len(names) != len(features):
+            raise ValueError("One feature row is needed per holding")
+        self.feature_names = list(feature_names) if feature_names is not None else None
+        self.block_size = block_size
+
+        self._mean = np.nanmean(features, axis=0)
+        std = np.nanstd(features, axis=0)
+        self._scale = np.where(std > 0, std, 1.0)
+
+        self._names: List[str] = list(names)
+        self._positions = {name: i for i, name in enumerate(self._names)}
+        if len(self._positions) != len(self._names):
+            raise ValueError("Holding names must be unique")
+
+        # Capacity grows geometrically so inserts are amortized O(features)
+        self._size = len(features)
+        self._vectors = np.empty((max(self._size, 16), features.shape[1]), dtype=np.float32)
+        self._norms = np.empty(len(self._vectors), dtype=np.float32)
+        self._store(np.arange(self._size), features)
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        features: Optional[Sequence[str]] = None,
+        name_column: str = 'Company'
+    ) -> 'PeerIndex':
+        """
+        Build the index from a portfolio DataFrame.
+
+        Args:
+            df: Portfolio DataFrame
+            features: Feature columns (defaults to every numeric column)
+            name_column: Column holding the holding names
+
+        Returns:
+            PeerIndex: Index over every row
+        """
+        if features is None:
+            features = [c for c in df.columns if pd.api.types.is_numeric_dtype(df[c].dtype)]
+        return cls(df[name_column].tolist(), df.loc[:, list(features)].to_numpy(dtype=float), features)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._positions
+
+    @property
+    def names(self) -> List[str]:
+        """Indexed holding names, in insertion order."""
+        return list(self._names)
+
+    def copy(self) -> 'PeerIndex':
+        """
+        Copy the index, so inserts into the copy leave this one untouched.
+
+        Returns:
+            PeerIndex: Independent index with the same holdings and statistics
+        """
+        clone = copy.copy(self)
+        clone._names = list(self._names)
+        clone._positions = dict(self._positions)
+        clone._vectors = self._vectors.copy()
+        clone._norms = self._norms.copy()
+        return clone
+
+    def _normalize(self, features: np.ndarray) -> np.ndarray:
+        z = (np.asarray(features, dtype=np.float64) - self._mean) / self._scale
+        # Missing values sit at the mean, contributing no distance
+        return np.nan_to_num(z, nan=0.0).astype(np.float32)
+
+    def _store(self, rows: np.ndarray, features: np.ndarray) -> None:
+        vectors = self._normalize(features)
+        self._vectors[rows] = vectors
+        self._norms[rows] = np.einsum('ij,ij->i', vectors, vectors)
+
+    def insert(self, names: Sequence[str], features: np.ndarray) -> None:
+        """
+        Add holdings, or replace the features of holdings already indexed.
+
+        Args:
+            names: Holding names
+            features: Raw feature rows of shape (len(names), features)
+        """
+        features = np.atleast_2d(np.asarray(features, dtype=np.float64))
+        rows = np.empty(len(names), dtype=np.int64)
+        for i, name in enumerate(names):
+            row = self._positions.get(name)
+            if row is None:
+                row = self._positions[name] = len(self._names)
+                self._names.append(name)
+            rows[i] = row
+
+        size = len(self._names)
+        if size > len(self._vectors):
+            capacity = max(size, 2 * len(self._vectors))
+            self._vectors = np.resize(self._vectors, (capacity, self._vectors.shape[1]))
+            self._norms = np.resize(self._norms, capacity)
+        self._size = size
+        self._store(rows, features)
+
+    def query_many(self, names: Sequence[str], k: int = SIMILARITY_CONFIG['peer_count']) -> pd.DataFrame:
+        """
+        Find the k nearest peers of many indexed holdings, in blocks of queries.
+
+        Args:
+            names: Indexed holding names
+            k: Peers per holding (the holding itself is excluded)
+
+        Returns:
+            pd.DataFrame: Holding, Rank, Peer and Distance columns
+
+        Raises:
+            KeyError: If a holding is not indexed
+        """
+        query_rows = np.array([self._positions[name] for name in names], dtype=np.int64)
+        vectors, norms = self._vectors[:self._size], self._norms[:self._size]
+        k = min(k, self._size - 1)
+        if k <= 0:
+            return pd.DataFrame(columns=['Holding', 'Rank', 'Peer', 'Distance'])
+        peers, distances = [], []
+        for start in range(0, len(query_rows), self.block_size):
+            rows = query_rows[start:start + self.block_size]
+            # |a - b|^2 = |a|^2 + |b|^2 - 2 a.b, one matrix product per block
+            block = norms[rows, None] + norms[None, :] - 2 * (vectors[rows] @ vectors.T)
+            np.maximum(block, 0, out=block)
+            block[np.arange(len(rows)), rows] = np.inf
+            nearest = np.argpartition(block, k - 1, axis=1)[:, :k]
+            nearest_distances = np.take_along_axis(block, nearest, axis=1)
+            order = np.argsort(nearest_distances, axis=1)
+            peers.append(np.take_along_axis(nearest, order, axis=1))
+            distances.append(np.sqrt(np.take_along_axis(nearest_distances, order, axis=1)))
+
+        peers = np.concatenate(peers) if peers else np.empty((0, k), dtype=np.int64)
+        distances = np.concatenate(distances) if distances else np.empty((0, k), dtype=np.float32)
+        names_array = np.array(self._names, dtype=object)
+        return pd.DataFrame({
+            'Holding': np.repeat(np.asarray(names, dtype=object), k),
+            'Rank': np.tile(np.arange(1, k + 1), len(query_rows)),
+            'Peer': names_array[peers.ravel()],
+            'Distance': distances.ravel()
+        })
+
+    def query(self, name: str, k: int = SIMILARITY_CONFIG['peer_count']) -> List[Tuple[str, float]]:
+        """
+        Find the k nearest peers of an indexed holding.
+
+        Args:
+            name: Indexed holding name
+            k: Number of peers (the holding itself is excluded)
+
+        Returns:
+            List: (peer name, distance) pairs, nearest first
+
+        Raises:
+            KeyError: If the holding is not indexed
+        """
+        row = self._positions[name]
+        return self.query_vector(self._vectors[row], k, normalized=True, exclude=row)
+
+    def query_vector(
+        self,
+        features: np.ndarray,
+        k: int = SIMILARITY_CONFIG['peer_count'],
+        normalized: bool = False,
+        exclude: Optional[int] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Find the k holdings nearest to a feature vector.
+
+        Args:
+            features: Feature vector
+            k: Number of holdings
+            normalized: Whether ``features`` is already z-scored
+            exclude: Row to leave out (the query holding itself)
+
+        Returns:
+            List: (holding name, distance) pairs, nearest first
+        """
+        vector = np.asarray(features, dtype=np.float32) if normalized else self._normalize(features[None, :])[0]
+        vectors, norms = self._vectors[:self._size], self._norms[:self._size]
+        distances = norms + vector @ vector - 2 * (vectors @ vector)
+        np.maximum(distances, 0, out=distances)
+        if exclude is not None:
+            distances[exclude] = np.inf
+        k = min(k, self._size - (exclude is not None))
+        if k <= 0:
+            return []
+        nearest = np.argpartition(distances, k - 1)[:k] if k < self._size else np.arange(self._size)
+        nearest = nearest[np.argsort(distances[nearest])][:k]
+        return [(self._names[i], float(np.sqrt(distances[i]))) for i in nearest]
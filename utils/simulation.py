@@ -0,0 +1,203 @@
+"""
+Scenario simulation utilities for Ardian ESG Dashboard
+
+Monte Carlo projection of the time series model of ``generate_time_series``
+(base value + trend + seasonality + Gaussian noise). Paths are simulated
+vectorized per company, companies are sharded across a process pool, and
+every company draws from its own ``SeedSequence`` child stream so results
+do not depend on how the work was sharded.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.settings import THRESHOLDS
+from utils.cache import cached
+from utils.data_generator import get_metric_rules
+
+
+@dataclass(frozen=True)
+class ScenarioModel:
+    """Parameters of a projection; also the cache key of its results."""
+
+    metric: str = 'ESG Score'
+    horizon_days: int = 730
+    n_paths: int = 10000
+    threshold: float = THRESHOLDS['esg_good']
+    trend_range: Optional[Tuple[float, float]] = None  # Daily trend range, defaults to the metric rules
+    noise: float = 3.0
+    seasonality: float = 5.0
+    season_days: int = 365
+    quantiles: Tuple[float, ...] = (0.05, 0.25, 0.5, 0.75, 0.95)
+    band_step_days: int = 7
+    seed: int = 0
+
+    @property
+    def rules(self) -> Dict[str, float]:
+        rules = get_metric_rules(self.metric)
+        if self.trend_range is not None:
+            rules.update(trend_low=self.trend_range[0], trend_high=self.trend_range[1])
+        return rules
+
+
+@dataclass(frozen=True)
+class ScenarioResult:
+    """Fan bands and threshold crossing probabilities of every company."""
+
+    model: ScenarioModel
+    companies: pd.Index
+    dates: pd.DatetimeIndex
+    bands: np.ndarray  # (companies, quantiles, band dates)
+    crossing_probability: pd.Series
+    median_crossing_days: pd.Series = field(repr=False)
+
+    def fan(self, company: str) -> pd.DataFrame:
+        """
+        Get the fan bands of one company.
+
+        Args:
+            company: Company name
+
+        Returns:
+            pd.DataFrame: One column per quantile, indexed by date
+        """
+        return pd.DataFrame(
+            self.bands[self.companies.get_loc(company)].T,
+            index=self.dates,
+            columns=[f"p{q * 100:g}" for q in self.model.quantiles]
+        )
+
+
+def simulate_paths(start: float, model: ScenarioModel, rng: np.random.Generator) -> np.ndarray:
+    """
+    Simulate the projected paths of one company.
+
+    Args:
+        start: Current metric value
+        model: Scenario parameters
+        rng: Random generator of the company
+
+    Returns:
+        np.ndarray: Paths with shape (n_paths, horizon_days), float32
+    """
+    rules = model.rules
+    steps = np.arange(1, model.horizon_days + 1, dtype=np.float32)
+    trend = rng.uniform(rules['trend_low'], rules['trend_high'], model.n_paths).astype(np.float32)
+
+    # Noise is drawn straight into the output buffer, everything else is added in place
+    paths = rng.standard_normal((model.n_paths, model.horizon_days), dtype=np.float32)
+    paths *= model.noise
+    paths += (np.sin(2 * np.pi * steps / model.season_days) * model.seasonality).astype(np.float32)
+    paths += np.float32(start)
+    paths += trend[:, None] * steps
+    np.clip(paths, rules['lower'], rules['upper'], out=paths)
+    return paths
+
+
+def _simulate_shard(
+    starts: np.ndarray,
+    seeds: Sequence[np.random.SeedSequence],
+    model: ScenarioModel
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    band_days = np.arange(0, model.horizon_days, model.band_step_days)
+    bands = np.empty((len(starts), len(model.quantiles), len(band_days)))
+    probability = np.empty(len(starts))
+    median_days = np.empty(len(starts))
+
+    for i, (start, seed) in enumerate(zip(starts, seeds)):
+        paths = simulate_paths(start, model, np.random.default_rng(seed))
+        bands[i] = np.quantile(paths[:, band_days], model.quantiles, axis=0)
+        crossed = paths >= model.threshold
+        hit = crossed.any(axis=1)
+        probability[i] = hit.mean()
+        first = crossed.argmax(axis=1)[hit] + 1
+        median_days[i] = np.median(first) if len(first) else np.nan
+    return bands, probability, median_days
+
+
+_EXECUTOR: Optional[ProcessPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    # One pool per process, reused across simulations. Workers are started by a
+    # forkserver (spawn where unavailable): forking the multi-threaded Streamlit
+    # server could copy locks held by other threads into the children.
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            _EXECUTOR = ProcessPoolExecutor(
+                max_workers=os.cpu_count() or 1, mp_context=multiprocessing.get_context(method)
+            )
+        return _EXECUTOR
+
+
+@cached(name='scenarios')
+def _simulate(
+    companies: Tuple[str, ...],
+    starts: Tuple[float, ...],
+    model: ScenarioModel,
+    max_workers: Optional[int]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # One child stream per company, so results are independent of the sharding
+    seeds = np.random.SeedSequence(model.seed).spawn(len(companies))
+    starts = np.asarray(starts, dtype=float)
+
+    n_shards = min(max_workers or os.cpu_count() or 1, len(companies))
+    if n_shards <= 1:
+        return _simulate_shard(starts, seeds, model)
+
+    bounds = np.linspace(0, len(companies), n_shards + 1).astype(int)
+    shards = list(_get_executor().map(
+        _simulate_shard,
+        [starts[a:b] for a, b in zip(bounds[:-1], bounds[1:])],
+        [seeds[a:b] for a, b in zip(bounds[:-1], bounds[1:])],
+        [model] * n_shards
+    ))
+    return tuple(np.concatenate(parts) for parts in zip(*shards))
+
+
+def simulate_scenarios(
+    start_values: pd.Series,
+    model: ScenarioModel = ScenarioModel(),
+    start_date: Optional[pd.Timestamp] = None,
+    max_workers: Optional[int] = None
+) -> ScenarioResult:
+    """
+    Project every company forward with Monte Carlo paths.
+
+    Results are cached per model parameters and start values.
+
+    Args:
+        start_values: Current metric value per company, indexed by company name
+        model: Scenario parameters
+        start_date: Date of the start values (defaults to today)
+        max_workers: Shards run in parallel on the shared worker pool (defaults to the CPU count; 1 runs in-process)
+
+    Returns:
+        ScenarioResult: Fan bands and crossing probabilities
+    """
+    companies = pd.Index(start_values.index)
+    bands, probability, median_days = _simulate(
+        tuple(companies), tuple(start_values.astype(float)), model, max_workers
+    )
+    if start_date is None:
+        start_date = pd.Timestamp.now().normalize()
+    band_days = np.arange(0, model.horizon_days, model.band_step_days) + 1
+
+    return ScenarioResult(
+        model=model,
+        companies=companies,
+        dates=start_date + pd.to_timedelta(band_days, unit='D'),
+        bands=bands,
+        crossing_probability=pd.Series(probability, index=companies, name='Crossing Probability'),
+        median_crossing_days=pd.Series(median_days, index=companies, name='Median Crossing Day')
+    )
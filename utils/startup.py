@@ -0,0 +1,42 @@
+"""
+Startup timing utilities for Ardian ESG Dashboard
+"""
+
+import logging
+import time
+from typing import Dict
+
+# Taken when the first script run imports this module, before anything heavy
+PROCESS_START = time.perf_counter()
+
+_marks: Dict[str, float] = {}
+
+logger = logging.getLogger(__name__)
+
+
+def mark(name: str) -> float:
+    """
+    Record a startup milestone the first time it is reached in this process.
+
+    Later calls (reruns) keep the cold-start value.
+
+    Args:
+        name: Milestone name, e.g. 'imports' or 'first_paint'
+
+    Returns:
+        float: Milliseconds from process start to the first time the milestone was reached
+    """
+    if name not in _marks:
+        _marks[name] = (time.perf_counter() - PROCESS_START) * 1000
+        logger.info("startup %s reached after %.1f ms", name, _marks[name])
+    return _marks[name]
+
+
+def timings() -> Dict[str, float]:
+    """
+    Get the recorded startup milestones.
+
+    Returns:
+        Dict: Milestone name -> milliseconds since process start
+    """
+    return dict(_marks)
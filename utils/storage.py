@@ -0,0 +1,236 @@
+"""
+Columnar on-disk storage utilities for Ardian ESG Dashboard
+
+Portfolios and time series are stored as one ``.npy`` file per column next
+to a ``manifest.json``. Files are reopened with ``mmap_mode='r'`` so several
+worker processes share the OS page cache instead of each holding a copy,
+and only the columns or slices actually read are paged in.
+"""
+
+import json
+import os
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from config.settings import DATA_PATH
+
+
+MANIFEST = 'manifest.json'
+FORMAT_VERSION = 1
+
+PORTFOLIO_DIR = os.path.join(DATA_PATH, 'portfolio')
+TIME_SERIES_DIR = os.path.join(DATA_PATH, 'time_series')
+
+
+def _column_file(name: str, used: set) -> str:
+    stem = re.sub(r'[^0-9a-zA-Z]+', '_', name).strip('_').lower() or 'column'
+    candidate, i = stem, 1
+    while candidate in used:
+        i += 1
+        candidate = f'{stem}_{i}'
+    used.add(candidate)
+    return candidate + '.npy'
+
+
+def _save_array(path: str, array: np.ndarray) -> None:
+    # Write next to the target and swap in, so readers mapping the old file keep a valid inode
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        np.save(f, np.ascontiguousarray(array))
+    os.replace(tmp, path)
+
+
+def _write_manifest(path: str, manifest: Dict) -> None:
+    tmp = os.path.join(path, MANIFEST + '.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, os.path.join(path, MANIFEST))
+
+
+def _read_manifest(path: str, kind: str) -> Dict:
+    with open(os.path.join(path, MANIFEST)) as f:
+        manifest = json.load(f)
+    if manifest.get('kind') != kind or manifest.get('format') != FORMAT_VERSION:
+        raise ValueError(f"{path} does not contain a format {FORMAT_VERSION} {kind} snapshot")
+    return manifest
+
+
+def write_portfolio(df: pd.DataFrame, path: str = PORTFOLIO_DIR) -> Dict:
+    """
+    Snapshot a portfolio DataFrame to columnar ``.npy`` files.
+
+    String and categorical columns are stored as integer codes with their
+    categories in the manifest; numeric columns keep their dtype.
+
+    Args:
+        df: Portfolio DataFrame
+        path: Snapshot directory
+
+    Returns:
+        Dict: Written manifest
+    """
+    os.makedirs(path, exist_ok=True)
+    used: set = set()
+    columns = []
+    for name in df.columns:
+        series = df[name]
+        entry = {'name': name, 'file': _column_file(name, used)}
+        if isinstance(series.dtype, pd.CategoricalDtype) or not pd.api.types.is_numeric_dtype(series.dtype):
+            categorical = pd.Categorical(series)
+            entry.update(kind='category', categories=categorical.categories.astype(str).tolist())
+            array = categorical.codes.astype(np.int32)
+        else:
+            entry['kind'] = 'numeric'
+            array = series.to_numpy()
+        entry['dtype'] = array.dtype.str
+        _save_array(os.path.join(path, entry['file']), array)
+        columns.append(entry)
+
+    manifest = {'kind': 'portfolio', 'format': FORMAT_VERSION, 'rows': len(df), 'columns': columns}
+    _write_manifest(path, manifest)
+    return manifest
+
+
+def read_portfolio(
+    path: str = PORTFOLIO_DIR,
+    columns: Optional[Sequence[str]] = None,
+    mmap: bool = True
+) -> pd.DataFrame:
+    """
+    Load a portfolio snapshot, reading only the requested columns.
+
+    Args:
+        path: Snapshot directory
+        columns: Columns to load (defaults to all)
+        mmap: Memory-map the column files instead of reading them
+
+    Returns:
+        pd.DataFrame: Portfolio data; string columns come back as categoricals
+    """
+    manifest = _read_manifest(path, 'portfolio')
+    entries = {entry['name']: entry for entry in manifest['columns']}
+    names = list(entries) if columns is None else list(columns)
+    missing = [name for name in names if name not in entries]
+    if missing:
+        raise KeyError(f"Columns not in snapshot: {missing}")
+
+    data = {}
+    for name in names:
+        entry = entries[name]
+        array = np.load(os.path.join(path, entry['file']), mmap_mode='r' if mmap else None)
+        if entry['kind'] == 'category':
+            data[name] = pd.Categorical.from_codes(array, categories=entry['categories'])
+        else:
+            data[name] = array
+    return pd.DataFrame(data, columns=names, copy=False)
+
+
+def write_time_series(
+    dates: pd.DatetimeIndex,
+    companies: Sequence[str],
+    metrics: Sequence[str],
+    values: np.ndarray,
+    path: str = TIME_SERIES_DIR
+) -> Dict:
+    """
+    Snapshot a (companies, metrics, days) panel to disk.
+
+    The panel is stored C-contiguous, so every (company, metric) series is
+    one contiguous run of bytes in the file.
+
+    Args:
+        dates: Dates of the day axis
+        companies: Company names of the first axis
+        metrics: Metric names of the second axis
+        values: Panel values with shape (N, M, D)
+        path: Snapshot directory
+
+    Returns:
+        Dict: Written manifest
+    """
+    if values.shape != (len(companies), len(metrics), len(dates)):
+        raise ValueError(f"Panel shape {values.shape} does not match its axes")
+    os.makedirs(path, exist_ok=True)
+    _save_array(os.path.join(path, 'values.npy'), values)
+    _save_array(os.path.join(path, 'dates.npy'), dates.values.astype('datetime64[ns]'))
+
+    manifest = {
+        'kind': 'time_series',
+        'format': FORMAT_VERSION,
+        'companies': [str(company) for company in companies],
+        'metrics': list(metrics),
+        'days': len(dates),
+        'dtype': values.dtype.str
+    }
+    _write_manifest(path, manifest)
+    return manifest
+
+
+def read_time_series(
+    path: str = TIME_SERIES_DIR,
+    companies: Optional[Sequence[str]] = None,
+    metrics: Optional[Sequence[str]] = None,
+    mmap: bool = True
+) -> Tuple[pd.DatetimeIndex, List[str], List[str], np.ndarray]:
+    """
+    Open a time series snapshot, optionally projected to some companies and metrics.
+
+    Without projection the memory-mapped panel is returned as is; a
+    projection gathers only the selected rows from the file.
+
+    Args:
+        path: Snapshot directory
+        companies: Companies to load (defaults to all)
+        metrics: Metrics to load (defaults to all)
+        mmap: Memory-map the panel instead of reading it
+
+    Returns:
+        Tuple: Dates, companies, metrics and values with shape (N, M, D)
+    """
+    manifest = _read_manifest(path, 'time_series')
+    dates = pd.DatetimeIndex(np.load(os.path.join(path, 'dates.npy')))
+    values = np.load(os.path.join(path, 'values.npy'), mmap_mode='r' if mmap else None)
+
+    all_companies, all_metrics = manifest['companies'], manifest['metrics']
+    if companies is not None:
+        rows = pd.Index(all_companies).get_indexer(companies)
+        if (rows < 0).any():
+            raise KeyError(f"Companies not in snapshot: {list(np.asarray(companies)[rows < 0])}")
+        values, all_companies = values[rows], list(companies)
+    if metrics is not None:
+        cols = pd.Index(all_metrics).get_indexer(metrics)
+        if (cols < 0).any():
+            raise KeyError(f"Metrics not in snapshot: {list(np.asarray(metrics)[cols < 0])}")
+        values, all_metrics = values[:, cols], list(metrics)
+    return dates, all_companies, all_metrics, values
+
+
+def load_series(path: str, company: str, metric: str) -> pd.DataFrame:
+    """
+    Load a single company/metric series from a time series snapshot.
+
+    Only the pages holding that series are read from disk.
+
+    Args:
+        path: Snapshot directory
+        company: Company name
+        metric: Metric name
+
+    Returns:
+        pd.DataFrame: Time series data with Date and metric columns
+    """
+    manifest = _read_manifest(path, 'time_series')
+    if company not in manifest['companies'] or metric not in manifest['metrics']:
+        raise KeyError(f"{company!r}/{metric!r} not in snapshot")
+    i = manifest['companies'].index(company)
+    j = manifest['metrics'].index(metric)
+    values = np.load(os.path.join(path, 'values.npy'), mmap_mode='r')
+    dates = pd.DatetimeIndex(np.load(os.path.join(path, 'dates.npy')))
+
+    return pd.DataFrame({
+        'Date': dates,
+        metric: np.array(values[i, j])
+    })